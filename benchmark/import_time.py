@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2012 W. Trevor King <wking@tremily.us>
+#
+# This file is part of pycomedi.
+#
+# pycomedi is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 2 of the License, or (at your option) any later
+# version.
+#
+# pycomedi is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# pycomedi.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Time how long it takes to import pycomedi modules.
+
+Each import runs in a fresh interpreter, so nothing is cached in
+`sys.modules`.  The time to start a bare interpreter is measured the
+same way and subtracted.
+
+  $ python benchmark/import_time.py
+  $ python benchmark/import_time.py -n 50 pycomedi.constant pycomedi.device
+"""
+
+import subprocess as _subprocess
+import sys as _sys
+import time as _time
+
+
+def run(statement, python=_sys.executable):
+    "Time a single `python -c statement` run in seconds"
+    start = _time.time()
+    _subprocess.check_call([python, '-c', statement])
+    return _time.time() - start
+
+def best(statement, repeat=20, **kwargs):
+    "Return the fastest of `repeat` runs (the least noisy estimate)"
+    return min(run(statement, **kwargs) for i in range(repeat))
+
+def benchmark(modules, repeat=20, **kwargs):
+    baseline = best('pass', repeat=repeat, **kwargs)
+    print('{0:<24s} {1:8.2f} ms'.format('(interpreter)', baseline*1e3))
+    for module in modules:
+        t = best('import {0}'.format(module), repeat=repeat, **kwargs)
+        print('{0:<24s} {1:8.2f} ms'.format(module, (t - baseline)*1e3))
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        'modules', metavar='MODULE', nargs='*',
+        default=['pycomedi', 'pycomedi.constant', 'pycomedi.device'],
+        help='Modules to import')
+    parser.add_argument(
+        '-n', '--repeat', type=int, default=20,
+        help='Number of fresh interpreters to time for each import')
+    parser.add_argument(
+        '-p', '--python', default=_sys.executable,
+        help='Python interpreter to benchmark')
+
+    args = parser.parse_args()
+    benchmark(args.modules, repeat=args.repeat, python=args.python)
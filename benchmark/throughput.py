@@ -0,0 +1,334 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2012 W. Trevor King <wking@tremily.us>
+#
+# This file is part of pycomedi.
+#
+# pycomedi is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 2 of the License, or (at your option) any later
+# version.
+#
+# pycomedi is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# pycomedi.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Measure streaming, conversion, and instruction throughput.
+
+The readers and writers run against a simulated device: a temporary
+file stands in for both the device file and the memory-mapped
+streaming buffer, so no Comedi hardware is needed.  Instruction lists
+can only be executed on a real board.  Without `--device`, the
+instruction benchmark only times building the `Insn` list.
+
+The `to_physical` benchmarks compare polynomial evaluation with
+`LookupTableConverter` table lookups for the same `sampl` data.  The
+samples are random codes spanning the whole 16-bit range, so table
+lookups hit the full 65536-entry table in no particular order.
+
+Each benchmark prints one JSON object per line with the throughput
+(samples per second), latency percentiles (per callback for
+`CallbackReader`, per run otherwise), and CPU seconds per million
+samples.
+
+  $ python benchmark/throughput.py
+  $ python benchmark/throughput.py -n 1000000 Reader MMapReader
+  $ python benchmark/throughput.py --device /dev/comedi0 insnlist
+"""
+
+import json as _json
+import os as _os
+import sys as _sys
+import tempfile as _tempfile
+import time as _time
+
+import numpy as _numpy
+
+from pycomedi import calibration as _calibration
+from pycomedi import instruction as _instruction
+from pycomedi import constant as _constant
+from pycomedi import utility as _utility
+
+
+class SimulatedDevice (object):
+    """File-backed stand-in for an open `Device`
+
+    The backing file holds at least `size` bytes.  It is the device
+    file for `read()`/`write()` streaming and the streaming buffer for
+    `mmap()` streaming.
+    """
+    def __init__(self, size):
+        fd,self.path = _tempfile.mkstemp(suffix='.dat', prefix='pycomedi-')
+        self.file = _os.fdopen(fd, 'r+b')
+        self.file.truncate(size)
+        self.size = size
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def rewind(self):
+        self.file.seek(0)
+
+    def close(self):
+        self.file.close()
+        _os.remove(self.path)
+
+
+class SimulatedSubdevice (object):
+    """Stand-in for a `StreamingSubdevice` with an always-ready buffer
+
+    The simulated streaming buffer is always full (for readers) or
+    empty (for writers), and the command has already finished, so the
+    benchmarks measure pycomedi's overhead rather than the board's
+    sampling rate.
+    """
+    index = 0
+
+    def __init__(self, device, buffer_size):
+        self.device = device
+        self.buffer_size = buffer_size
+
+    def get_buffer_size(self):
+        return self.buffer_size
+
+    def get_buffer_contents(self):
+        return self.buffer_size
+
+    def mark_buffer_read(self, num_bytes):
+        return num_bytes
+
+    def mark_buffer_written(self, num_bytes):
+        return num_bytes
+
+    def is_running(self):
+        return False
+
+    def wait(self, *args, **kwargs):
+        return self.buffer_size
+
+
+def _cpu_time():
+    "User plus system CPU seconds used by this process"
+    t = _os.times()
+    return t[0] + t[1]
+
+def _percentiles(values, percentiles=(50, 90, 99)):
+    return dict(('p{0}'.format(p), float(_numpy.percentile(values, p)))
+                for p in percentiles)
+
+def measure(name, function, samples, repeat=5):
+    """Time `repeat` calls to `function()`, each handling `samples` samples
+
+    If `function` returns a list of latencies, those are used for the
+    percentiles.  Otherwise the per-call wall time is used.
+    """
+    times = []
+    latencies = []
+    cpu = _cpu_time()
+    for i in range(repeat):
+        start = _time.time()
+        ret = function()
+        times.append(_time.time() - start)
+        if ret:
+            latencies.extend(ret)
+    cpu = _cpu_time() - cpu
+    best = min(times)
+    return {
+        'benchmark': name,
+        'samples': samples,
+        'repeat': repeat,
+        'samples_per_second': samples / best if best else None,
+        'latency_s': _percentiles(latencies or times),
+        'cpu_s_per_msample': cpu / (samples * repeat) * 1e6,
+        }
+
+
+def reader(device, subdevice, buffer):
+    def run():
+        device.rewind()
+        r = _utility.Reader(subdevice=subdevice, buffer=buffer)
+        r.start()
+        r.join()
+    return run
+
+def callback_reader(device, subdevice, buffer, block_scans=1024):
+    block = _numpy.zeros((block_scans, buffer.shape[1]), dtype=buffer.dtype)
+    count = buffer.shape[0] // block_scans
+    def run():
+        device.rewind()
+        latencies = []
+        last = [_time.time()]
+        def callback(data):
+            now = _time.time()
+            latencies.append(now - last[0])
+            last[0] = now
+        r = _utility.CallbackReader(
+            subdevice=subdevice, buffer=block, callback=callback, count=count)
+        r.start()
+        r.join()
+        return latencies
+    return run
+
+def writer(device, subdevice, buffer):
+    def run():
+        device.rewind()
+        w = _utility.Writer(subdevice=subdevice, buffer=buffer)
+        w.start()
+        w.join()
+    return run
+
+def mmap_reader(device, subdevice, buffer):
+    def run():
+        r = _utility.MMapReader(subdevice=subdevice, buffer=buffer)
+        r.start()
+        r.join()
+    return run
+
+def mmap_writer(device, subdevice, buffer):
+    def run():
+        w = _utility.MMapWriter(subdevice=subdevice, buffer=buffer)
+        w.start()
+        w.join()
+    return run
+
+def to_physical(device, subdevice, buffer):
+    converter = _calibration.CalibratedConverter(
+        to_physical_coefficients=[-10.0, 0.00030518043793392844])
+    data = buffer.reshape(-1)
+    out = _numpy.empty(data.shape, dtype=_numpy.double)
+    def run():
+        converter.to_physical(data, out=out)
+    return run
+
+def to_physical_lut(device, subdevice, buffer):
+    converter = _calibration.LookupTableConverter(
+        _calibration.CalibratedConverter(
+            to_physical_coefficients=[-10.0, 0.00030518043793392844]))
+    data = buffer.reshape(-1)
+    out = _numpy.empty(data.shape, dtype=_numpy.double)
+    converter.to_physical(data[:1], out=out[:1])  # build the table
+    def run():
+        converter.to_physical(data, out=out)
+    return run
+
+def insnlist(device, subdevice, buffer, n_insns=64, comedi_device=None):
+    "Each `gtod` instruction returns two samples"
+    def build():
+        insns = []
+        for i in range(n_insns):
+            insn = _instruction.Insn()
+            insn.insn = _constant.INSN.gtod
+            insn.data = [0, 0]
+            insns.append(insn)
+        return insns
+    if comedi_device is None:
+        action = build
+    else:
+        insns = build()
+        action = lambda: comedi_device.do_insnlist(insns)
+    def run():
+        latencies = []
+        for i in range(buffer.size // (2*n_insns)):
+            start = _time.time()
+            action()
+            latencies.append(_time.time() - start)
+        return latencies
+    return run
+
+
+BENCHMARKS = [
+    ('Reader', reader),
+    ('CallbackReader', callback_reader),
+    ('Writer', writer),
+    ('MMapReader', mmap_reader),
+    ('MMapWriter', mmap_writer),
+    ('to_physical', to_physical),
+    ('to_physical_lut', to_physical_lut),
+    ('insnlist', insnlist),
+    ]
+
+# These benchmarks fill `buffer`, so they get a zeroed copy.
+READ_BENCHMARKS = ['Reader', 'CallbackReader', 'MMapReader']
+
+
+def benchmark(names=None, samples=2**20, n_channels=4, buffer_size=2**16,
+              repeat=5, device=None, stream=_sys.stdout):
+    "Run the selected benchmarks and print one JSON line for each"
+    benchmarks = dict(BENCHMARKS)
+    if names is None:
+        names = [name for name,function in BENCHMARKS]
+    buffer = _numpy.zeros(
+        (samples // n_channels, n_channels), dtype=_utility.sampl)
+    buffer[...] = _numpy.random.RandomState(0).randint(
+        0, 2**16, size=buffer.shape)
+    simulated = SimulatedDevice(size=max(buffer.nbytes, buffer_size))
+    simulated.file.write(buffer.tobytes())
+    simulated.file.flush()
+    subdevice = SimulatedSubdevice(
+        device=simulated, buffer_size=buffer_size)
+    comedi_device = None
+    if device is not None:
+        from pycomedi.device import Device
+        comedi_device = Device(device)
+        comedi_device.open()
+    try:
+        for name in names:
+            kwargs = {}
+            if name == 'insnlist':
+                kwargs['comedi_device'] = comedi_device
+            if name in READ_BENCHMARKS:
+                kwargs['buffer'] = _numpy.zeros_like(buffer)
+            else:
+                kwargs['buffer'] = buffer
+            try:
+                function = benchmarks[name](
+                    device=simulated, subdevice=subdevice, **kwargs)
+                result = measure(
+                    name=name, function=function, samples=buffer.size,
+                    repeat=repeat)
+            except Exception as e:
+                result = {'benchmark': name, 'error': repr(e)}
+            stream.write(_json.dumps(result, sort_keys=True))
+            stream.write('\n')
+            stream.flush()
+    finally:
+        simulated.close()
+        if comedi_device is not None:
+            comedi_device.close()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        'benchmarks', metavar='BENCHMARK', nargs='*',
+        help='Benchmarks to run (default: all of {0})'.format(
+            ', '.join(name for name,function in BENCHMARKS)))
+    parser.add_argument(
+        '-n', '--samples', type=int, default=2**20,
+        help='Number of samples handled in each run')
+    parser.add_argument(
+        '-c', '--channels', type=int, default=4,
+        help='Number of channels per scan')
+    parser.add_argument(
+        '-b', '--buffer-size', type=int, default=2**16,
+        help='Simulated streaming buffer size in bytes')
+    parser.add_argument(
+        '-r', '--repeat', type=int, default=5,
+        help='Number of runs for each benchmark')
+    parser.add_argument(
+        '-d', '--device',
+        help='Comedi device for the insnlist benchmark (e.g. /dev/comedi0)')
+
+    args = parser.parse_args()
+    for name in args.benchmarks:
+        if name not in dict(BENCHMARKS):
+            parser.error('unknown benchmark {0}'.format(name))
+    benchmark(
+        names=args.benchmarks or None, samples=args.samples,
+        n_channels=args.channels, buffer_size=args.buffer_size,
+        repeat=args.repeat, device=args.device)
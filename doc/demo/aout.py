@@ -80,14 +80,13 @@ def generate_output_buffer(ao_subdevice, ao_channels, unit_output_signal):
     assert n_chans <= len(ao_channels), (
             'need at least {0} channels but have only {1}'.format(
                 n_chans, ao_channels))
+    ranges = [c.range for c in ao_channels[:n_chans]]
+    midpoint = _numpy.array([(r.max + r.min)/2 for r in ranges])
+    v_amp = _numpy.array([r.max for r in ranges]) - midpoint
+    volt_output_signal = midpoint + v_amp*unit_output_signal
     ao_buffer = _numpy.zeros((n_samps, n_chans), dtype=ao_dtype)
-    for i in range(n_chans):
-        range_ = ao_channels[i].range
-        midpoint = (range_.max + range_.min)/2
-        v_amp = range_.max - midpoint
-        converter = ao_channels[i].get_converter()
-        volt_output_signal = midpoint + v_amp*unit_output_signal[:,i]
-        ao_buffer[:,i] = converter.from_physical(volt_output_signal)
+    bank = ao_subdevice.get_converter_bank(ao_channels[:n_chans])
+    bank.from_physical(volt_output_signal, out=ao_buffer)
     return ao_buffer
 
 def setup_command(ao_subdevice, ao_channels, frequency, output_buffer):
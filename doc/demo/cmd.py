@@ -89,11 +89,9 @@ test_command.__test__ = False  # test_command is not a Nose test
 
 def write_data(stream, channels, data, physical=False):
     if physical:
-        converters = [c.get_converter() for c in channels]
-        physical_data = _numpy.zeros(data.shape, dtype=_numpy.float32)
-        for i,c in enumerate(converters):
-            physical_data[:,i] = c.to_physical(data[:,i])
-        data = physical_data
+        bank = channels[0].subdevice.get_converter_bank(channels)
+        data = bank.to_physical(
+            data, out=_numpy.zeros(data.shape, dtype=_numpy.float32))
     for row in range(data.shape[0]):
         stream.write('\t'.join(str(x) for x in data[row,:]))
         stream.write('\n')
@@ -133,16 +131,17 @@ class DataWriter (object):
 
     def __call__(self, data):
         _LOG.debug('new data: {}'.format(data))
-        d = _numpy.ndarray(shape=(1,data.size), dtype=data.dtype, buffer=data)
+        d = data.reshape((-1, len(self.channels)))
         if self.plot:
-            self.ydata[self.index,:] = d
-            self.ydata[self.index + self.n,:] = d
+            for row in d:
+                self.ydata[self.index,:] = row
+                self.ydata[self.index + self.n,:] = row
+                self.index = (self.index + 1) % len(self.tdata)
             for i,line in enumerate(self.lines):
                 line.set_data(
                     self.tdata,
-                    self.ydata[self.index+1:self.index + self.n+1,i])
+                    self.ydata[self.index:self.index + self.n,i])
             _pyplot.draw()
-            self.index = (self.index + 1) % len(self.tdata)
         write_data(
             stream=self.stream, channels=self.channels, data=d,
             physical=self.physical)
@@ -163,24 +162,25 @@ def read(device, subdevice=None, channels=[0], range=0, aref=0, period=0,
         num_scans=num_scans)
     rc = test_command(subdevice=subdevice)
     kwargs = {}
-    if reader == _utility.CallbackReader:
-        read_buffer_shape = (len(channels),)
+    if reader == _utility.BlockCallbackReader:
+        read_buffer = None  # sized by block_time
         kwargs = {
             'callback': DataWriter(
                 stream=stream, subdevice=subdevice, channels=channels,
                 physical=physical, plot=plot),
             'count': num_scans,
+            'block_time': 0.1,
             }
     else:
-        read_buffer_shape = (num_scans, len(channels))
-    read_buffer = _numpy.zeros(read_buffer_shape, dtype=subdevice.get_dtype())
+        read_buffer = _numpy.zeros(
+            (num_scans, len(channels)), dtype=subdevice.get_dtype())
     reader = reader(
         subdevice=subdevice, buffer=read_buffer, name='Reader', **kwargs)
     start = _time.time()
     _LOG.info('start time: {}'.format(start))
     subdevice.command()
     reader.start()
-    while subdevice.get_flags().running:
+    while subdevice.is_running():
         _LOG.debug('running...')
         _LOG.debug('poll: {}'.format(subdevice.poll()))
         _LOG.debug('get_buffer offset: {}'.format(
@@ -201,7 +201,7 @@ def read(device, subdevice=None, channels=[0], range=0, aref=0, period=0,
             subdevice.get_buffer_contents()))
     _LOG.info('stop delay: {}'.format(stop - start))
     _LOG.info('join delay: {}'.format(join - stop))
-    if not isinstance(reader, _utility.CallbackReader):
+    if not isinstance(reader, _utility.BlockCallbackReader):
         write_data(
             stream=stream, channels=channels, data=read_buffer,
             physical=physical)
@@ -223,7 +223,7 @@ def run(filename, **kwargs):
     29691
     <BLANKLINE>
     """
-    device = _Device(filename=filename)
+    device = _Device(filename=filename, cache=True)
     device.open()
     try:
         read(device=device, **kwargs)
@@ -246,7 +246,7 @@ if __name__ == '__main__':
                ).format(args))
 
     if args.callback:
-        reader = _utility.CallbackReader
+        reader = _utility.BlockCallbackReader
     elif args.mmap:
         reader = _utility.MMapReader
     else:
@@ -94,112 +94,136 @@ cdef extern from 'comedi.h':
 #    enum: GPCT_CONT_PULSE_OUT    0x0200
 #    enum: GPCT_SINGLE_PULSE_OUT    0x0400
 #
-#    /* instructions */
-#
-#    enum: INSN_MASK_WRITE        0x8000000
-#    enum: INSN_MASK_READ        0x4000000
-#    enum: INSN_MASK_SPECIAL    0x2000000
-#
-#    enum: INSN_READ        ( 0 | INSN_MASK_READ)
-#    enum: INSN_WRITE        ( 1 | INSN_MASK_WRITE)
-#    enum: INSN_BITS        ( 2 | INSN_MASK_READ|INSN_MASK_WRITE)
-#    enum: INSN_CONFIG        ( 3 | INSN_MASK_READ|INSN_MASK_WRITE)
-#    enum: INSN_GTOD        ( 4 | INSN_MASK_READ|INSN_MASK_SPECIAL)
-#    enum: INSN_WAIT        ( 5 | INSN_MASK_WRITE|INSN_MASK_SPECIAL)
-#    enum: INSN_INTTRIG        ( 6 | INSN_MASK_WRITE|INSN_MASK_SPECIAL)
-#
-#    /* trigger flags */
-#    /* These flags are used in comedi_trig structures */
-#
-#    enum: TRIG_BOGUS    0x0001    /* do the motions */
-#    enum: TRIG_DITHER    0x0002    /* enable dithering */
-#    enum: TRIG_DEGLITCH    0x0004    /* enable deglitching */
-#    //enum: TRIG_RT       0x0008          /* perform op in real time */
-#    enum: TRIG_CONFIG    0x0010    /* perform configuration, not triggering */
-#    enum: TRIG_WAKE_EOS    0x0020    /* wake up on end-of-scan events */
-#    //enum: TRIG_WRITE    0x0040          /* write to bidirectional devices */
-#
-#    /* command flags */
-#    /* These flags are used in comedi_cmd structures */
-#
-#    enum: CMDF_PRIORITY        0x00000008    /* try to use a real-time interrupt while performing command */
-#
-#    enum: TRIG_RT        CMDF_PRIORITY    /* compatibility definition */
-#
-#    enum: CMDF_WRITE        0x00000040
-#    enum: TRIG_WRITE    CMDF_WRITE    /* compatibility definition */
-#
-#    enum: CMDF_RAWDATA        0x00000080
-#
-#    enum: COMEDI_EV_START        0x00040000
-#    enum: COMEDI_EV_SCAN_BEGIN    0x00080000
-#    enum: COMEDI_EV_CONVERT    0x00100000
-#    enum: COMEDI_EV_SCAN_END    0x00200000
-#    enum: COMEDI_EV_STOP        0x00400000
-#
-#    enum: TRIG_ROUND_MASK        0x00030000
-#    enum: TRIG_ROUND_NEAREST    0x00000000
-#    enum: TRIG_ROUND_DOWN        0x00010000
-#    enum: TRIG_ROUND_UP        0x00020000
-#    enum: TRIG_ROUND_UP_NEXT    0x00030000
-#
-#    /* trigger sources */
-#
-#    enum: TRIG_ANY    0xffffffff
-#    enum: TRIG_INVALID    0x00000000
-#
-#    enum: TRIG_NONE    0x00000001    /* never trigger */
-#    enum: TRIG_NOW    0x00000002    /* trigger now + N ns */
-#    enum: TRIG_FOLLOW    0x00000004    /* trigger on next lower level trig */
-#    enum: TRIG_TIME    0x00000008    /* trigger at time N ns */
-#    enum: TRIG_TIMER    0x00000010    /* trigger at rate N ns */
-#    enum: TRIG_COUNT    0x00000020    /* trigger when count reaches N */
-#    enum: TRIG_EXT    0x00000040    /* trigger on external signal N */
-#    enum: TRIG_INT    0x00000080    /* trigger on comedi-internal signal N */
-#    enum: TRIG_OTHER    0x00000100    /* driver defined */
-#
-#    /* subdevice flags */
-#
-#    enum: SDF_BUSY    0x0001    /* device is busy */
-#    enum: SDF_BUSY_OWNER    0x0002    /* device is busy with your job */
-#    enum: SDF_LOCKED    0x0004    /* subdevice is locked */
-#    enum: SDF_LOCK_OWNER    0x0008    /* you own lock */
-#    enum: SDF_MAXDATA    0x0010    /* maxdata depends on channel */
-#    enum: SDF_FLAGS    0x0020    /* flags depend on channel */
-#    enum: SDF_RANGETYPE    0x0040    /* range type depends on channel */
-#    enum: SDF_MODE0    0x0080    /* can do mode 0 */
-#    enum: SDF_MODE1    0x0100    /* can do mode 1 */
-#    enum: SDF_MODE2    0x0200    /* can do mode 2 */
-#    enum: SDF_MODE3    0x0400    /* can do mode 3 */
-#    enum: SDF_MODE4    0x0800    /* can do mode 4 */
-#    enum: SDF_CMD        0x1000    /* can do commands (deprecated) */
-#    enum: SDF_SOFT_CALIBRATED    0x2000    /* subdevice uses software calibration */
-#    enum: SDF_CMD_WRITE        0x4000    /* can do output commands */
-#    enum: SDF_CMD_READ        0x8000    /* can do input commands */
-#
-#    enum: SDF_READABLE    0x00010000    /* subdevice can be read (e.g. analog input) */
-#    enum: SDF_WRITABLE    0x00020000    /* subdevice can be written (e.g. analog output) */
-#    enum: SDF_WRITEABLE    SDF_WRITABLE    /* spelling error in API */
-#    enum: SDF_INTERNAL    0x00040000    /* subdevice does not have externally visible lines */
-#    enum: SDF_RT        0x00080000    /* DEPRECATED: subdevice is RT capable */
-#    enum: SDF_GROUND    0x00100000    /* can do aref=ground */
-#    enum: SDF_COMMON    0x00200000    /* can do aref=common */
-#    enum: SDF_DIFF    0x00400000    /* can do aref=diff */
-#    enum: SDF_OTHER    0x00800000    /* can do aref=other */
-#    enum: SDF_DITHER    0x01000000    /* can do dithering */
-#    enum: SDF_DEGLITCH    0x02000000    /* can do deglitching */
-#    enum: SDF_MMAP    0x04000000    /* can do mmap() */
-#    enum: SDF_RUNNING    0x08000000    /* subdevice is acquiring data */
-#    enum: SDF_LSAMPL    0x10000000    /* subdevice uses 32-bit samples */
-#    enum: SDF_PACKED    0x20000000    /* subdevice can do packed DIO */
-#    /* re recyle these flags for PWM */
-#    enum: SDF_PWM_COUNTER SDF_MODE0       /* PWM can automatically switch off */
-#    enum: SDF_PWM_HBRIDGE SDF_MODE1       /* PWM is signed (H-bridge) */
-#
-#
-#
-#    /* subdevice types */
-#
+    # instructions
+
+    enum: INSN_MASK_WRITE
+    enum: INSN_MASK_READ
+    enum: INSN_MASK_SPECIAL
+
+    enum: INSN_READ
+    enum: INSN_WRITE
+    enum: INSN_BITS
+    enum: INSN_CONFIG
+    enum: INSN_GTOD
+    enum: INSN_WAIT
+    enum: INSN_INTTRIG
+
+    # trigger flags
+    # These flags are used in comedi_trig structures
+
+    enum: TRIG_BOGUS
+    #"do the motions"
+    enum: TRIG_DITHER
+    #"enable dithering"
+    enum: TRIG_DEGLITCH
+    #"enable deglitching"
+    enum: TRIG_CONFIG
+    #"perform configuration, not triggering"
+    enum: TRIG_WAKE_EOS
+    #"wake up on end-of-scan events"
+
+    # command flags
+    # These flags are used in comedi_cmd structures
+
+    enum: CMDF_PRIORITY
+    #"try to use a real-time interrupt while performing command"
+    enum: CMDF_WRITE
+    enum: CMDF_RAWDATA
+
+    enum: COMEDI_EV_START
+    enum: COMEDI_EV_SCAN_BEGIN
+    enum: COMEDI_EV_CONVERT
+    enum: COMEDI_EV_SCAN_END
+    enum: COMEDI_EV_STOP
+
+    enum: TRIG_ROUND_MASK
+    enum: TRIG_ROUND_NEAREST
+    enum: TRIG_ROUND_DOWN
+    enum: TRIG_ROUND_UP
+    enum: TRIG_ROUND_UP_NEXT
+
+    # trigger sources
+
+    enum: TRIG_ANY
+    enum: TRIG_INVALID
+
+    enum: TRIG_NONE
+    #"never trigger"
+    enum: TRIG_NOW
+    #"trigger now + N ns"
+    enum: TRIG_FOLLOW
+    #"trigger on next lower level trig"
+    enum: TRIG_TIME
+    #"trigger at time N ns"
+    enum: TRIG_TIMER
+    #"trigger at rate N ns"
+    enum: TRIG_COUNT
+    #"trigger when count reaches N"
+    enum: TRIG_EXT
+    #"trigger on external signal N"
+    enum: TRIG_INT
+    #"trigger on comedi-internal signal N"
+    enum: TRIG_OTHER
+    #"driver defined"
+
+    # subdevice flags
+
+    enum: SDF_BUSY
+    #"device is busy"
+    enum: SDF_BUSY_OWNER
+    #"device is busy with your job"
+    enum: SDF_LOCKED
+    #"subdevice is locked"
+    enum: SDF_LOCK_OWNER
+    #"you own lock"
+    enum: SDF_MAXDATA
+    #"maxdata depends on channel"
+    enum: SDF_FLAGS
+    #"flags depend on channel"
+    enum: SDF_RANGETYPE
+    #"range type depends on channel"
+    enum: SDF_CMD
+    #"can do commands (deprecated)"
+    enum: SDF_SOFT_CALIBRATED
+    #"subdevice uses software calibration"
+    enum: SDF_CMD_WRITE
+    #"can do output commands"
+    enum: SDF_CMD_READ
+    #"can do input commands"
+    enum: SDF_READABLE
+    #"subdevice can be read (e.g. analog input)"
+    enum: SDF_WRITABLE
+    #"subdevice can be written (e.g. analog output)"
+    enum: SDF_INTERNAL
+    #"subdevice does not have externally visible lines"
+    enum: SDF_GROUND
+    #"can do aref=ground"
+    enum: SDF_COMMON
+    #"can do aref=common"
+    enum: SDF_DIFF
+    #"can do aref=diff"
+    enum: SDF_OTHER
+    #"can do aref=other"
+    enum: SDF_DITHER
+    #"can do dithering"
+    enum: SDF_DEGLITCH
+    #"can do deglitching"
+    enum: SDF_MMAP
+    #"can do mmap()"
+    enum: SDF_RUNNING
+    #"subdevice is acquiring data"
+    enum: SDF_LSAMPL
+    #"subdevice uses 32-bit samples"
+    enum: SDF_PACKED
+    #"subdevice can do packed DIO"
+    # we recycle these flags for PWM
+    enum: SDF_PWM_COUNTER
+    #"PWM can automatically switch off"
+    enum: SDF_PWM_HBRIDGE
+    #"PWM is signed (H-bridge)"
+
+    # subdevice types
+
     enum comedi_subdevice_type:
         COMEDI_SUBD_UNUSED,   # unused by driver
         COMEDI_SUBD_AI,       # analog input
@@ -215,68 +239,57 @@ cdef extern from 'comedi.h':
         COMEDI_SUBD_SERIAL,   # serial IO
         COMEDI_SUBD_PWM       # PWM
 
-#    /* configuration instructions */
-#
-#        enum configuration_ids {
-#            INSN_CONFIG_DIO_INPUT = 0,
-#            INSN_CONFIG_DIO_OUTPUT = 1,
-#            INSN_CONFIG_DIO_OPENDRAIN = 2,
-#            INSN_CONFIG_ANALOG_TRIG = 16,
-#    //      INSN_CONFIG_WAVEFORM = 17,
-#    //      INSN_CONFIG_TRIG = 18,
-#    //      INSN_CONFIG_COUNTER = 19,
-#            INSN_CONFIG_ALT_SOURCE = 20,
-#            INSN_CONFIG_DIGITAL_TRIG = 21,
-#            INSN_CONFIG_BLOCK_SIZE = 22,
-#            INSN_CONFIG_TIMER_1 = 23,
-#            INSN_CONFIG_FILTER = 24,
-#            INSN_CONFIG_CHANGE_NOTIFY = 25,
-#
-#             /*ALPHA*/ INSN_CONFIG_SERIAL_CLOCK = 26,
-#            INSN_CONFIG_BIDIRECTIONAL_DATA = 27,
-#            INSN_CONFIG_DIO_QUERY = 28,
-#            INSN_CONFIG_PWM_OUTPUT = 29,
-#            INSN_CONFIG_GET_PWM_OUTPUT = 30,
-#            INSN_CONFIG_ARM = 31,
-#            INSN_CONFIG_DISARM = 32,
-#            INSN_CONFIG_GET_COUNTER_STATUS = 33,
-#            INSN_CONFIG_RESET = 34,
-#            INSN_CONFIG_GPCT_SINGLE_PULSE_GENERATOR = 1001,    // Use CTR as single pulsegenerator
-#            INSN_CONFIG_GPCT_PULSE_TRAIN_GENERATOR = 1002,    // Use CTR as pulsetraingenerator
-#            INSN_CONFIG_GPCT_QUADRATURE_ENCODER = 1003,    // Use the counter as encoder
-#            INSN_CONFIG_SET_GATE_SRC = 2001,    // Set gate source
-#            INSN_CONFIG_GET_GATE_SRC = 2002,    // Get gate source
-#            INSN_CONFIG_SET_CLOCK_SRC = 2003,    // Set master clock source
-#            INSN_CONFIG_GET_CLOCK_SRC = 2004,    // Get master clock source
-#            INSN_CONFIG_SET_OTHER_SRC = 2005,    // Set other source
-#    //      INSN_CONFIG_GET_OTHER_SRC = 2006,       // Get other source
-#            INSN_CONFIG_GET_HARDWARE_BUFFER_SIZE = 2006,    // Get size in bytes of subdevice's on-board fifos used during streaming input/output
-#            INSN_CONFIG_SET_COUNTER_MODE = 4097,
-#            INSN_CONFIG_8254_SET_MODE = INSN_CONFIG_SET_COUNTER_MODE,    /* deprecated */
-#            INSN_CONFIG_8254_READ_STATUS = 4098,
-#            INSN_CONFIG_SET_ROUTING = 4099,
-#            INSN_CONFIG_GET_ROUTING = 4109,
-#    /* PWM */
-#            INSN_CONFIG_PWM_SET_PERIOD = 5000,   /* sets frequency */
-#            INSN_CONFIG_PWM_GET_PERIOD = 5001,   /* gets frequency */
-#            INSN_CONFIG_GET_PWM_STATUS = 5002,          /* is it running? */
-#            INSN_CONFIG_PWM_SET_H_BRIDGE = 5003, /* sets H bridge: duty cycle and sign bit for a relay  at the same time*/
-#            INSN_CONFIG_PWM_GET_H_BRIDGE = 5004  /* gets H bridge data: duty cycle and the sign bit */
-#        };
-#
-#        enum comedi_io_direction {
-#            COMEDI_INPUT = 0,
-#            COMEDI_OUTPUT = 1,
-#            COMEDI_OPENDRAIN = 2
-#        };
-#
-#        enum comedi_support_level
-#        {
-#            COMEDI_UNKNOWN_SUPPORT = 0,
-#            COMEDI_SUPPORTED,
-#            COMEDI_UNSUPPORTED
-#        };
-#
+    # configuration instructions
+
+    enum configuration_ids:
+        INSN_CONFIG_DIO_INPUT
+        INSN_CONFIG_DIO_OUTPUT
+        INSN_CONFIG_DIO_OPENDRAIN
+        INSN_CONFIG_ANALOG_TRIG
+        INSN_CONFIG_ALT_SOURCE
+        INSN_CONFIG_DIGITAL_TRIG
+        INSN_CONFIG_BLOCK_SIZE
+        INSN_CONFIG_TIMER_1
+        INSN_CONFIG_FILTER
+        INSN_CONFIG_CHANGE_NOTIFY
+        INSN_CONFIG_SERIAL_CLOCK  # ALPHA
+        INSN_CONFIG_BIDIRECTIONAL_DATA
+        INSN_CONFIG_DIO_QUERY
+        INSN_CONFIG_PWM_OUTPUT
+        INSN_CONFIG_GET_PWM_OUTPUT
+        INSN_CONFIG_ARM
+        INSN_CONFIG_DISARM
+        INSN_CONFIG_GET_COUNTER_STATUS
+        INSN_CONFIG_RESET
+        INSN_CONFIG_GPCT_SINGLE_PULSE_GENERATOR  # CTR as single pulsegenerator
+        INSN_CONFIG_GPCT_PULSE_TRAIN_GENERATOR  # CTR as pulsetraingenerator
+        INSN_CONFIG_GPCT_QUADRATURE_ENCODER  # counter as encoder
+        INSN_CONFIG_SET_GATE_SRC  # set gate source
+        INSN_CONFIG_GET_GATE_SRC  # get gate source
+        INSN_CONFIG_SET_CLOCK_SRC  # set master clock source
+        INSN_CONFIG_GET_CLOCK_SRC  # get master clock source
+        INSN_CONFIG_SET_OTHER_SRC  # set other source
+        INSN_CONFIG_GET_HARDWARE_BUFFER_SIZE  # size of on-board fifos
+        INSN_CONFIG_SET_COUNTER_MODE
+        INSN_CONFIG_8254_READ_STATUS
+        INSN_CONFIG_SET_ROUTING
+        INSN_CONFIG_GET_ROUTING
+        INSN_CONFIG_PWM_SET_PERIOD  # sets frequency
+        INSN_CONFIG_PWM_GET_PERIOD  # gets frequency
+        INSN_CONFIG_GET_PWM_STATUS  # is it running?
+        INSN_CONFIG_PWM_SET_H_BRIDGE  # sets H bridge duty cycle and sign bit
+        INSN_CONFIG_PWM_GET_H_BRIDGE  # gets H bridge duty cycle and sign bit
+
+    enum comedi_io_direction:
+        COMEDI_INPUT
+        COMEDI_OUTPUT
+        COMEDI_OPENDRAIN
+
+    enum comedi_support_level:
+        COMEDI_UNKNOWN_SUPPORT
+        COMEDI_SUPPORTED
+        COMEDI_UNSUPPORTED
+
 #    /* ioctls */
 #
 #    enum: CIO 'd'
@@ -402,32 +415,38 @@ cdef extern from 'comedi.h':
         unsigned int data_len
         unsigned int unused[3]
 
-#    /* range stuff */
-#
+    # range stuff
+
 #    enum: __RANGE(a,b)    ((((a)&0xffff)<<16)|((b)&0xffff))
 #
 #    enum: RANGE_OFFSET(a)        (((a)>>16)&0xffff)
 #    enum: RANGE_LENGTH(b)        ((b)&0xffff)
 #
 #    enum: RF_UNIT(flags)        ((flags)&0xff)
-#    enum: RF_EXTERNAL        (1<<8)
-#
-#    enum: UNIT_volt        0
-#    enum: UNIT_mA            1
-#    enum: UNIT_none        2
-#
+    enum: RF_EXTERNAL
+
+    enum: UNIT_volt
+    enum: UNIT_mA
+    enum: UNIT_none
+
 #    enum: COMEDI_MIN_SPEED    ((unsigned int)0xffffffff)
-#
-#    /* callback stuff */
-#    /* only relevant to kernel modules. */
-#
-#    enum: COMEDI_CB_EOS        1    /* end of scan */
-#    enum: COMEDI_CB_EOA        2    /* end of acquisition */
-#    enum: COMEDI_CB_BLOCK        4    /* new data has arrived: wakes up write()/read() */
-#    enum: COMEDI_CB_EOBUF        8    /* DEPRECATED: end of buffer */
-#    enum: COMEDI_CB_ERROR        16    /* card error during acquisition */
-#    enum: COMEDI_CB_OVERFLOW    32    /* buffer overflow/underflow */
-#
+
+    # callback stuff
+    # only relevant to kernel modules.
+
+    enum: COMEDI_CB_EOS
+    #"end of scan"
+    enum: COMEDI_CB_EOA
+    #"end of acquisition"
+    enum: COMEDI_CB_BLOCK
+    #"new data has arrived: wakes up write()/read()"
+    enum: COMEDI_CB_EOBUF
+    #"DEPRECATED: end of buffer"
+    enum: COMEDI_CB_ERROR
+    #"card error during acquisition"
+    enum: COMEDI_CB_OVERFLOW
+    #"buffer overflow/underflow"
+
 #    /**********************************************************/
 #    /* everything after this line is ALPHA */
 #    /**********************************************************/
@@ -36,7 +36,7 @@ cdef extern from 'comedilib.h':
     int comedi_loglevel(int loglevel)
     void comedi_perror(char *s)
     char *comedi_strerror(int errnum)
-    int comedi_errno()
+    int comedi_errno() nogil
     int comedi_fileno(comedi_t *it)
 
     # device queries
@@ -78,33 +78,36 @@ cdef extern from 'comedilib.h':
 
     # low-level stuff
 
-    int comedi_do_insnlist(comedi_t *it,comedi_insnlist *il)
-    int comedi_do_insn(comedi_t *it,comedi_insn *insn)
+    int comedi_do_insnlist(comedi_t *it,comedi_insnlist *il) nogil
+    int comedi_do_insn(comedi_t *it,comedi_insn *insn) nogil
     int comedi_lock(comedi_t *it,unsigned int subdevice)
     int comedi_unlock(comedi_t *it,unsigned int subdevice)
 
     # synchronous stuff
 
     int comedi_data_read(comedi_t *it,unsigned int subd,unsigned int chan,
-        unsigned int range,unsigned int aref,lsampl_t *data)
+        unsigned int range,unsigned int aref,lsampl_t *data) nogil
     int comedi_data_read_n(comedi_t *it,unsigned int subd,unsigned int chan,
-        unsigned int range,unsigned int aref,lsampl_t *data, unsigned int n)
+        unsigned int range,unsigned int aref,lsampl_t *data,
+        unsigned int n) nogil
     int comedi_data_read_hint(comedi_t *it,unsigned int subd,unsigned int chan,
-        unsigned int range,unsigned int aref)
+        unsigned int range,unsigned int aref) nogil
     int comedi_data_read_delayed(comedi_t *it,unsigned int subd,unsigned int chan,
-        unsigned int range,unsigned int aref,lsampl_t *data, unsigned int nano_sec)
+        unsigned int range,unsigned int aref,lsampl_t *data,
+        unsigned int nano_sec) nogil
     int comedi_data_write(comedi_t *it,unsigned int subd,unsigned int chan,
-        unsigned int range,unsigned int aref,lsampl_t data)
+        unsigned int range,unsigned int aref,lsampl_t data) nogil
     int comedi_dio_config(comedi_t *it,unsigned int subd,unsigned int chan,
         unsigned int dir)
     int comedi_dio_get_config(comedi_t *it,unsigned int subd,unsigned int chan,
         unsigned int *dir)
     int comedi_dio_read(comedi_t *it,unsigned int subd,unsigned int chan,
-        unsigned int *bit)
+        unsigned int *bit) nogil
     int comedi_dio_write(comedi_t *it,unsigned int subd,unsigned int chan,
-        unsigned int bit)
+        unsigned int bit) nogil
     int comedi_dio_bitfield2(comedi_t *it,unsigned int subd,
-        unsigned int write_mask, unsigned int *bits, unsigned int base_channel)
+        unsigned int write_mask, unsigned int *bits,
+        unsigned int base_channel) nogil
 
     # streaming I/O (commands)
 
@@ -112,10 +115,10 @@ cdef extern from 'comedilib.h':
             comedi_cmd *cmd)
     int comedi_get_cmd_generic_timed(comedi_t *dev,unsigned int subdevice,
             comedi_cmd *cmd, unsigned chanlist_len, unsigned scan_period_ns)
-    int comedi_cancel(comedi_t *it,unsigned int subdevice)
-    int comedi_command(comedi_t *it,comedi_cmd *cmd)
-    int comedi_command_test(comedi_t *it,comedi_cmd *cmd)
-    int comedi_poll(comedi_t *dev,unsigned int subdevice)
+    int comedi_cancel(comedi_t *it,unsigned int subdevice) nogil
+    int comedi_command(comedi_t *it,comedi_cmd *cmd) nogil
+    int comedi_command_test(comedi_t *it,comedi_cmd *cmd) nogil
+    int comedi_poll(comedi_t *dev,unsigned int subdevice) nogil
 
     # buffer control
 
@@ -192,9 +195,9 @@ cdef extern from 'comedilib.h':
         comedi_conversion_direction direction,
         comedi_polynomial_t *polynomial)
     double comedi_to_physical(lsampl_t data,
-        comedi_polynomial_t *conversion_polynomial)
+        comedi_polynomial_t *conversion_polynomial) nogil
     lsampl_t comedi_from_physical(double data,
-        comedi_polynomial_t *conversion_polynomial)
+        comedi_polynomial_t *conversion_polynomial) nogil
     #
     #int comedi_internal_trigger(comedi_t *dev, unsigned subd, unsigned trignum);
     #/* INSN_CONFIG wrappers */
@@ -22,9 +22,14 @@ from . import PyComediError as _PyComediError
 from pycomedi cimport _comedilib_h
 
 
-def raise_error(function_name=None, ret=None, error_msg=None):
+def raise_error(function_name=None, ret=None, error_msg=None, errno=None):
     """Report an error while executing a comedilib function
 
+    If you called the function without holding the GIL, another thread
+    may have changed `comedi_errno()` before you got the GIL back.  In
+    that case, read `comedi_errno()` before reacquiring the GIL and
+    pass the result in as `errno`.
+
     >>> from pycomedi import PyComediError
     >>> raise_error(function_name='myfn', ret=-1)
     Traceback (most recent call last):
@@ -34,6 +39,10 @@ def raise_error(function_name=None, ret=None, error_msg=None):
     Traceback (most recent call last):
       ...
     PyComediError: myfn (some error): Success (-1)
+    >>> raise_error(function_name='myfn', ret=-1, errno=0)
+    Traceback (most recent call last):
+      ...
+    PyComediError: myfn: Success (-1)
     >>> try:
     ...     raise_error(function_name='myfn', ret=-1)
     ... except PyComediError as e:
@@ -42,7 +51,8 @@ def raise_error(function_name=None, ret=None, error_msg=None):
     myfn
     -1
     """
-    errno = _comedilib_h.comedi_errno()
+    if errno is None:
+        errno = _comedilib_h.comedi_errno()
     comedi_msg = _comedilib_h.comedi_strerror(errno)
     raise _PyComediError(
         function_name=function_name, ret=ret, comedi_msg=comedi_msg,
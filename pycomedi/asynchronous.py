@@ -0,0 +1,227 @@
+# Copyright (C) 2012 W. Trevor King <wking@tremily.us>
+#
+# This file is part of pycomedi.
+#
+# pycomedi is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 2 of the License, or (at your option) any later
+# version.
+#
+# pycomedi is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# pycomedi.  If not, see <http://www.gnu.org/licenses/>.
+
+"""`asyncio` interface to streaming subdevices
+
+The readers and writers in `utility` each run in their own thread.
+The classes in this module instead register the device file
+descriptor with an `asyncio` event loop, so a single loop can drive
+streaming input and output on several boards at once.
+
+Comedi reads from (and writes to) a device's current read (or write)
+subdevice through the device file.  So you can have at most one
+`AsyncReader` and one `AsyncWriter` per `Device`.
+
+This module requires Python 3.7 or newer.
+"""
+
+import asyncio as _asyncio
+import os as _os
+
+import numpy as _numpy
+
+from . import LOG as _LOG
+
+
+class _AsyncStream (object):
+    "Base class for asynchronous readers and writers"
+    def __init__(self, subdevice):
+        self.subdevice = subdevice
+
+    async def _ready(self, write=False):
+        "Wait until the device file is readable (or writable)"
+        loop = _asyncio.get_running_loop()
+        fileno = self._fileno()
+        future = loop.create_future()
+        if write:
+            add,remove = loop.add_writer,loop.remove_writer
+        else:
+            add,remove = loop.add_reader,loop.remove_reader
+
+        def ready():
+            if not future.done():
+                future.set_result(None)
+
+        add(fileno, ready)
+        try:
+            await future
+        finally:
+            remove(fileno)
+
+    # pull out subdevice calls for easier testing
+
+    def _fileno(self):
+        return self.subdevice.device.fileno()
+
+    def _running(self):
+        return self.subdevice.is_running()
+
+
+class AsyncReader (_AsyncStream):
+    """Asynchronous iterator over blocks of scans
+
+    Each iteration yields a `(scans, n_channels)` array with up to
+    `block_scans` scans.  The final block may be shorter, if the
+    command stops in the middle of a block.  To avoid allocating a
+    new array for every block, the same buffer is reused, so copy any
+    block you want to keep past the next iteration.
+
+    Examples
+    --------
+
+    Setup a pipe to stand in for the device file.
+
+    >>> import asyncio
+    >>> read_fd,write_fd = _os.pipe()
+    >>> data = _numpy.arange(10, dtype=_numpy.uint16)
+    >>> _os.write(write_fd, data.tobytes())
+    20
+
+    Override the default `AsyncReader` methods for our dummy
+    subdevice.
+
+    >>> class TestReader (AsyncReader):
+    ...     contents = data.nbytes
+    ...     def _fileno(self):
+    ...         return read_fd
+    ...     def _running(self):
+    ...         return False
+    ...     def _readable_bytes(self):
+    ...         return self.contents
+    ...     def _readinto(self, view):
+    ...         size = super(TestReader, self)._readinto(view)
+    ...         self.contents -= size
+    ...         return size
+
+    Collect blocks from the test reader.
+
+    >>> async def read(reader):
+    ...     async for block in reader:
+    ...         print(repr(block))
+    >>> r = TestReader(subdevice=None, n_channels=2, block_scans=2,
+    ...     dtype=_numpy.uint16)
+    >>> loop = asyncio.new_event_loop()
+    >>> loop.run_until_complete(read(r))
+    array([[0, 1],
+           [2, 3]], dtype=uint16)
+    array([[4, 5],
+           [6, 7]], dtype=uint16)
+    array([[8, 9]], dtype=uint16)
+
+    Cleanup the event loop and pipe.
+
+    >>> loop.close()
+    >>> _os.close(read_fd)
+    >>> _os.close(write_fd)
+    """
+    def __init__(self, subdevice, n_channels, block_scans=1, dtype=None):
+        super(AsyncReader, self).__init__(subdevice=subdevice)
+        if dtype is None:
+            dtype = subdevice.get_dtype()
+        self.buffer = _numpy.zeros((block_scans, n_channels), dtype=dtype)
+        self._bytes = memoryview(self.buffer.reshape(-1).view(_numpy.uint8))
+        self._scan_bytes = n_channels * self.buffer.itemsize
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        filled = 0
+        while filled < len(self._bytes):
+            running = self._running()
+            available = self._readable_bytes()
+            if available > 0:
+                size = min(available, len(self._bytes) - filled)
+                filled += self._readinto(self._bytes[filled:filled+size])
+            elif running:
+                await self._ready()
+            else:
+                break
+        scans,partial = divmod(filled, self._scan_bytes)
+        if partial:
+            _LOG.warning(
+                'dropping {0} bytes of a partial trailing scan'.format(
+                    partial))
+        if scans == 0:
+            raise StopAsyncIteration()
+        return self.buffer[:scans]
+
+    def _readable_bytes(self):
+        return self.subdevice.get_buffer_contents()
+
+    def _readinto(self, view):
+        return _os.readv(self._fileno(), [view])
+
+
+class AsyncWriter (_AsyncStream):
+    """Awaitable writer for blocks of output scans
+
+    `await writer.write(block)` returns once all of `block` has been
+    copied into Comedi's streaming buffer.  Writes never block the
+    event loop: when the buffer is full, the writer waits for the
+    device file to become writable.  You can write blocks before
+    triggering the command to preload the buffer.
+
+    Examples
+    --------
+
+    Setup a pipe to stand in for the device file.
+
+    >>> import asyncio
+    >>> read_fd,write_fd = _os.pipe()
+
+    Override the default `AsyncWriter` methods for our dummy
+    subdevice.  The stand-in buffer holds 8 bytes.
+
+    >>> class TestWriter (AsyncWriter):
+    ...     def _fileno(self):
+    ...         return write_fd
+    ...     def _writable_bytes(self):
+    ...         return 8
+
+    Write some blocks with the test writer.
+
+    >>> async def write(writer, blocks):
+    ...     for block in blocks:
+    ...         await writer.write(block)
+    >>> blocks = [_numpy.array([[0, 10], [1, 11]], dtype=_numpy.uint16),
+    ...           _numpy.array([[2, 12]], dtype=_numpy.uint16)]
+    >>> w = TestWriter(subdevice=None)
+    >>> loop = asyncio.new_event_loop()
+    >>> loop.run_until_complete(write(w, blocks))
+    >>> _numpy.frombuffer(_os.read(read_fd, 12), dtype=_numpy.uint16)
+    array([ 0, 10,  1, 11,  2, 12], dtype=uint16)
+
+    Cleanup the event loop and pipe.
+
+    >>> loop.close()
+    >>> _os.close(read_fd)
+    >>> _os.close(write_fd)
+    """
+    async def write(self, block):
+        "Write `block` to the streaming buffer"
+        data = memoryview(_numpy.ascontiguousarray(block)).cast('B')
+        while len(data) > 0:
+            available = self._writable_bytes()
+            if available > 0:
+                size = _os.write(self._fileno(), data[:available])
+                data = data[size:]
+            else:
+                await self._ready(write=True)
+
+    def _writable_bytes(self):
+        return (self.subdevice.get_buffer_size()
+                - self.subdevice.get_buffer_contents())
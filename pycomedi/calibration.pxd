@@ -16,6 +16,8 @@
 
 "Expose `CalibratedConverter` internals at the C level for other Cython modules"
 
+cimport numpy as _numpy
+
 from pycomedi cimport _comedilib_h
 
 
@@ -24,12 +26,27 @@ cdef class CalibratedConverter (object):
     cdef object _from_physical_error
 
     cdef _str_poly(self, _comedilib_h.comedi_polynomial_t polynomial)
-    cpdef to_physical(self, data)
-    cpdef from_physical(self, data)
+    cpdef to_physical(self, data, out=*)
+    cpdef from_physical(self, data, out=*)
     cpdef get_to_physical_expansion_origin(self)
     cpdef get_to_physical_coefficients(self)
     cpdef get_from_physical_expansion_origin(self)
     cpdef get_from_physical_coefficients(self)
+    cpdef get_from_physical_error(self)
+
+
+cdef class ConverterBank (object):
+    cdef _comedilib_h.comedi_polynomial_t *_to_physical
+    cdef _comedilib_h.comedi_polynomial_t *_from_physical
+    cdef Py_ssize_t _n_channels
+    cdef object _from_physical_error
+    cdef public object converters
+
+    cdef _check_shape(self, array)
+    cpdef to_physical(self, data, out=*)
+    cdef _to_physical_array(self, _numpy.ndarray data, _numpy.ndarray out)
+    cpdef from_physical(self, data, out=*, dtype=*)
+    cdef _from_physical_array(self, _numpy.ndarray data, _numpy.ndarray out)
 
 
 cdef class Caldac (object):
@@ -48,5 +65,10 @@ cdef class CalibrationSetting (object):
 cdef class Calibration (object):
     cdef _comedilib_h.comedi_calibration_t *calibration
     cdef public object device  # pycomedi.device.Device
+    cdef object _index  # (subdevice, channel, range) -> setting indices
+    cdef object _converters  # (subdevice, channel, range) -> converter
 
     cpdef from_file(self, path)
+    cpdef dumps(self)
+    cpdef loads(self, data)
+    cpdef reindex(self)
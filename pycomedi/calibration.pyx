@@ -18,9 +18,17 @@
 
 For one-off conversions, use the functions `comedi_to_physical` and
 `comedi_from_physical`.  For repeated conversions, use an instance of
-`CalibratedConverter`.
+`CalibratedConverter`.  For 16-bit (`sampl`) data, a
+`LookupTableConverter` replaces the polynomial evaluation with a
+single table lookup per sample.  To convert interleaved
+multi-channel scans in one pass, use a `ConverterBank`.  To convert
+windows of large multi-channel buffers on demand, wrap them in a
+`PhysicalView`.
 """
 
+import collections as _collections
+import json as _json
+
 from libc cimport stdlib as _stdlib
 from libc cimport string as _string
 cimport numpy as _numpy
@@ -28,11 +36,23 @@ import numpy as _numpy
 
 from pycomedi cimport _comedi_h
 from pycomedi cimport _comedilib_h
+from . import PyComediError as _PyComediError
 from . import _error
+from . import chanspec as _chanspec
 from . import constant as _constant
 from . import utility as _utility
 
 
+_ARRAY_DTYPES = (_utility.sampl, _utility.lsampl, _numpy.double)
+"Array types with typed conversion loops"
+
+LOOKUP_TABLE_CACHE_SIZE = 32
+"Number of `LookupTableConverter` tables kept in memory"
+
+_LOOKUP_TABLES = _collections.OrderedDict()
+"Recently used lookup tables, least recently used first"
+
+
 cdef void _python_to_charp(
     char **charp, object obj, object encoding) except *:
     """Convert a Python string into a `char *`.
@@ -71,37 +91,201 @@ cdef void _setup_comedi_polynomial_t(
     p.order = len(coefficients)-1
     p.expansion_origin = expansion_origin
 
+cdef void _load_uints(
+    unsigned int **array, unsigned int *length, values) except *:
+    "Replace `*array` with a newly allocated copy of `values`"
+    if array[0] is not NULL:
+        _stdlib.free(array[0])
+        array[0] = NULL
+    length[0] = 0
+    if not values:
+        return
+    array[0] = <unsigned int *> _stdlib.malloc(
+        len(values) * sizeof(unsigned int))
+    if array[0] is NULL:
+        raise MemoryError()
+    for i,x in enumerate(values):
+        array[0][i] = x
+    length[0] = len(values)
+
+cdef object _dump_polynomial(_comedilib_h.comedi_polynomial_t *p):
+    "Serializable `[expansion_origin, coefficients]` (or `None`)"
+    if p is NULL:
+        return None
+    return [p.expansion_origin,
+            [p.coefficients[i] for i in range(p.order+1)]]
+
+cdef void _load_polynomial(
+    _comedilib_h.comedi_polynomial_t **p, state) except *:
+    "Allocate `*p` from a `_dump_polynomial()` result"
+    if state is None:
+        return
+    expansion_origin,coefficients = state
+    if len(coefficients) > _comedilib_h.COMEDI_MAX_NUM_POLYNOMIAL_COEFFICIENTS:
+        raise ValueError('too many coefficients ({} > {})'.format(
+                len(coefficients),
+                _comedilib_h.COMEDI_MAX_NUM_POLYNOMIAL_COEFFICIENTS))
+    p[0] = <_comedilib_h.comedi_polynomial_t *> _stdlib.calloc(
+        1, sizeof(_comedilib_h.comedi_polynomial_t))
+    if p[0] is NULL:
+        raise MemoryError()
+    _setup_comedi_polynomial_t(p[0], coefficients, expansion_origin)
+
+cdef object _dump_charp(char *charp):
+    if charp is NULL:
+        return None
+    return (<bytes> charp).decode('ascii')
+
+ctypedef fused _sample_t:
+    _comedi_h.sampl_t
+    _comedi_h.lsampl_t
+    double
+
+cdef void _to_physical_array(
+    _comedilib_h.comedi_polynomial_t *p, _sample_t *data, double *out,
+    Py_ssize_t n) nogil:
+    "Apply `comedi_to_physical` to the `n` values stored at `data`"
+    cdef Py_ssize_t i
+    for i in range(n):
+        out[i] = _comedilib_h.comedi_to_physical(
+            <_comedi_h.lsampl_t> data[i], p)
+
+cdef void _from_physical_array(
+    _comedilib_h.comedi_polynomial_t *p, double *data, _sample_t *out,
+    Py_ssize_t n) nogil:
+    "Apply `comedi_from_physical` to the `n` values stored at `data`"
+    cdef Py_ssize_t i
+    for i in range(n):
+        out[i] = <_sample_t> _comedilib_h.comedi_from_physical(data[i], p)
+
+ctypedef fused _physical_t:
+    double
+    float
+
+cdef void _bank_to_physical(
+    _comedilib_h.comedi_polynomial_t *p, _sample_t *data, _physical_t *out,
+    Py_ssize_t n_scans, Py_ssize_t n_channels) nogil:
+    "Convert interleaved scans, applying `p[j]` to the `j`th column"
+    cdef Py_ssize_t i, j, k = 0
+    for i in range(n_scans):
+        for j in range(n_channels):
+            out[k] = <_physical_t> _comedilib_h.comedi_to_physical(
+                <_comedi_h.lsampl_t> data[k], &p[j])
+            k += 1
+
+cdef void _bank_from_physical(
+    _comedilib_h.comedi_polynomial_t *p, double *data, _sample_t *out,
+    Py_ssize_t n_scans, Py_ssize_t n_channels) nogil:
+    "Convert interleaved scans, applying `p[j]` to the `j`th column"
+    cdef Py_ssize_t i, j, k = 0
+    for i in range(n_scans):
+        for j in range(n_channels):
+            out[k] = <_sample_t> _comedilib_h.comedi_from_physical(
+                data[k], &p[j])
+            k += 1
+
+cdef bint _is_array_target(object out, object dtypes):
+    "True if `out` is a C-contiguous array with a dtype from `dtypes`"
+    return (isinstance(out, _numpy.ndarray)
+            and out.flags.c_contiguous
+            and out.flags.writeable
+            and out.dtype in dtypes)
+
+cdef void _convert_array(
+    _comedilib_h.comedi_polynomial_t *p, _numpy.ndarray data,
+    _numpy.ndarray out, bint to_physical) except *:
+    """Apply the polynomial conversion `p` to contiguous arrays
+
+    `data` and `out` must be C-contiguous arrays with the same number
+    of elements.  For `to_physical` conversions, `data` may hold
+    `sampl`, `lsampl`, or `double` values, and `out` must hold
+    `double`\s.  For `from_physical` conversions, `data` must hold
+    `double`\s and `out` may hold `sampl`, `lsampl`, or `double`
+    values.  The conversion loop runs without the GIL.
+    """
+    cdef Py_ssize_t n = data.size
+    cdef void *d = _numpy.PyArray_DATA(data)
+    cdef void *o = _numpy.PyArray_DATA(out)
+    if to_physical:
+        if data.dtype == _utility.sampl:
+            with nogil:
+                _to_physical_array(
+                    p, <_comedi_h.sampl_t *> d, <double *> o, n)
+        elif data.dtype == _utility.lsampl:
+            with nogil:
+                _to_physical_array(
+                    p, <_comedi_h.lsampl_t *> d, <double *> o, n)
+        else:
+            with nogil:
+                _to_physical_array(p, <double *> d, <double *> o, n)
+    else:
+        if out.dtype == _utility.sampl:
+            with nogil:
+                _from_physical_array(
+                    p, <double *> d, <_comedi_h.sampl_t *> o, n)
+        elif out.dtype == _utility.lsampl:
+            with nogil:
+                _from_physical_array(
+                    p, <double *> d, <_comedi_h.lsampl_t *> o, n)
+        else:
+            with nogil:
+                _from_physical_array(p, <double *> d, <double *> o, n)
+
 cdef object _convert(
-    _comedilib_h.comedi_polynomial_t *p, object data, object direction):
+    _comedilib_h.comedi_polynomial_t *p, object data, object direction,
+    object out=None):
     """Apply the polynomial conversion `p` to `data`.
 
     `direction` should be a value from `constant.CONVERSION_DIRECTION`.
+
+    If `out` is given, it should be an array with the same shape as
+    `data`, and the converted values are written into it (and `out`
+    is returned).  Conversions between contiguous `sampl`, `lsampl`,
+    and `double` arrays avoid any temporary arrays.
     """
     to_physical = (_constant.bitwise_value(direction)
                    == _constant.CONVERSION_DIRECTION.to_physical.value)
-    if _numpy.isscalar(data):
+    if _numpy.isscalar(data) and out is None:
         if to_physical:
             return _comedilib_h.comedi_to_physical(data, p)
         else:
             return _comedilib_h.comedi_from_physical(data, p)
+    array = _numpy.asarray(data)
     if to_physical:
         dtype = _numpy.double
+        if array.dtype not in _ARRAY_DTYPES:
+            if array.dtype.kind in 'biu':
+                array = array.astype(_utility.lsampl)
+            else:
+                array = array.astype(_numpy.double)
+        targets = (_numpy.double,)
     else:
         dtype = _utility.lsampl
-    array = _numpy.array(data, dtype=dtype)
-    for i,d in enumerate(data):
-        if to_physical:
-            array[i] = _comedilib_h.comedi_to_physical(d, p)
-        else:
-            array[i] = _comedilib_h.comedi_from_physical(d, p)
-    return array
+        if array.dtype != _numpy.double:
+            array = array.astype(_numpy.double)
+        targets = _ARRAY_DTYPES
+    array = _numpy.ascontiguousarray(array)
+    if out is None:
+        out = _numpy.empty(array.shape, dtype=dtype)
+    elif _numpy.shape(out) != array.shape:
+        raise ValueError('output shape {} does not match input shape {}'.format(
+                _numpy.shape(out), array.shape))
+    if _is_array_target(out, targets):
+        _convert_array(p, array, out, to_physical)
+    else:
+        target = _numpy.empty(array.shape, dtype=dtype)
+        _convert_array(p, array, target, to_physical)
+        out[...] = target
+    return out
 
-cpdef comedi_to_physical(data, coefficients, expansion_origin):
+cpdef comedi_to_physical(data, coefficients, expansion_origin, out=None):
     """Convert Comedi bit values (`lsampl_t`) to physical units (`double`)
 
     * `data` is the value to be converted (scalar or array-like)
     * `coefficients` and `expansion_origin` should be appropriate
       for `_setup_comedi_polynomial_t`.  TODO: expose it's docstring?
+    * `out` is an optional array (with the same shape as `data`) for
+      storing the result.
 
     The conversion algorithm is::
 
@@ -117,12 +301,25 @@ cpdef comedi_to_physical(data, coefficients, expansion_origin):
     2.0
     >>> comedi_to_physical([1, 2, 3], [1, 2, 3], 2)
     array([ 2.,  1.,  6.])
+
+    Array conversions run in a typed loop (without holding the GIL),
+    and can write into preallocated output arrays.
+
+    >>> data = _numpy.array([[1, 2], [3, 4]], dtype=_numpy.uint16)
+    >>> out = _numpy.zeros(data.shape, dtype=_numpy.double)
+    >>> comedi_to_physical(data, [1, 2, 3], 2, out=out)
+    array([[  2.,   1.],
+           [  6.,  17.]])
+    >>> out
+    array([[  2.,   1.],
+           [  6.,  17.]])
     """
     cdef _comedilib_h.comedi_polynomial_t p
     _setup_comedi_polynomial_t(&p, coefficients, expansion_origin)
-    return _convert(&p, data, _constant.CONVERSION_DIRECTION.to_physical)
+    return _convert(&p, data, _constant.CONVERSION_DIRECTION.to_physical,
+                    out=out)
 
-cpdef comedi_from_physical(data, coefficients, expansion_origin):
+cpdef comedi_from_physical(data, coefficients, expansion_origin, out=None):
     """Convert physical units to Comedi bit values
 
     Like `comedi_to_physical` but converts `double` -> `lsampl_t`.
@@ -131,10 +328,17 @@ cpdef comedi_from_physical(data, coefficients, expansion_origin):
     2L
     >>> comedi_from_physical([1, 2, 3], [1, 2, 3], 2)
     array([2, 1, 6], dtype=uint32)
+
+    You can convert directly into `sampl` output buffers.
+
+    >>> out = _numpy.zeros((3,), dtype=_numpy.uint16)
+    >>> comedi_from_physical([1, 2, 3], [1, 2, 3], 2, out=out)
+    array([2, 1, 6], dtype=uint16)
     """
     cdef _comedilib_h.comedi_polynomial_t p
     _setup_comedi_polynomial_t(&p, coefficients, expansion_origin)
-    return _convert(&p, data, _constant.CONVERSION_DIRECTION.from_physical)
+    return _convert(&p, data, _constant.CONVERSION_DIRECTION.from_physical,
+                    out=out)
 
 
 cdef class CalibratedConverter (object):
@@ -158,6 +362,11 @@ cdef class CalibratedConverter (object):
     array([ 2.,  1.,  6.])
     >>> c.to_physical(_numpy.array([0, 1, 2, 3], dtype=_numpy.uint))
     array([  2.,   1.,   6.,  17.])
+    >>> out = _numpy.zeros((4,), dtype=_numpy.double)
+    >>> c.to_physical(_numpy.array([0, 1, 2, 3], dtype=_numpy.uint16), out=out)
+    array([  2.,   1.,   6.,  17.])
+    >>> out
+    array([  2.,   1.,   6.,  17.])
 
     >>> c.get_to_physical_expansion_origin()
     1.0
@@ -173,6 +382,8 @@ cdef class CalibratedConverter (object):
     Traceback (most recent call last):
       ...
     Exception: no conversion polynomial
+    >>> print(c.get_from_physical_error())
+    no conversion polynomial
 
     However, even with the error, you can extract dummy coefficients.
 
@@ -213,15 +424,15 @@ cdef class CalibratedConverter (object):
     def __repr__(self):
         return self.__str__()
 
-    cpdef to_physical(self, data):
+    cpdef to_physical(self, data, out=None):
         return _convert(&self._to_physical, data,
-                        _constant.CONVERSION_DIRECTION.to_physical)
+                        _constant.CONVERSION_DIRECTION.to_physical, out=out)
 
-    cpdef from_physical(self, data):
+    cpdef from_physical(self, data, out=None):
         if self._from_physical_error is not None:
             raise self._from_physical_error
         return _convert(&self._from_physical, data,
-                        _constant.CONVERSION_DIRECTION.from_physical)
+                        _constant.CONVERSION_DIRECTION.from_physical, out=out)
 
     cpdef get_to_physical_expansion_origin(self):
         return self._to_physical.expansion_origin
@@ -241,6 +452,434 @@ cdef class CalibratedConverter (object):
             ret[i] = self._from_physical.coefficients[i]
         return ret
 
+    cpdef get_from_physical_error(self):
+        "Error raised by `from_physical()`, or `None` if it works"
+        return self._from_physical_error
+
+
+cdef class ConverterBank (object):
+    """Convert interleaved multi-channel scans in a single pass
+
+    `converters` holds one `CalibratedConverter` per channel (column)
+    of the `(n_scans, n_channels)` buffers you will convert.  Rather
+    than converting one strided column at a time, the bank walks the
+    buffer in memory order and applies each column's polynomial as
+    it goes.  `Subdevice.get_converter_bank()` builds a bank for a
+    command's channel list.
+
+    >>> bank = ConverterBank([
+    ...     CalibratedConverter(to_physical_coefficients=[0, 1],
+    ...         from_physical_coefficients=[0, 1]),
+    ...     CalibratedConverter(to_physical_coefficients=[0, -2],
+    ...         from_physical_coefficients=[0, -0.5])])
+    >>> len(bank)
+    2
+    >>> data = _numpy.array([[0, 10], [1, 11], [2, 12]], dtype=_numpy.uint16)
+    >>> physical = bank.to_physical(data)
+    >>> physical
+    array([[  0., -20.],
+           [  1., -22.],
+           [  2., -24.]])
+    >>> bank.from_physical(physical, dtype=_numpy.uint16)
+    array([[ 0, 10],
+           [ 1, 11],
+           [ 2, 12]], dtype=uint16)
+
+    You can convert straight into your own `double` or `float32`
+    output buffer.
+
+    >>> out = _numpy.zeros((3, 2), dtype=_numpy.float32)
+    >>> bank.to_physical(data, out=out)
+    array([[  0., -20.],
+           [  1., -22.],
+           [  2., -24.]], dtype=float32)
+
+    Flat buffers of interleaved samples work too, as long as they hold
+    whole scans.
+
+    >>> bank.to_physical(data.reshape(-1))
+    array([  0., -20.,   1., -22.,   2., -24.])
+    >>> bank.to_physical(data.reshape(-1)[:3])
+    Traceback (most recent call last):
+      ...
+    ValueError: data shape (3,) does not hold whole 2-channel scans
+    """
+    def __cinit__(self):
+        self._to_physical = NULL
+        self._from_physical = NULL
+        self._n_channels = 0
+        self._from_physical_error = None
+
+    def __init__(self, converters):
+        cdef CalibratedConverter converter
+        self.converters = list(converters)
+        n = len(self.converters)
+        size = sizeof(_comedilib_h.comedi_polynomial_t)
+        self._to_physical = <_comedilib_h.comedi_polynomial_t *> (
+            _stdlib.calloc(max(n, 1), size))
+        self._from_physical = <_comedilib_h.comedi_polynomial_t *> (
+            _stdlib.calloc(max(n, 1), size))
+        if self._to_physical is NULL or self._from_physical is NULL:
+            raise MemoryError()
+        for i,converter in enumerate(self.converters):
+            self._to_physical[i] = converter._to_physical
+            self._from_physical[i] = converter._from_physical
+            if (self._from_physical_error is None and
+                    converter._from_physical_error is not None):
+                self._from_physical_error = converter._from_physical_error
+        self._n_channels = n
+
+    def __dealloc__(self):
+        if self._to_physical is not NULL:
+            _stdlib.free(self._to_physical)
+            self._to_physical = NULL
+        if self._from_physical is not NULL:
+            _stdlib.free(self._from_physical)
+            self._from_physical = NULL
+
+    def __len__(self):
+        return self._n_channels
+
+    cdef _check_shape(self, array):
+        if (self._n_channels == 0 or array.ndim == 0 or
+                (array.ndim == 1 and array.size % self._n_channels) or
+                (array.ndim > 1 and array.shape[-1] != self._n_channels)):
+            raise ValueError(
+                'data shape {} does not hold whole {}-channel scans'.format(
+                    array.shape, self._n_channels))
+
+    cpdef to_physical(self, data, out=None):
+        """Convert raw scans to physical units
+
+        `out` may be any array with the same shape as `data`.
+        Contiguous `double` and `float32` outputs are written directly.
+        """
+        cdef _numpy.ndarray array, target
+        array = _numpy.asarray(data)
+        self._check_shape(array)
+        if array.dtype not in _ARRAY_DTYPES:
+            if array.dtype.kind in 'biu':
+                array = array.astype(_utility.lsampl)
+            else:
+                array = array.astype(_numpy.double)
+        array = _numpy.ascontiguousarray(array)
+        if out is None:
+            out = _numpy.empty(array.shape, dtype=_numpy.double)
+        elif _numpy.shape(out) != array.shape:
+            raise ValueError(
+                'output shape {} does not match input shape {}'.format(
+                    _numpy.shape(out), array.shape))
+        if _is_array_target(out, (_numpy.double, _numpy.float32)):
+            target = out
+        else:
+            target = _numpy.empty(array.shape, dtype=_numpy.double)
+        self._to_physical_array(array, target)
+        if target is not out:
+            out[...] = target
+        return out
+
+    cdef _to_physical_array(self, _numpy.ndarray data, _numpy.ndarray out):
+        cdef void *d = _numpy.PyArray_DATA(data)
+        cdef void *o = _numpy.PyArray_DATA(out)
+        cdef Py_ssize_t n_channels = self._n_channels
+        cdef Py_ssize_t n_scans = data.size // n_channels
+        cdef _comedilib_h.comedi_polynomial_t *p = self._to_physical
+        if out.dtype == _numpy.double:
+            if data.dtype == _utility.sampl:
+                with nogil:
+                    _bank_to_physical(p, <_comedi_h.sampl_t *> d,
+                                      <double *> o, n_scans, n_channels)
+            elif data.dtype == _utility.lsampl:
+                with nogil:
+                    _bank_to_physical(p, <_comedi_h.lsampl_t *> d,
+                                      <double *> o, n_scans, n_channels)
+            else:
+                with nogil:
+                    _bank_to_physical(p, <double *> d,
+                                      <double *> o, n_scans, n_channels)
+        else:
+            if data.dtype == _utility.sampl:
+                with nogil:
+                    _bank_to_physical(p, <_comedi_h.sampl_t *> d,
+                                      <float *> o, n_scans, n_channels)
+            elif data.dtype == _utility.lsampl:
+                with nogil:
+                    _bank_to_physical(p, <_comedi_h.lsampl_t *> d,
+                                      <float *> o, n_scans, n_channels)
+            else:
+                with nogil:
+                    _bank_to_physical(p, <double *> d,
+                                      <float *> o, n_scans, n_channels)
+
+    cpdef from_physical(self, data, out=None, dtype=None):
+        """Convert physical scans to raw values
+
+        If `out` is `None`, a new `dtype` array (`lsampl` by default)
+        is returned.  Contiguous `sampl`, `lsampl`, and `double`
+        outputs are written directly.
+        """
+        cdef _numpy.ndarray array, target
+        if self._from_physical_error is not None:
+            raise self._from_physical_error
+        array = _numpy.asarray(data)
+        self._check_shape(array)
+        array = _numpy.ascontiguousarray(array, dtype=_numpy.double)
+        if out is None:
+            if dtype is None:
+                dtype = _utility.lsampl
+            out = _numpy.empty(array.shape, dtype=dtype)
+        elif _numpy.shape(out) != array.shape:
+            raise ValueError(
+                'output shape {} does not match input shape {}'.format(
+                    _numpy.shape(out), array.shape))
+        if _is_array_target(out, _ARRAY_DTYPES):
+            target = out
+        else:
+            target = _numpy.empty(array.shape, dtype=_utility.lsampl)
+        self._from_physical_array(array, target)
+        if target is not out:
+            out[...] = target
+        return out
+
+    cdef _from_physical_array(self, _numpy.ndarray data, _numpy.ndarray out):
+        cdef void *d = _numpy.PyArray_DATA(data)
+        cdef void *o = _numpy.PyArray_DATA(out)
+        cdef Py_ssize_t n_channels = self._n_channels
+        cdef Py_ssize_t n_scans = data.size // n_channels
+        cdef _comedilib_h.comedi_polynomial_t *p = self._from_physical
+        if out.dtype == _utility.sampl:
+            with nogil:
+                _bank_from_physical(p, <double *> d,
+                                    <_comedi_h.sampl_t *> o, n_scans,
+                                    n_channels)
+        elif out.dtype == _utility.lsampl:
+            with nogil:
+                _bank_from_physical(p, <double *> d,
+                                    <_comedi_h.lsampl_t *> o, n_scans,
+                                    n_channels)
+        else:
+            with nogil:
+                _bank_from_physical(p, <double *> d, <double *> o, n_scans,
+                                    n_channels)
+
+
+def _lookup_table(key, converter):
+    """Read-only table of `converter.to_physical()` for every `sampl`
+
+    `key` is `(coefficients, expansion_origin, dtype)`.  The
+    `LOOKUP_TABLE_CACHE_SIZE` most recently used tables are cached.
+    """
+    try:
+        table = _LOOKUP_TABLES.pop(key)
+    except KeyError:
+        codes = _numpy.arange(
+            _numpy.iinfo(_utility.sampl).max + 1, dtype=_utility.sampl)
+        table = converter.to_physical(codes).astype(key[2])
+        table.flags.writeable = False
+    _LOOKUP_TABLES[key] = table
+    while len(_LOOKUP_TABLES) > LOOKUP_TABLE_CACHE_SIZE:
+        _LOOKUP_TABLES.popitem(last=False)
+    return table
+
+
+class LookupTableConverter (object):
+    """Convert `sampl` data to physical units with a lookup table
+
+    There are only 65536 possible `sampl` values, so instead of
+    evaluating the `to_physical` polynomial for every sample, the
+    wrapped `converter` is evaluated once for each possible value.
+    Converting a buffer is then a single `take()` from that table.
+    Tables hold `dtype` values and are shared between converters with
+    the same polynomial.  Only the `LOOKUP_TABLE_CACHE_SIZE` most
+    recently used tables are kept, and evicted tables are rebuilt on
+    demand.
+
+    >>> c = CalibratedConverter(
+    ...     to_physical_coefficients=[1, 2],
+    ...     from_physical_coefficients=[-0.5, 0.5])
+    >>> l = LookupTableConverter(c)
+    >>> data = _numpy.array([0, 1, 2, 3], dtype=_numpy.uint16)
+    >>> l.to_physical(data)
+    array([ 1.,  3.,  5.,  7.])
+    >>> out = _numpy.zeros((4,), dtype=_numpy.double)
+    >>> l.to_physical(data, out=out)
+    array([ 1.,  3.,  5.,  7.])
+    >>> out
+    array([ 1.,  3.,  5.,  7.])
+    >>> l.to_physical(3)
+    7.0
+
+    Single-precision tables take half the memory.
+
+    >>> LookupTableConverter(c, dtype=_numpy.float32).to_physical(data)
+    array([ 1.,  3.,  5.,  7.], dtype=float32)
+
+    Other data types and `from_physical()` conversions fall back to
+    the wrapped converter.
+
+    >>> l.to_physical(_numpy.array([3], dtype=_numpy.uint32))
+    array([ 7.])
+    >>> l.from_physical(7.0)
+    3L
+    """
+    def __init__(self, converter, dtype=_numpy.double):
+        self.converter = converter
+        self.dtype = _numpy.dtype(dtype)
+        self._key = (
+            tuple(converter.get_to_physical_coefficients()),
+            converter.get_to_physical_expansion_origin(),
+            self.dtype)
+
+    def _table_get(self):
+        return _lookup_table(self._key, self.converter)
+    table = property(fget=_table_get, doc='Physical value for each code')
+
+    def to_physical(self, data, out=None):
+        array = _numpy.asarray(data)
+        if array.dtype != _utility.sampl:
+            return self.converter.to_physical(data, out=out)
+        table = self.table
+        if out is None:
+            return table.take(array, mode='clip')
+        if (isinstance(out, _numpy.ndarray) and out.dtype == table.dtype
+                and out.flags.c_contiguous and out.flags.writeable):
+            return table.take(array, out=out, mode='clip')
+        out[...] = table.take(array, mode='clip')
+        return out
+
+    def from_physical(self, data, out=None):
+        return self.converter.from_physical(data, out=out)
+
+
+class PhysicalView (object):
+    """Lazy physical-unit view of a raw `(n_scans, n_channels)` buffer
+
+    `converters` holds one `CalibratedConverter` per column of
+    `data`.  Nothing is converted until you index the view or iterate
+    over `.chunks()`.  Scans are converted in chunks of `chunk_scans`,
+    and the most recently used chunks are cached until they take up
+    more than `max_bytes`.
+
+    >>> data = _numpy.array([[0, 10], [1, 11], [2, 12], [3, 13], [4, 14]],
+    ...     dtype=_numpy.uint16)
+    >>> converters = [
+    ...     CalibratedConverter(to_physical_coefficients=[0, 1]),
+    ...     CalibratedConverter(to_physical_coefficients=[0, -2])]
+    >>> v = PhysicalView(data, converters, chunk_scans=2)
+    >>> v.shape
+    (5, 2)
+    >>> v[1:4]
+    array([[  1., -22.],
+           [  2., -24.],
+           [  3., -26.]])
+    >>> v[-1]
+    array([  4., -28.])
+    >>> v[::2,1]
+    array([-20., -24., -28.])
+    >>> v[[4, 0], 0]
+    array([ 4.,  0.])
+    >>> sorted(v._cache.keys())
+    [0, 1, 2]
+
+    Iterate over the converted buffer chunk by chunk.
+
+    >>> for chunk in v.chunks():
+    ...     print(chunk[:,0])
+    [ 0.  1.]
+    [ 2.  3.]
+    [ 4.]
+
+    The returned arrays may be views of cached chunks, so they are
+    read-only.  Copy them if you need to modify the values.
+    """
+    def __init__(self, data, converters, chunk_scans=4096,
+                 max_bytes=64*2**20):
+        self.data = data
+        self.converters = list(converters)
+        if len(self.converters) != data.shape[1]:
+            raise ValueError('{} converters for {} channels'.format(
+                    len(self.converters), data.shape[1]))
+        self._bank = ConverterBank(self.converters)
+        self.chunk_scans = chunk_scans
+        self.max_bytes = max_bytes
+        self._cache = _collections.OrderedDict()
+        self._cache_bytes = 0
+
+    def _shape_get(self):
+        return self.data.shape
+    shape = property(fget=_shape_get)
+
+    def __len__(self):
+        return self.data.shape[0]
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        rows,columns = key[0],key[1:]
+        if isinstance(rows, (int, long, _numpy.integer)):
+            index = rows
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError('scan index {} out of range'.format(rows))
+            return self._scans(index, index+1)[(0,) + columns]
+        if isinstance(rows, slice):
+            start,stop,step = rows.indices(len(self))
+            if step > 0:
+                ret = self._scans(start, stop)[::step]
+                return ret[(slice(None),) + columns]
+        ret = self._convert(self.data[rows])
+        ret.flags.writeable = False
+        return ret[(slice(None),) + columns]
+
+    def chunks(self):
+        "Iterate over converted `(chunk_scans, n_channels)` blocks"
+        for i in range(-(-len(self) // self.chunk_scans)):
+            yield self.chunk(i)
+
+    def chunk(self, index):
+        "Converted scans for the `index`\th chunk"
+        try:
+            ret = self._cache.pop(index)
+        except KeyError:
+            start = index * self.chunk_scans
+            ret = self._convert(self.data[start:start + self.chunk_scans])
+            ret.flags.writeable = False
+            self._cache_bytes += ret.nbytes
+        self._cache[index] = ret  # most recently used chunks go last
+        while self._cache_bytes > self.max_bytes and len(self._cache) > 1:
+            old_index,old = self._cache.popitem(last=False)
+            self._cache_bytes -= old.nbytes
+        return ret
+
+    def clear_cache(self):
+        "Drop all cached chunks"
+        self._cache.clear()
+        self._cache_bytes = 0
+
+    def _scans(self, start, stop):
+        "Converted scans `start:stop` assembled from cached chunks"
+        if stop <= start:
+            return _numpy.zeros((0, self.data.shape[1]), dtype=_numpy.double)
+        first = start // self.chunk_scans
+        last = (stop - 1) // self.chunk_scans
+        parts = []
+        for i in range(first, last + 1):
+            offset = i * self.chunk_scans
+            parts.append(self.chunk(i)[
+                    max(start - offset, 0):stop - offset])
+        if len(parts) == 1:
+            return parts[0]
+        ret = _numpy.concatenate(parts)
+        ret.flags.writeable = False
+        return ret
+
+    def _convert(self, raw):
+        "Convert `raw` scans into a new `double` array"
+        if len(raw) == 0:
+            return _numpy.zeros(raw.shape, dtype=_numpy.double)
+        return self._bank.to_physical(raw)
+
 
 cdef class Caldac (object):
     """Class wrapping comedi_caldac_t
@@ -656,11 +1295,64 @@ cdef class Calibration (object):
     >>> c.driver_name = "Override with your own value"
     >>> c.driver_name = name
 
+    Serialize the parsed calibration with `.dumps()`.  `.loads()`
+    restores it without parsing the calibration file, which is useful
+    for sharing one calibration among worker processes.
+
+    >>> data = c.dumps()
+    >>> c2 = Calibration(device=d)
+    >>> c2.loads(data)
+    >>> c2.board_name
+    'pci-6052e'
+    >>> len(c2.settings) == len(c.settings)
+    True
+    >>> c2.dumps() == data
+    True
+
+    The settings are indexed by subdevice, channel, and range when the
+    calibration is loaded, so looking up the settings or converters
+    for a channel configuration does not walk the whole settings list.
+    Settings with empty `channels`, `ranges`, or `arefs` lists match
+    any value, and matches are returned in file order.
+
+    >>> for s in c.get_settings(subdevice=1, channel=0, range=1):
+    ...     print('{} {}'.format(s.channels, s.ranges))
+    [0] [1 3]
+
+    This board is hardware-calibrated, so its settings have no soft
+    calibration polynomials.
+
+    >>> c.get_converter(subdevice=0, channel=0, range=0)
+    ... # doctest: +NORMALIZE_WHITESPACE
+    Traceback (most recent call last):
+      ...
+    PyComediError: comedi_get_softcal_converter:
+      no to-physical polynomial for subdevice 0 channel 0 range 0 (-1)
+
+    Add one to the first setting of our copy, which matches every
+    analog input channel and range.  Then get converters for a whole
+    channel list in one call.
+
+    >>> c2.settings[0].soft_calibration = CalibratedConverter(
+    ...     to_physical_coefficients=[-10.0, 0.00030518043793392844],
+    ...     from_physical_coefficients=[0.0, 3276.75],
+    ...     from_physical_expansion_origin=-10.0)
+    >>> c2.reindex()
+    >>> from .chanspec import ChanList
+    >>> converters = c2.get_converters(
+    ...     subdevice=0, chanlist=ChanList(chan=range(4), range=0))
+    >>> len(converters)
+    4
+    >>> converters[0] is converters[3]
+    True
+
     >>> d.close()
     """
     def __cinit__(self):
         self.calibration = NULL
         self.device = None
+        self._index = {}
+        self._converters = {}
 
     def __init__(self, device):
         super(Calibration, self).__init__()
@@ -699,24 +1391,240 @@ cdef class Calibration (object):
     def _settings_get(self):
         if self.calibration is NULL:
             return None
+        return self._settings(range(self.calibration.num_settings))
+    def _settings_set(self, value):
+        assert self.calibration is not NULL, 'load calibration first'
+        return None
+    settings = property(fget=_settings_get, fset=_settings_set)
+
+    def _settings(self, indices):
+        "`CalibrationSetting`s for the settings at `indices`"
+        subdevices = {}
         ret = []
-        for i in range(self.calibration.num_settings):
+        for i in indices:
+            index = self.calibration.settings[i].subdevice
+            if index not in subdevices:
+                subdevices[index] = self.device.subdevice(index=index)
             s = <CalibrationSetting> CalibrationSetting(
-                subdevice=self.device.subdevice(
-                    index=self.calibration.settings[i].subdevice))
+                subdevice=subdevices[index])
             s.setting = &self.calibration.settings[i]
             ret.append(s)
         return ret
-    def _settings_set(self, value):
-        assert self.calibration is not NULL, 'load calibration first'
-        return None
-    settings = property(fget=_settings_get, fset=_settings_set)
 
     cpdef from_file(self, path):
         self.calibration = _comedilib_h.comedi_parse_calibration_file(path)
         if self.calibration == NULL:
             _error.raise_error(
                 function_name='comedi_parse_calibration_file')
+        self.reindex()
+
+    cpdef reindex(self):
+        """Rebuild the setting index and drop cached converters
+
+        `.from_file()` and `.loads()` index the settings for you.
+        Call this after altering the settings by hand.
+        """
+        cdef _comedilib_h.comedi_calibration_setting_t *s
+        index = {}
+        if self.calibration is not NULL:
+            for i in range(self.calibration.num_settings):
+                s = &self.calibration.settings[i]
+                channels = [s.channels[j] for j in range(s.num_channels)]
+                ranges = [s.ranges[j] for j in range(s.num_ranges)]
+                for channel in channels or [None]:
+                    for range_ in ranges or [None]:
+                        indices = index.setdefault(
+                            (s.subdevice, channel, range_), [])
+                        if not indices or indices[-1] != i:
+                            indices.append(i)
+        self._index = index
+        self._converters = {}
+
+    def _setting_indices(self, subdevice, channel, range):
+        "Indices of the settings matching a channel, in file order"
+        ret = set()
+        for key in [(subdevice, channel, range),
+                    (subdevice, channel, None),
+                    (subdevice, None, range),
+                    (subdevice, None, None)]:
+            ret.update(self._index.get(key, ()))
+        return sorted(ret)
+
+    def get_settings(self, subdevice, channel, range, aref=None):
+        """`CalibrationSetting`s matching a channel configuration
+
+        If `aref` is `None`, the settings' `arefs` are ignored.
+        """
+        cdef _comedilib_h.comedi_calibration_setting_t *s
+        assert self.calibration is not NULL, 'load calibration first'
+        indices = self._setting_indices(
+            _constant.bitwise_value(subdevice), channel,
+            _constant.bitwise_value(range))
+        if aref is not None:
+            aref = _constant.bitwise_value(aref)
+            matches = []
+            for i in indices:
+                s = &self.calibration.settings[i]
+                if s.num_arefs == 0 or aref in s.arefs[:s.num_arefs]:
+                    matches.append(i)
+            indices = matches
+        return self._settings(indices)
+
+    def get_converter(self, subdevice, channel, range):
+        """`CalibratedConverter` for a software-calibrated channel
+
+        This matches `comedi_get_softcal_converter()`: each direction
+        uses the first matching setting with a polynomial for that
+        direction.  Converters are cached until `.reindex()`.
+        """
+        cdef _comedilib_h.comedi_calibration_setting_t *s
+        cdef _comedilib_h.comedi_polynomial_t *to_physical = NULL
+        cdef _comedilib_h.comedi_polynomial_t *from_physical = NULL
+        cdef CalibratedConverter ret
+        assert self.calibration is not NULL, 'load calibration first'
+        key = (_constant.bitwise_value(subdevice), channel,
+               _constant.bitwise_value(range))
+        try:
+            return self._converters[key]
+        except KeyError:
+            pass
+        for i in self._setting_indices(*key):
+            s = &self.calibration.settings[i]
+            if to_physical is NULL:
+                to_physical = s.soft_calibration.to_phys
+            if from_physical is NULL:
+                from_physical = s.soft_calibration.from_phys
+        msg = 'no {{}} polynomial for subdevice {} channel {} range {}'.format(
+            *key)
+        if to_physical is NULL:
+            raise _PyComediError(
+                function_name='comedi_get_softcal_converter', ret=-1,
+                comedi_msg=msg.format('to-physical'))
+        from_physical_error = None
+        if from_physical is NULL:
+            from_physical_error = _PyComediError(
+                function_name='comedi_get_softcal_converter', ret=-1,
+                comedi_msg=msg.format('from-physical'))
+        ret = CalibratedConverter(from_physical_error=from_physical_error)
+        ret._to_physical = to_physical[0]
+        if from_physical is not NULL:
+            ret._from_physical = from_physical[0]
+        self._converters[key] = ret
+        return ret
+
+    def get_converters(self, subdevice, chanlist):
+        """`CalibratedConverter`s for each entry in `chanlist`
+
+        `chanlist` may be a `Command`, a `ChanList`, or a sequence of
+        `ChanSpec`s (or channels with a `chanspec()` method).  Entries
+        sharing a channel and range share a converter.
+        """
+        if hasattr(chanlist, 'packed_chanlist'):  # a Command
+            chanlist = chanlist.packed_chanlist
+        if isinstance(chanlist, _chanspec.ChanList):
+            pairs = zip(chanlist.chan.tolist(), chanlist.range.tolist())
+        else:
+            pairs = []
+            for chanspec in chanlist:
+                if hasattr(chanspec, 'chanspec'):
+                    chanspec = chanspec.chanspec()
+                pairs.append((chanspec.chan, chanspec.range))
+        return [self.get_converter(subdevice, channel, range_)
+                for channel,range_ in pairs]
+
+    cpdef dumps(self):
+        """Serialize the calibration as compact JSON bytes
+
+        The result holds the board and driver names and, for each
+        setting, the subdevice, channels, ranges, arefs, caldacs, and
+        soft calibration polynomials.
+        """
+        cdef _comedilib_h.comedi_calibration_setting_t *s
+        assert self.calibration is not NULL, 'load calibration first'
+        settings = []
+        for i in range(self.calibration.num_settings):
+            s = &self.calibration.settings[i]
+            settings.append([
+                    s.subdevice,
+                    [s.channels[j] for j in range(s.num_channels)],
+                    [s.ranges[j] for j in range(s.num_ranges)],
+                    [s.arefs[j] for j in range(s.num_arefs)],
+                    [[s.caldacs[j].subdevice, s.caldacs[j].channel,
+                      s.caldacs[j].value] for j in range(s.num_caldacs)],
+                    _dump_polynomial(s.soft_calibration.to_phys),
+                    _dump_polynomial(s.soft_calibration.from_phys),
+                    ])
+        state = {
+            'version': 1,
+            'driver_name': _dump_charp(self.calibration.driver_name),
+            'board_name': _dump_charp(self.calibration.board_name),
+            'settings': settings,
+            }
+        return _json.dumps(
+            state, sort_keys=True, separators=(',', ':')).encode('ascii')
+
+    cpdef loads(self, data):
+        "Replace the calibration with one serialized by `.dumps()`"
+        cdef _comedilib_h.comedi_calibration_t *c
+        cdef _comedilib_h.comedi_calibration_setting_t *s
+        if hasattr(data, 'decode'):
+            data = data.decode('ascii')
+        state = _json.loads(data)
+        if state.get('version') != 1:
+            raise ValueError('unsupported calibration version {}'.format(
+                    state.get('version')))
+        settings = state['settings']
+        c = <_comedilib_h.comedi_calibration_t *> _stdlib.calloc(
+            1, sizeof(_comedilib_h.comedi_calibration_t))
+        if c is NULL:
+            raise MemoryError()
+        try:
+            if state['driver_name'] is not None:
+                _python_to_charp(&c.driver_name, state['driver_name'], 'ascii')
+            if state['board_name'] is not None:
+                _python_to_charp(&c.board_name, state['board_name'], 'ascii')
+            if settings:
+                c.settings = <_comedilib_h.comedi_calibration_setting_t *> (
+                    _stdlib.calloc(
+                        len(settings),
+                        sizeof(_comedilib_h.comedi_calibration_setting_t)))
+                if c.settings is NULL:
+                    raise MemoryError()
+                c.num_settings = len(settings)
+            for i,setting in enumerate(settings):
+                (subdevice, channels, ranges, arefs, caldacs, to_physical,
+                 from_physical) = setting
+                s = &c.settings[i]
+                s.subdevice = subdevice
+                _load_uints(&s.channels, &s.num_channels, channels)
+                _load_uints(&s.ranges, &s.num_ranges, ranges)
+                if len(arefs) > _comedilib_h.CS_MAX_AREFS_LENGTH:
+                    raise ValueError((len(arefs),
+                                      _comedilib_h.CS_MAX_AREFS_LENGTH))
+                for j,aref in enumerate(arefs):
+                    s.arefs[j] = aref
+                s.num_arefs = len(arefs)
+                if caldacs:
+                    s.caldacs = <_comedilib_h.comedi_caldac_t *> (
+                        _stdlib.calloc(len(caldacs),
+                                       sizeof(_comedilib_h.comedi_caldac_t)))
+                    if s.caldacs is NULL:
+                        raise MemoryError()
+                    s.num_caldacs = len(caldacs)
+                    for j,(caldac_subdevice, channel, value) in enumerate(
+                            caldacs):
+                        s.caldacs[j].subdevice = caldac_subdevice
+                        s.caldacs[j].channel = channel
+                        s.caldacs[j].value = value
+                _load_polynomial(&s.soft_calibration.to_phys, to_physical)
+                _load_polynomial(&s.soft_calibration.from_phys, from_physical)
+        except:
+            _comedilib_h.comedi_cleanup_calibration(c)
+            raise
+        if self.calibration is not NULL:
+            _comedilib_h.comedi_cleanup_calibration(self.calibration)
+        self.calibration = c
+        self.reindex()
 
 
 # TODO: see comedi_caldac_t and related at end of comedilib.h
@@ -73,6 +73,10 @@ cdef class Channel (object):
         return self.subdevice._device()
 
     def get_maxdata(self):
+        return self.subdevice.device._cached(
+            ('maxdata', self.subdevice.index, self.index), self._get_maxdata)
+
+    def _get_maxdata(self):
         ret = _comedilib_h.comedi_get_maxdata(
             self._device(), self.subdevice.index, self.index)
         if ret < 0:
@@ -80,6 +84,11 @@ cdef class Channel (object):
         return ret
 
     def get_n_ranges(self):
+        return self.subdevice.device._cached(
+            ('n_ranges', self.subdevice.index, self.index),
+            self._get_n_ranges)
+
+    def _get_n_ranges(self):
         ret = _comedilib_h.comedi_get_n_ranges(
             self._device(), self.subdevice.index, self.index)
         if ret < 0:
@@ -103,7 +112,9 @@ cdef class Channel (object):
     @cython.always_allow_keywords(True)
     def get_range(self, index):
         "`Range` instance for the `index`\ed range."
-        return self._get_range(index)
+        return self.subdevice.device._cached(
+            ('range', self.subdevice.index, self.index, index),
+            lambda: self._get_range(index))
 
     def _find_range(self, unit, min, max):
         "Search for range"
@@ -119,7 +130,11 @@ cdef class Channel (object):
 
         `unit` should be an item from `constants.UNIT`.
         """
-        return self.get_range(self._find_range(unit, min, max))
+        index = self.subdevice.device._cached(
+            ('find_range', self.subdevice.index, self.index,
+             _constant.bitwise_value(unit), min, max),
+            self._find_range, unit, min, max)
+        return self.get_range(index)
 
     def ranges(self, **kwargs):
         "Iterate through all available ranges."
@@ -187,18 +202,33 @@ cdef class DigitalChannel (Channel):
     def dio_read(self):
         "Read a single bit"
         cpdef unsigned int bit
-        ret = _comedilib_h.comedi_dio_read(
-            self._device(), self.subdevice.index, self.index, &bit)
+        cdef _comedilib_h.comedi_t *device = self._device()
+        cdef unsigned int subdevice = self.subdevice.index
+        cdef unsigned int index = self.index
+        cdef int ret, errno = 0
+        with nogil:
+            ret = _comedilib_h.comedi_dio_read(device, subdevice, index, &bit)
+            if ret < 0:
+                errno = _comedilib_h.comedi_errno()
         if ret < 0:
-            _error.raise_error(function_name='comedi_dio_read', ret=ret)
+            _error.raise_error(
+                function_name='comedi_dio_read', ret=ret, errno=errno)
         return int(bit)
 
     def dio_write(self, bit):
         "Write a single bit"
-        ret = _comedilib_h.comedi_dio_write(
-            self._device(), self.subdevice.index, self.index, bit)
+        cdef _comedilib_h.comedi_t *device = self._device()
+        cdef unsigned int subdevice = self.subdevice.index
+        cdef unsigned int index = self.index
+        cdef unsigned int b = bit
+        cdef int ret, errno = 0
+        with nogil:
+            ret = _comedilib_h.comedi_dio_write(device, subdevice, index, b)
+            if ret < 0:
+                errno = _comedilib_h.comedi_errno()
         if ret < 0:
-            _error.raise_error(function_name='comedi_dio_write', ret=ret)
+            _error.raise_error(
+                function_name='comedi_dio_write', ret=ret, errno=errno)
 
 
 cdef class AnalogChannel (Channel):
@@ -301,25 +331,42 @@ cdef class AnalogChannel (Channel):
     def data_read(self):
         "Read one sample"
         cdef _comedi_h.lsampl_t data
-        ret = _comedilib_h.comedi_data_read(
-            self._device(), self.subdevice.index, self.index,
-            _constant.bitwise_value(self.range),
-            _constant.bitwise_value(self.aref),
-            &data)
+        cdef _comedilib_h.comedi_t *device = self._device()
+        cdef unsigned int subdevice = self.subdevice.index
+        cdef unsigned int index = self.index
+        cdef unsigned int rng = _constant.bitwise_value(self.range)
+        cdef unsigned int aref = _constant.bitwise_value(self.aref)
+        cdef int ret, errno = 0
+        with nogil:
+            ret = _comedilib_h.comedi_data_read(
+                device, subdevice, index, rng, aref, &data)
+            if ret < 0:
+                errno = _comedilib_h.comedi_errno()
         if ret < 0:
-            _error.raise_error(function_name='comedi_data_read', ret=ret)
+            _error.raise_error(
+                function_name='comedi_data_read', ret=ret, errno=errno)
         return data
 
     def data_read_n(self, n):
         "Read `n` samples (timing between samples is undefined)."
         data = _numpy.ndarray(shape=(n,), dtype=_numpy.uint32)
-        ret = _comedilib_h.comedi_data_read_n(
-            self._device(), self.subdevice.index, self.index,
-            _constant.bitwise_value(self.range),
-            _constant.bitwise_value(self.aref),
-            <_comedilib_h.lsampl_t *>_numpy.PyArray_DATA(data), n)
+        cdef _comedilib_h.lsampl_t *d = <_comedilib_h.lsampl_t *>(
+            _numpy.PyArray_DATA(data))
+        cdef _comedilib_h.comedi_t *device = self._device()
+        cdef unsigned int subdevice = self.subdevice.index
+        cdef unsigned int index = self.index
+        cdef unsigned int rng = _constant.bitwise_value(self.range)
+        cdef unsigned int aref = _constant.bitwise_value(self.aref)
+        cdef unsigned int count = n
+        cdef int ret, errno = 0
+        with nogil:
+            ret = _comedilib_h.comedi_data_read_n(
+                device, subdevice, index, rng, aref, d, count)
+            if ret < 0:
+                errno = _comedilib_h.comedi_errno()
         if ret < 0:
-            _error.raise_error(function_name='comedi_data_read_n', ret=ret)
+            _error.raise_error(
+                function_name='comedi_data_read_n', ret=ret, errno=errno)
         return data
 
     def data_read_hint(self):
@@ -337,12 +384,20 @@ cdef class AnalogChannel (Channel):
         which sets up the input, pauses to allow settling, then
         performs a conversion.
         """
-        ret = _comedilib_h.comedi_data_read_hint(
-            self._device(), self.subdevice.index, self.index,
-            _constant.bitwise_value(self.range),
-            _constant.bitwise_value(self.aref))
+        cdef _comedilib_h.comedi_t *device = self._device()
+        cdef unsigned int subdevice = self.subdevice.index
+        cdef unsigned int index = self.index
+        cdef unsigned int rng = _constant.bitwise_value(self.range)
+        cdef unsigned int aref = _constant.bitwise_value(self.aref)
+        cdef int ret, errno = 0
+        with nogil:
+            ret = _comedilib_h.comedi_data_read_hint(
+                device, subdevice, index, rng, aref)
+            if ret < 0:
+                errno = _comedilib_h.comedi_errno()
         if ret < 0:
-            _error.raise_error(function_name='comedi_data_read_hint', ret=ret)
+            _error.raise_error(
+                function_name='comedi_data_read_hint', ret=ret, errno=errno)
 
     def data_read_delayed(self, nano_sec=0):
         """Read single sample after delaying specified settling time.
@@ -352,14 +407,21 @@ cdef class AnalogChannel (Channel):
         the nearest microsecond.
         """
         cdef _comedi_h.lsampl_t data
-        ret = _comedilib_h.comedi_data_read_delayed(
-            self._device(), self.subdevice.index, self.index,
-            _constant.bitwise_value(self.range),
-            _constant.bitwise_value(self.aref),
-            &data, int(nano_sec))
+        cdef _comedilib_h.comedi_t *device = self._device()
+        cdef unsigned int subdevice = self.subdevice.index
+        cdef unsigned int index = self.index
+        cdef unsigned int rng = _constant.bitwise_value(self.range)
+        cdef unsigned int aref = _constant.bitwise_value(self.aref)
+        cdef unsigned int delay = int(nano_sec)
+        cdef int ret, errno = 0
+        with nogil:
+            ret = _comedilib_h.comedi_data_read_delayed(
+                device, subdevice, index, rng, aref, &data, delay)
+            if ret < 0:
+                errno = _comedilib_h.comedi_errno()
         if ret < 0:
             _error.raise_error(function_name='comedi_data_read_delayed',
-                               ret=ret)
+                               ret=ret, errno=errno)
         return data
 
     def data_write(self, data):
@@ -367,13 +429,21 @@ cdef class AnalogChannel (Channel):
 
         Returns 1 (the number of data samples written).
         """
-        ret = _comedilib_h.comedi_data_write(
-            self._device(), self.subdevice.index, self.index,
-            _constant.bitwise_value(self.range),
-            _constant.bitwise_value(self.aref),
-            int(data))
+        cdef _comedilib_h.comedi_t *device = self._device()
+        cdef unsigned int subdevice = self.subdevice.index
+        cdef unsigned int index = self.index
+        cdef unsigned int rng = _constant.bitwise_value(self.range)
+        cdef unsigned int aref = _constant.bitwise_value(self.aref)
+        cdef _comedi_h.lsampl_t d = int(data)
+        cdef int ret, errno = 0
+        with nogil:
+            ret = _comedilib_h.comedi_data_write(
+                device, subdevice, index, rng, aref, d)
+            if ret != 1:
+                errno = _comedilib_h.comedi_errno()
         if ret != 1:
-            _error.raise_error(function_name='comedi_data_write', ret=ret)
+            _error.raise_error(
+                function_name='comedi_data_write', ret=ret, errno=errno)
 
     def chanspec(self):
         return _chanspec.ChanSpec(
@@ -417,33 +487,34 @@ cdef class AnalogChannel (Channel):
         cdef _comedilib_h.comedi_polynomial_t to_physical, from_physical
         cdef _calibration.CalibratedConverter ret
         flags = self.subdevice.get_flags()
-        from_physical_error = None
         if flags.soft_calibrated:
             if calibration is None:
                 calibration = self.subdevice.device.parse_calibration()
-            to_physical = self.get_softcal_converter(
-                _constant.CONVERSION_DIRECTION.to_physical,
-                calibration)
-            try:
-                from_physical = self.get_softcal_converter(
-                    _constant.CONVERSION_DIRECTION.from_physical,
-                    calibration)
-            except _PyComediError as e:
-                from_physical_error = e
-        else:
-            to_physical = self.get_hardcal_converter(
-                _constant.CONVERSION_DIRECTION.to_physical)
-            from_physical = self.get_hardcal_converter(
-                _constant.CONVERSION_DIRECTION.from_physical)
-        ret = _calibration.CalibratedConverter(
-            from_physical_error=from_physical_error)
+            return calibration.get_converter(
+                self.subdevice.index, self.index,
+                _constant.bitwise_value(self.range))
+        to_physical = self.get_hardcal_converter(
+            _constant.CONVERSION_DIRECTION.to_physical)
+        from_physical = self.get_hardcal_converter(
+            _constant.CONVERSION_DIRECTION.from_physical)
+        ret = _calibration.CalibratedConverter()
         ret._to_physical = to_physical
-        if from_physical_error is None:
-            ret._from_physical = from_physical
+        ret._from_physical = from_physical
         return ret
 
     def get_converter(self, calibration=None):
-        return self._get_converter(calibration)
+        """`CalibratedConverter` for the current range
+
+        If the device is caching, converters for the default
+        calibration (`calibration=None`) are cached until the next
+        `.apply_calibration()`.
+        """
+        if calibration is not None:
+            return self._get_converter(calibration)
+        return self.subdevice.device._cached(
+            ('converter', self.subdevice.index, self.index,
+             _constant.bitwise_value(self.range)),
+            lambda: self._get_converter(None))
 
     cdef _apply_calibration(self, char *path):
         if path is NULL:
@@ -481,6 +552,8 @@ cdef class AnalogChannel (Channel):
         we use the default device calibration, otherwise we try and
         use the calibration file located at `path`.
         """
+        self.subdevice.device.clear_cache(kind='converter')
+        self.subdevice.device.clear_cache(kind='command')
         if calibration is not None:
             self._apply_parsed_calibration(calibration)
         elif path is not None:
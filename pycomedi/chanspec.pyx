@@ -16,6 +16,8 @@
 
 "Replace Comedi's CR_PACK and related macros with a Python class"
 
+import numpy as _numpy
+
 from pycomedi cimport _comedi_h
 from . import constant as _constant
 
@@ -81,3 +83,119 @@ class ChanSpec (_constant.BitwiseOperator):
         self.value &= self._all - _constant.CR._all.value
         self.value |= _constant.bitwise_value(value) & _constant.CR._all.value
     flags = property(fget=_flags_get, fset=_flags_set)
+
+
+def _field_array(value):
+    "Convert a scalar or sequence of (possibly named) integers to an array"
+    if isinstance(value, _numpy.ndarray):
+        return value.astype(_numpy.uint32, copy=False)
+    if isinstance(value, _constant.BitwiseOperator):
+        return _numpy.uint32(value.value)
+    if hasattr(value, '__len__'):
+        value = [_constant.bitwise_value(v) for v in value]
+    return _numpy.asarray(value, dtype=_numpy.uint32)
+
+
+def _pack(chan, range, aref, flags):
+    "Vectorized `CR_PACK_FLAGS`"
+    return ((chan & 0xff)
+            | ((range & 0xff) << 16)
+            | ((aref & 0x03) << 24)
+            | (flags & _constant.CR._all.value))
+
+
+class ChanList (object):
+    """Channel specification list backed by a NumPy array
+
+    Where `ChanSpec` packs a single chanspec, `ChanList` packs whole
+    arrays of channels, ranges, arefs, and flags in one vectorized
+    step.  Scalars are broadcast against the other fields.
+
+    >>> from .constant import AREF, CR
+    >>> c = ChanList(chan=range(4), range=[0, 1, 1, 0], aref=AREF.diff)
+    >>> len(c)
+    4
+    >>> c.value
+    array([33554432, 33619969, 33619970, 33554435], dtype=uint32)
+    >>> c[1]
+    <ChanSpec chan:1 range:1 aref:diff flags:->
+
+    The fields are available as arrays, and setting a field repacks
+    the whole list.
+
+    >>> c.chan
+    array([0, 1, 2, 3], dtype=uint32)
+    >>> c.range = [2, 2, 3, 3]
+    >>> c.range
+    array([2, 2, 3, 3], dtype=uint32)
+    >>> c.aref = AREF.ground
+    >>> c.flags = CR.invert
+    >>> print c[3]
+    <ChanSpec chan:3 range:3 aref:ground flags:invert>
+
+    You can also wrap an existing array of packed chanspecs.
+
+    >>> ChanList(value=c.value[:2]).chan
+    array([0, 1], dtype=uint32)
+
+    Assign a `ChanList` to `Command.chanlist` to copy the packed
+    values straight into the command.
+    """
+    _fields = ChanSpec._fields
+
+    def __init__(self, chan=(), range=0, aref=0, flags=0, value=None):
+        if value is None:
+            fields = _numpy.broadcast_arrays(
+                _field_array(chan), _field_array(range),
+                _field_array(aref), _field_array(flags))
+            value = _pack(*fields)
+        self.value = _numpy.array(value, dtype=_numpy.uint32, ndmin=1)
+
+    def _set_field(self, value, mask, shift=0):
+        value = _field_array(value)
+        self.value = ((self.value & (ChanSpec._all - mask))
+                      | ((value << shift) & mask)).astype(_numpy.uint32)
+
+    def __len__(self):
+        return len(self.value)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return ChanList(value=self.value[key])
+        c = ChanSpec()
+        c.value = long(self.value[key])
+        return c
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __str__(self):
+        return '<%s %s>' % (self.__class__.__name__, list(self))
+
+    def __repr__(self):
+        return self.__str__()
+
+    def _chan_get(self):
+        return self.value & 0xff
+    def _chan_set(self, value):
+        self._set_field(value, 0xff)
+    chan = property(fget=_chan_get, fset=_chan_set)
+
+    def _range_get(self):
+        return (self.value >> 16) & 0xff
+    def _range_set(self, value):
+        self._set_field(value, 0xff << 16, 16)
+    range = property(fget=_range_get, fset=_range_set)
+
+    def _aref_get(self):
+        return (self.value >> 24) & 0x03
+    def _aref_set(self, value):
+        self._set_field(value, 0x03 << 24, 24)
+    aref = property(fget=_aref_get, fset=_aref_set)
+
+    def _flags_get(self):
+        return self.value & _constant.CR._all.value
+    def _flags_set(self, value):
+        self._set_field(value, _constant.CR._all.value)
+    flags = property(fget=_flags_get, fset=_flags_set)
@@ -24,3 +24,4 @@ cdef class Command (object):
     cdef public list _fields
 
     cdef _comedi_h.comedi_cmd *get_comedi_cmd_pointer(self) except *
+    cdef _resize_chanlist(self, unsigned int length)
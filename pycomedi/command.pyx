@@ -17,6 +17,8 @@
 "Wrap Comedi's `comedi_cmd` struct in the `Command` class"
 
 cimport libc.stdlib as _stdlib
+cimport libc.string as _string
+cimport numpy as _numpy
 import numpy as _numpy
 
 from pycomedi cimport _comedi_h
@@ -104,6 +106,19 @@ cdef class Command (object):
     >>> c.chanlist[0]
     <ChanSpec chan:0 range:0 aref:ground flags:->
 
+    For long channel lists, pack all the chanspecs at once with a
+    `ChanList`.  Its packed values are copied straight into the
+    command, and `packed_chanlist` reads them back without building a
+    `ChanSpec` for each entry.
+
+    >>> from .chanspec import ChanList
+    >>> c.chanlist = ChanList(chan=range(256), range=[0, 1]*128,
+    ...     aref=AREF.diff)
+    >>> c.packed_chanlist.range[:4]
+    array([0, 1, 0, 1], dtype=uint32)
+    >>> c.chanlist[3]
+    <ChanSpec chan:3 range:1 aref:diff flags:->
+
     You can also set chanspec items with `AnalogChannel` instances (or
     any object that has a `chanspec` method).
 
@@ -147,6 +162,43 @@ cdef class Command (object):
     cdef _comedi_h.comedi_cmd *get_comedi_cmd_pointer(self) except *:
         return &self._cmd
 
+    def copy(self):
+        """Return an independent copy of this command
+
+        The `chanlist` and `data` arrays are duplicated, so changes to
+        the copy do not affect the original.
+
+        >>> from .constant import TRIG_SRC
+        >>> c = Command()
+        >>> c.scan_begin_src = TRIG_SRC.timer
+        >>> c.chanlist = [1, 2]
+        >>> d = c.copy()
+        >>> d.chanlist = [3]
+        >>> print d.scan_begin_src
+        timer
+        >>> c.chanlist
+        [<ChanSpec chan:1 range:0 aref:ground flags:->, <ChanSpec chan:2 range:0 aref:ground flags:->]
+        """
+        cdef Command ret = Command()
+        ret._cmd = self._cmd
+        ret._cmd.chanlist = NULL
+        ret._cmd.chanlist_len = 0
+        ret._cmd.data = NULL
+        ret._cmd.data_len = 0
+        if self._cmd.chanlist is not NULL and self._cmd.chanlist_len:
+            ret._resize_chanlist(self._cmd.chanlist_len)
+            _string.memcpy(ret._cmd.chanlist, self._cmd.chanlist,
+                           self._cmd.chanlist_len*sizeof(unsigned int))
+        if self._cmd.data is not NULL and self._cmd.data_len:
+            ret._cmd.data = <_comedi_h.sampl_t *>_stdlib.malloc(
+                self._cmd.data_len*sizeof(_comedi_h.sampl_t))
+            if ret._cmd.data is NULL:
+                raise _PyComediError('out of memory?')
+            ret._cmd.data_len = self._cmd.data_len
+            _string.memcpy(ret._cmd.data, self._cmd.data,
+                           self._cmd.data_len*sizeof(_comedi_h.sampl_t))
+        return ret
+
     def __str__(self):
         max_field_length = max([len(f) for f in self._fields])
         lines = []
@@ -235,19 +287,42 @@ cdef class Command (object):
             ret.append(c)
         return ret
     def _chanlist_set(self, value):
+        if isinstance(value, _chanspec.ChanList):
+            value = value.value
+        if isinstance(value, _numpy.ndarray):
+            value = _numpy.ascontiguousarray(value, dtype=_numpy.uint32)
+            self._resize_chanlist(value.size)
+            _string.memcpy(self._cmd.chanlist, _numpy.PyArray_DATA(value),
+                           self._cmd.chanlist_len*sizeof(unsigned int))
+            return
+        self._resize_chanlist(len(value))
+        for i,x in enumerate(value):
+            if hasattr(x, 'chanspec'):
+                x = x.chanspec()
+            self._cmd.chanlist[i] = _constant.bitwise_value(x)
+    chanlist = property(fget=_chanlist_get, fset=_chanlist_set)
+
+    def _packed_chanlist_get(self):
+        value = _numpy.empty((self._cmd.chanlist_len,), dtype=_numpy.uint32)
+        _string.memcpy(_numpy.PyArray_DATA(value), self._cmd.chanlist,
+                       self._cmd.chanlist_len*sizeof(unsigned int))
+        return _chanspec.ChanList(value=value)
+    packed_chanlist = property(
+        fget=_packed_chanlist_get,
+        doc='Copy of `chanlist` as a `ChanList` (without per-entry objects)')
+
+    cdef _resize_chanlist(self, unsigned int length):
+        "Allocate space for `length` chanspecs, reusing the old list if possible"
+        if self._cmd.chanlist is not NULL and length == self._cmd.chanlist_len:
+            return
         if self._cmd.chanlist is not NULL:
             _stdlib.free(self._cmd.chanlist)
-        self._cmd.chanlist_len = len(value)
+        self._cmd.chanlist_len = length
         self._cmd.chanlist = <unsigned int *>_stdlib.malloc(
             self._cmd.chanlist_len*sizeof(unsigned int))
         if self._cmd.chanlist is NULL:
             self._cmd.chanlist_len = 0
             raise _PyComediError('out of memory?')
-        for i,x in enumerate(value):
-            if hasattr(x, 'chanspec'):
-                x = x.chanspec()
-            self._cmd.chanlist[i] = _constant.bitwise_value(x)
-    chanlist = property(fget=_chanlist_get, fset=_chanlist_set)
 
     def _data_get(self):
         data = _numpy.ndarray(shape=(self._cmd.data_len,), dtype=_numpy.uint16)
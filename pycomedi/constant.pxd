@@ -14,7 +14,15 @@
 # You should have received a copy of the GNU General Public License along with
 # pycomedi.  If not, see <http://www.gnu.org/licenses/>.
 
-"Expose `BitwiseOperator` internals at the C level for other Cython modules"
+"Expose `BitwiseOperator` and `FlagValue` internals at the C level"
 
 cdef class BitwiseOperator (object):
     cdef public object value
+
+
+cdef class FlagValue (object):
+    cdef public object flag
+    cdef public unsigned int _value
+    cdef public object _default
+
+    cpdef bint test(self, unsigned int mask)
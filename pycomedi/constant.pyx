@@ -23,8 +23,8 @@
  <_NamedInt pwm>]
 >>> SUBDEVICE_TYPE.dio
 <_NamedInt dio>
->>> SUBDEVICE_TYPE.dio.value == _comedi.COMEDI_SUBD_DIO
-True
+>>> SUBDEVICE_TYPE.dio.value
+5
 >>> SUBDEVICE_TYPE.dio.doc
 'COMEDI_SUBD_DIO (digital input/output)'
 
@@ -32,7 +32,7 @@ You can also search by name or value.
 
 >>> TRIG_SRC.index_by_name('timer')
 <_NamedInt timer>
->>> TRIG_SRC.index_by_value(_comedi.TRIG_NOW)
+>>> TRIG_SRC.index_by_value(2)
 <_NamedInt now>
 
 Some flags have constants for setting or clearing all the flags at once.
@@ -99,9 +99,19 @@ The ``UNIT`` constant treats ``RF_EXTERNAL`` as a full-fledged unit:
 
 >>> UNIT.index_by_name('external')
 <_NamedInt external>
->>> UNIT.index_by_value(_comedi.RF_EXTERNAL)
+>>> UNIT.index_by_value(256)
 <_NamedInt external>
 
+The tables are compiled in from ``comedi.h`` (via ``_comedi_h.pxd``),
+so importing this module does not need Comedilib's SWIG bindings.
+
+>>> SDF.running.value == 0x08000000
+True
+>>> CR._all
+<_NamedInt flags_mask>
+>>> CR._all.value
+4227858432
+
 .. [#ops] See `emulating numeric types`_ and `NotImplementedError` in
    `the standard type hierarchy`_.
 
@@ -115,8 +125,9 @@ from math import log as _log
 import sys as _sys
 
 import numpy as _numpy
-import comedi as _comedi
 
+from pycomedi cimport _comedi_h
+from pycomedi cimport _comedilib_h
 from . import LOG as _LOG
 
 
@@ -220,28 +231,22 @@ class _NamedInt (BitwiseOperator):
 
 
 class _Enum (list):
-    "An enumerated list"
-    def __init__(self, name, prefix='', blacklist=None, whitelist=None,
-                 translation=None):
+    """An enumerated list
+
+    `items` is a sequence of `(attr, value)` pairs, where `attr` is
+    the C name (starting with `prefix`) and `value` is the value
+    compiled in from the Comedi headers.
+    """
+    def __init__(self, name, prefix='', items=(), translation=None):
         super(_Enum, self).__init__()
         self.name = name
-        if blacklist == None:
-            blacklist = []
         if translation == None:
             translation = {}
         self._name_keys = {}
         self._value_keys = {}
-        mod = _comedi
-        if hasattr(mod, 'wrapped'):
-            mod = mod.wrapped
-            if prefix.startswith('COMEDI_'):
-                prefix = prefix[len('COMEDI_'):]
-        for attr in dir(mod):
-            if attr.startswith(prefix):
-                item_name = self._item_name(attr, prefix, translation)
-                if self._is_ignored(item_name, blacklist, whitelist):
-                    continue
-                self._add_item(attr, item_name)
+        for attr,value in items:
+            item_name = self._item_name(attr, prefix, translation)
+            self._add_item(attr, item_name, value)
         self.sort(key=lambda item: item.value)
 
     def _item_name(self, attr, prefix, translation):
@@ -251,18 +256,11 @@ class _Enum (list):
         else:
             return item_name.lower()
 
-    def _is_ignored(self, item_name, blacklist, whitelist):
-        return (item_name in blacklist
-                or whitelist != None and item_name not in whitelist)
-
-    def _add_item(self, attr, item_name):
-        item_value = getattr(_comedi, attr)
-        if not isinstance(item_value, int):
-            return  # item_name collided with another object, skip this non-int
+    def _add_item(self, attr, item_name, item_value):
         if item_value < 0:
             _LOG.debug('big value for {0:s}: {1:d} ({1:b}) converted to {2:d} ({2:b})'.format(
                     attr, item_value, (1<<32) + item_value))
-            item_value = (1<<32) + item_value  # flags are unsigned 32 bit integers, but SWIG signs them
+            item_value = (1<<32) + item_value  # flags are unsigned 32 bit integers, but Cython enums are signed
         item = _NamedInt(item_name, item_value, doc=attr)
         self.append(item)
 
@@ -287,6 +285,7 @@ class _Flag (_Enum):
     "A flag"
     def __init__(self, *args, **kwargs):
         super(_Flag, self).__init__(*args, **kwargs)
+        self._masks = dict((flag.name, flag.value) for flag in self)
         self._empty = None
         self._all = None
         for flag in self:
@@ -305,9 +304,9 @@ class _Flag (_Enum):
             self.remove(self._all)
 
     def get(self, value, name):
-        flag = getattr(self, name)
-        assert flag.value != 0, '%s: %s' % (self.name, flag)
-        return value & flag.value == flag.value
+        mask = self._masks[name]
+        assert mask != 0, '%s: %s' % (self.name, name)
+        return value & mask == mask
 
     def set(self, value, name, status):
         flag = getattr(self, name)
@@ -316,9 +315,13 @@ class _Flag (_Enum):
         return (value | flag.value) - flag.value
 
 
-class FlagValue (object):
+cdef class FlagValue (object):
     """A flag instance (flag + value)
 
+    The value is stored as a C integer, and flag names are looked up
+    in a table of masks precomputed by the `_Flag`, so testing a flag
+    does not create any intermediate Python objects.
+
     Examples
     --------
 
@@ -332,6 +335,17 @@ class FlagValue (object):
     >>> f.int = True
     >>> print f
     now|timer|int
+
+    Cython code can skip the name lookup entirely with `test`.
+
+    >>> f.test(TRIG_SRC.timer.value)
+    True
+    >>> f.test(TRIG_SRC.ext.value)
+    False
+    >>> f.nonexistent
+    Traceback (most recent call last):
+      ...
+    AttributeError: nonexistent
     """
     def __init__(self, flag, value, default='-'):
         self.flag = flag
@@ -339,61 +353,165 @@ class FlagValue (object):
         self._default = default
 
     def __str__(self):
-        flags = [f for f in self.flag if getattr(self, f.name)]
+        flags = [f for f in self.flag if self.test(f.value)]
         if len(flags) == 0:
             return self._default
         return '|'.join([f.name for f in flags])
 
     def __getattr__(self, name):
-        return self.flag.get(self._value, name)
+        try:
+            mask = self.flag._masks[name]
+        except KeyError:
+            raise AttributeError(name)
+        assert mask != 0, '%s: %s' % (self.flag.name, name)
+        return self.test(mask)
 
     def __setattr__(self, name, value):
-        if name != 'flag' and not name.startswith('_'):
-            value = self.flag.set(self._value, name, value)
-            name = '_value'
-        super(FlagValue, self).__setattr__(name, value)
+        if name == 'flag':
+            self.flag = value
+        elif name == '_value':
+            self._value = value
+        elif name == '_default':
+            self._default = value
+        else:
+            self._value = self.flag.set(self._value, name, value)
+
+    def __reduce__(self):
+        return (FlagValue, (self.flag, self._value, self._default))
 
+    cpdef bint test(self, unsigned int mask):
+        "True if all the bits in `mask` are set"
+        return self._value & mask == mask
 
-# blacklist deprecated values (and those belonging to other _Enums or _Flags)
 
-CR = _Flag('ChanSpec flags', 'CR_', blacklist=['dither', 'deglitch'])
+# Deprecated values (e.g. CR_DITHER, SDF_CMD, and the SDF_MODE* flags)
+# and aliases (e.g. SDF_WRITEABLE) are left out of the item lists.
+
+CR = _Flag('ChanSpec flags', 'CR_', items=(
+        ('CR_FLAGS_MASK', _comedi_h.CR_FLAGS_MASK),
+        ('CR_ALT_FILTER', _comedi_h.CR_ALT_FILTER),
+        ('CR_ALT_SOURCE', _comedi_h.CR_ALT_SOURCE),
+        ('CR_EDGE', _comedi_h.CR_EDGE),
+        ('CR_INVERT', _comedi_h.CR_INVERT),
+        ))
 CR.alt_filter.doc += ' (can also mean "dither" or "deglitch")'
 
-AREF = _Enum('analog_reference', 'AREF_')
+AREF = _Enum('analog_reference', 'AREF_', items=(
+        ('AREF_GROUND', _comedi_h.AREF_GROUND),
+        ('AREF_COMMON', _comedi_h.AREF_COMMON),
+        ('AREF_DIFF', _comedi_h.AREF_DIFF),
+        ('AREF_OTHER', _comedi_h.AREF_OTHER),
+        ))
 AREF.diff.doc += ' (differential)'
 AREF.other.doc += ' (other / undefined)'
 
 #GPCT = _Flag('general_purpose_counter_timer', 'GPCT_')
 # Two competing flag sets?  Need some documentation.
 
-INSN_MASK = _Flag('instruction_mask', 'INSN_MASK_')
-
-CONFIGURATION_IDS = _Enum('configuration_ids', 'INSN_CONFIG_', blacklist=[
-        '8254_set_mode'])
-
-INSN = _Enum('instruction', 'INSN_',
-             blacklist=['mask_%s' % i.name for i in INSN_MASK] + [
-        'config_%s' % i.name for i in CONFIGURATION_IDS])
-
-TRIG = _Flag('trigger_flags', 'TRIG_', whitelist=[
-        'bogus', 'dither', 'deglitch', 'config', 'wake_eos'])
+INSN_MASK = _Flag('instruction_mask', 'INSN_MASK_', items=(
+        ('INSN_MASK_WRITE', _comedi_h.INSN_MASK_WRITE),
+        ('INSN_MASK_READ', _comedi_h.INSN_MASK_READ),
+        ('INSN_MASK_SPECIAL', _comedi_h.INSN_MASK_SPECIAL),
+        ))
+
+CONFIGURATION_IDS = _Enum('configuration_ids', 'INSN_CONFIG_', items=(
+        ('INSN_CONFIG_DIO_INPUT', _comedi_h.INSN_CONFIG_DIO_INPUT),
+        ('INSN_CONFIG_DIO_OUTPUT', _comedi_h.INSN_CONFIG_DIO_OUTPUT),
+        ('INSN_CONFIG_DIO_OPENDRAIN', _comedi_h.INSN_CONFIG_DIO_OPENDRAIN),
+        ('INSN_CONFIG_ANALOG_TRIG', _comedi_h.INSN_CONFIG_ANALOG_TRIG),
+        ('INSN_CONFIG_ALT_SOURCE', _comedi_h.INSN_CONFIG_ALT_SOURCE),
+        ('INSN_CONFIG_DIGITAL_TRIG', _comedi_h.INSN_CONFIG_DIGITAL_TRIG),
+        ('INSN_CONFIG_BLOCK_SIZE', _comedi_h.INSN_CONFIG_BLOCK_SIZE),
+        ('INSN_CONFIG_TIMER_1', _comedi_h.INSN_CONFIG_TIMER_1),
+        ('INSN_CONFIG_FILTER', _comedi_h.INSN_CONFIG_FILTER),
+        ('INSN_CONFIG_CHANGE_NOTIFY', _comedi_h.INSN_CONFIG_CHANGE_NOTIFY),
+        ('INSN_CONFIG_SERIAL_CLOCK', _comedi_h.INSN_CONFIG_SERIAL_CLOCK),
+        ('INSN_CONFIG_BIDIRECTIONAL_DATA', _comedi_h.INSN_CONFIG_BIDIRECTIONAL_DATA),
+        ('INSN_CONFIG_DIO_QUERY', _comedi_h.INSN_CONFIG_DIO_QUERY),
+        ('INSN_CONFIG_PWM_OUTPUT', _comedi_h.INSN_CONFIG_PWM_OUTPUT),
+        ('INSN_CONFIG_GET_PWM_OUTPUT', _comedi_h.INSN_CONFIG_GET_PWM_OUTPUT),
+        ('INSN_CONFIG_ARM', _comedi_h.INSN_CONFIG_ARM),
+        ('INSN_CONFIG_DISARM', _comedi_h.INSN_CONFIG_DISARM),
+        ('INSN_CONFIG_GET_COUNTER_STATUS', _comedi_h.INSN_CONFIG_GET_COUNTER_STATUS),
+        ('INSN_CONFIG_RESET', _comedi_h.INSN_CONFIG_RESET),
+        ('INSN_CONFIG_GPCT_SINGLE_PULSE_GENERATOR', _comedi_h.INSN_CONFIG_GPCT_SINGLE_PULSE_GENERATOR),
+        ('INSN_CONFIG_GPCT_PULSE_TRAIN_GENERATOR', _comedi_h.INSN_CONFIG_GPCT_PULSE_TRAIN_GENERATOR),
+        ('INSN_CONFIG_GPCT_QUADRATURE_ENCODER', _comedi_h.INSN_CONFIG_GPCT_QUADRATURE_ENCODER),
+        ('INSN_CONFIG_SET_GATE_SRC', _comedi_h.INSN_CONFIG_SET_GATE_SRC),
+        ('INSN_CONFIG_GET_GATE_SRC', _comedi_h.INSN_CONFIG_GET_GATE_SRC),
+        ('INSN_CONFIG_SET_CLOCK_SRC', _comedi_h.INSN_CONFIG_SET_CLOCK_SRC),
+        ('INSN_CONFIG_GET_CLOCK_SRC', _comedi_h.INSN_CONFIG_GET_CLOCK_SRC),
+        ('INSN_CONFIG_SET_OTHER_SRC', _comedi_h.INSN_CONFIG_SET_OTHER_SRC),
+        ('INSN_CONFIG_GET_HARDWARE_BUFFER_SIZE', _comedi_h.INSN_CONFIG_GET_HARDWARE_BUFFER_SIZE),
+        ('INSN_CONFIG_SET_COUNTER_MODE', _comedi_h.INSN_CONFIG_SET_COUNTER_MODE),
+        ('INSN_CONFIG_8254_READ_STATUS', _comedi_h.INSN_CONFIG_8254_READ_STATUS),
+        ('INSN_CONFIG_SET_ROUTING', _comedi_h.INSN_CONFIG_SET_ROUTING),
+        ('INSN_CONFIG_GET_ROUTING', _comedi_h.INSN_CONFIG_GET_ROUTING),
+        ('INSN_CONFIG_PWM_SET_PERIOD', _comedi_h.INSN_CONFIG_PWM_SET_PERIOD),
+        ('INSN_CONFIG_PWM_GET_PERIOD', _comedi_h.INSN_CONFIG_PWM_GET_PERIOD),
+        ('INSN_CONFIG_GET_PWM_STATUS', _comedi_h.INSN_CONFIG_GET_PWM_STATUS),
+        ('INSN_CONFIG_PWM_SET_H_BRIDGE', _comedi_h.INSN_CONFIG_PWM_SET_H_BRIDGE),
+        ('INSN_CONFIG_PWM_GET_H_BRIDGE', _comedi_h.INSN_CONFIG_PWM_GET_H_BRIDGE),
+        ))
+
+INSN = _Enum('instruction', 'INSN_', items=(
+        ('INSN_READ', _comedi_h.INSN_READ),
+        ('INSN_WRITE', _comedi_h.INSN_WRITE),
+        ('INSN_BITS', _comedi_h.INSN_BITS),
+        ('INSN_CONFIG', _comedi_h.INSN_CONFIG),
+        ('INSN_GTOD', _comedi_h.INSN_GTOD),
+        ('INSN_WAIT', _comedi_h.INSN_WAIT),
+        ('INSN_INTTRIG', _comedi_h.INSN_INTTRIG),
+        ))
+
+TRIG = _Flag('trigger_flags', 'TRIG_', items=(
+        ('TRIG_BOGUS', _comedi_h.TRIG_BOGUS),
+        ('TRIG_DITHER', _comedi_h.TRIG_DITHER),
+        ('TRIG_DEGLITCH', _comedi_h.TRIG_DEGLITCH),
+        ('TRIG_CONFIG', _comedi_h.TRIG_CONFIG),
+        ('TRIG_WAKE_EOS', _comedi_h.TRIG_WAKE_EOS),
+        ))
 TRIG.bogus.doc += ' (do the motions)'
 TRIG.config.doc += ' (perform configuration, not triggering)'
 TRIG.wake_eos.doc += ' (wake up on end-of-scan events)'
 
-CMDF = _Flag('command_flags', 'CMDF_')
+CMDF = _Flag('command_flags', 'CMDF_', items=(
+        ('CMDF_PRIORITY', _comedi_h.CMDF_PRIORITY),
+        ('CMDF_WRITE', _comedi_h.CMDF_WRITE),
+        ('CMDF_RAWDATA', _comedi_h.CMDF_RAWDATA),
+        ))
 CMDF.priority.doc += (
     ' (try to use a real-time interrupt while performing command)')
 
-EV = _Flag('??', 'COMEDI_EV_')
-
-TRIG_ROUND = _Enum('trigger_round', 'TRIG_ROUND_', blacklist=['mask'])
-TRIG_ROUND.mask = _comedi.TRIG_ROUND_MASK
-
-TRIG_SRC = _Flag('trigger_source_flags', 'TRIG_',
-                 blacklist=[i.name for i in TRIG] + [
-            'round_%s' % i.name for i in TRIG_ROUND] + [
-        'round_mask', 'rt', 'write'])
+EV = _Flag('??', 'COMEDI_EV_', items=(
+        ('COMEDI_EV_START', _comedi_h.COMEDI_EV_START),
+        ('COMEDI_EV_SCAN_BEGIN', _comedi_h.COMEDI_EV_SCAN_BEGIN),
+        ('COMEDI_EV_CONVERT', _comedi_h.COMEDI_EV_CONVERT),
+        ('COMEDI_EV_SCAN_END', _comedi_h.COMEDI_EV_SCAN_END),
+        ('COMEDI_EV_STOP', _comedi_h.COMEDI_EV_STOP),
+        ))
+
+TRIG_ROUND = _Enum('trigger_round', 'TRIG_ROUND_', items=(
+        ('TRIG_ROUND_NEAREST', _comedi_h.TRIG_ROUND_NEAREST),
+        ('TRIG_ROUND_DOWN', _comedi_h.TRIG_ROUND_DOWN),
+        ('TRIG_ROUND_UP', _comedi_h.TRIG_ROUND_UP),
+        ('TRIG_ROUND_UP_NEXT', _comedi_h.TRIG_ROUND_UP_NEXT),
+        ))
+TRIG_ROUND.mask = _comedi_h.TRIG_ROUND_MASK
+
+TRIG_SRC = _Flag('trigger_source_flags', 'TRIG_', items=(
+        ('TRIG_ANY', _comedi_h.TRIG_ANY),
+        ('TRIG_INVALID', _comedi_h.TRIG_INVALID),
+        ('TRIG_NONE', _comedi_h.TRIG_NONE),
+        ('TRIG_NOW', _comedi_h.TRIG_NOW),
+        ('TRIG_FOLLOW', _comedi_h.TRIG_FOLLOW),
+        ('TRIG_TIME', _comedi_h.TRIG_TIME),
+        ('TRIG_TIMER', _comedi_h.TRIG_TIMER),
+        ('TRIG_COUNT', _comedi_h.TRIG_COUNT),
+        ('TRIG_EXT', _comedi_h.TRIG_EXT),
+        ('TRIG_INT', _comedi_h.TRIG_INT),
+        ('TRIG_OTHER', _comedi_h.TRIG_OTHER),
+        ))
 TRIG_SRC.none.doc += ' (never trigger)'
 TRIG_SRC.now.doc += ' (trigger now + N ns)'
 TRIG_SRC.follow.doc += ' (trigger on next lower level trig)'
@@ -404,13 +522,38 @@ TRIG_SRC.ext.doc += ' (trigger on external signal N)'
 TRIG_SRC.int.doc += ' (trigger on comedi-internal signal N)'
 TRIG_SRC.other.doc += ' (driver defined)'
 
-SDF_PWM = _Flag('pulse_width_modulation_subdevice_flags', 'SDF_PWM_')
+SDF_PWM = _Flag('pulse_width_modulation_subdevice_flags', 'SDF_PWM_', items=(
+        ('SDF_PWM_COUNTER', _comedi_h.SDF_PWM_COUNTER),
+        ('SDF_PWM_HBRIDGE', _comedi_h.SDF_PWM_HBRIDGE),
+        ))
 SDF_PWM.counter.doc += ' (PWM can automatically switch off)'
 SDF_PWM.hbridge.doc += ' (PWM is signed (H-bridge))'
 
-SDF = _Flag('subdevice_flags', 'SDF_', blacklist=[
-        'pwm_%s' % i.name for i in SDF_PWM] + [
-        'cmd', 'writeable', 'rt'])
+SDF = _Flag('subdevice_flags', 'SDF_', items=(
+        ('SDF_BUSY', _comedi_h.SDF_BUSY),
+        ('SDF_BUSY_OWNER', _comedi_h.SDF_BUSY_OWNER),
+        ('SDF_LOCKED', _comedi_h.SDF_LOCKED),
+        ('SDF_LOCK_OWNER', _comedi_h.SDF_LOCK_OWNER),
+        ('SDF_MAXDATA', _comedi_h.SDF_MAXDATA),
+        ('SDF_FLAGS', _comedi_h.SDF_FLAGS),
+        ('SDF_RANGETYPE', _comedi_h.SDF_RANGETYPE),
+        ('SDF_SOFT_CALIBRATED', _comedi_h.SDF_SOFT_CALIBRATED),
+        ('SDF_CMD_WRITE', _comedi_h.SDF_CMD_WRITE),
+        ('SDF_CMD_READ', _comedi_h.SDF_CMD_READ),
+        ('SDF_READABLE', _comedi_h.SDF_READABLE),
+        ('SDF_WRITABLE', _comedi_h.SDF_WRITABLE),
+        ('SDF_INTERNAL', _comedi_h.SDF_INTERNAL),
+        ('SDF_GROUND', _comedi_h.SDF_GROUND),
+        ('SDF_COMMON', _comedi_h.SDF_COMMON),
+        ('SDF_DIFF', _comedi_h.SDF_DIFF),
+        ('SDF_OTHER', _comedi_h.SDF_OTHER),
+        ('SDF_DITHER', _comedi_h.SDF_DITHER),
+        ('SDF_DEGLITCH', _comedi_h.SDF_DEGLITCH),
+        ('SDF_MMAP', _comedi_h.SDF_MMAP),
+        ('SDF_RUNNING', _comedi_h.SDF_RUNNING),
+        ('SDF_LSAMPL', _comedi_h.SDF_LSAMPL),
+        ('SDF_PACKED', _comedi_h.SDF_PACKED),
+        ))
 SDF.busy.doc += ' (device is busy)'
 SDF.busy_owner.doc += ' (device is busy with your job)'
 SDF.locked.doc += ' (subdevice is locked)'
@@ -435,7 +578,21 @@ SDF.running.doc += ' (subdevice is acquiring data)'
 SDF.lsampl.doc += ' (subdevice uses 32-bit samples)'
 SDF.packed.doc += ' (subdevice can do packed DIO)'
 
-SUBDEVICE_TYPE = _Enum('subdevice_type', 'COMEDI_SUBD_')
+SUBDEVICE_TYPE = _Enum('subdevice_type', 'COMEDI_SUBD_', items=(
+        ('COMEDI_SUBD_UNUSED', _comedi_h.COMEDI_SUBD_UNUSED),
+        ('COMEDI_SUBD_AI', _comedi_h.COMEDI_SUBD_AI),
+        ('COMEDI_SUBD_AO', _comedi_h.COMEDI_SUBD_AO),
+        ('COMEDI_SUBD_DI', _comedi_h.COMEDI_SUBD_DI),
+        ('COMEDI_SUBD_DO', _comedi_h.COMEDI_SUBD_DO),
+        ('COMEDI_SUBD_DIO', _comedi_h.COMEDI_SUBD_DIO),
+        ('COMEDI_SUBD_COUNTER', _comedi_h.COMEDI_SUBD_COUNTER),
+        ('COMEDI_SUBD_TIMER', _comedi_h.COMEDI_SUBD_TIMER),
+        ('COMEDI_SUBD_MEMORY', _comedi_h.COMEDI_SUBD_MEMORY),
+        ('COMEDI_SUBD_CALIB', _comedi_h.COMEDI_SUBD_CALIB),
+        ('COMEDI_SUBD_PROC', _comedi_h.COMEDI_SUBD_PROC),
+        ('COMEDI_SUBD_SERIAL', _comedi_h.COMEDI_SUBD_SERIAL),
+        ('COMEDI_SUBD_PWM', _comedi_h.COMEDI_SUBD_PWM),
+        ))
 SUBDEVICE_TYPE.unused.doc += ' (unused by driver)'
 SUBDEVICE_TYPE.ai.doc += ' (analog input)'
 SUBDEVICE_TYPE.ao.doc += ' (analog output)'
@@ -448,33 +605,50 @@ SUBDEVICE_TYPE.proc.doc += ' (processor, DSP)'
 SUBDEVICE_TYPE.serial.doc += ' (serial IO)'
 SUBDEVICE_TYPE.pwm.doc += ' (pulse-with modulation)'
 
-IO_DIRECTION = _Enum('io_direction', 'COMEDI_', whitelist=[
-        'input', 'output', 'opendrain'])
-
-SUPPORT_LEVEL = _Enum('support_level', 'COMEDI_', whitelist=[
-        'unknown_support', 'supported', 'unsupported'])
-
-UNIT = _Enum('unit', 'UNIT_', translation={'mA':'mA'})
+IO_DIRECTION = _Enum('io_direction', 'COMEDI_', items=(
+        ('COMEDI_INPUT', _comedi_h.COMEDI_INPUT),
+        ('COMEDI_OUTPUT', _comedi_h.COMEDI_OUTPUT),
+        ('COMEDI_OPENDRAIN', _comedi_h.COMEDI_OPENDRAIN),
+        ))
+
+SUPPORT_LEVEL = _Enum('support_level', 'COMEDI_', items=(
+        ('COMEDI_UNKNOWN_SUPPORT', _comedi_h.COMEDI_UNKNOWN_SUPPORT),
+        ('COMEDI_SUPPORTED', _comedi_h.COMEDI_SUPPORTED),
+        ('COMEDI_UNSUPPORTED', _comedi_h.COMEDI_UNSUPPORTED),
+        ))
+
+UNIT = _Enum('unit', 'UNIT_', translation={'mA':'mA'}, items=(
+        ('UNIT_volt', _comedi_h.UNIT_volt),
+        ('UNIT_mA', _comedi_h.UNIT_mA),
+        ('UNIT_none', _comedi_h.UNIT_none),
+        ))
 # The mA translation avoids lowercasing to 'ma'.
 UNIT.append(_NamedInt(
         name='external',
-        value=_comedi.RF_EXTERNAL,
+        value=_comedi_h.RF_EXTERNAL,
         doc=('RF_EXTERNAL (value unit is defined by an external reference '
              'channel)')))
 
-CALLBACK = _Enum('callback_flags', 'COMEDI_CB_', blacklist=['block', 'eobuf'])
+CALLBACK = _Enum('callback_flags', 'COMEDI_CB_', items=(
+        ('COMEDI_CB_EOS', _comedi_h.COMEDI_CB_EOS),
+        ('COMEDI_CB_EOA', _comedi_h.COMEDI_CB_EOA),
+        ('COMEDI_CB_ERROR', _comedi_h.COMEDI_CB_ERROR),
+        ('COMEDI_CB_OVERFLOW', _comedi_h.COMEDI_CB_OVERFLOW),
+        ))
 CALLBACK.eos.doc += ' (end of scan)'
 CALLBACK.eoa.doc += ' (end of acquisition)'
 CALLBACK.error.doc += ' (card error during acquisition)'
 CALLBACK.overflow.doc += ' (buffer overflow/underflow)'
 
-CONVERSION_DIRECTION = _Enum('conversion_direction', 'COMEDI_', whitelist=[
-        'to_physical', 'from_physical'])
+CONVERSION_DIRECTION = _Enum('conversion_direction', 'COMEDI_', items=(
+        ('COMEDI_TO_PHYSICAL', _comedilib_h.COMEDI_TO_PHYSICAL),
+        ('COMEDI_FROM_PHYSICAL', _comedilib_h.COMEDI_FROM_PHYSICAL),
+        ))
 
 # The following constants aren't declared in comedi.h or comedilib.h,
 # but they should be.
 
-LOGLEVEL = _Enum('log level', '', whitelist=[''])
+LOGLEVEL = _Enum('log level')
 LOGLEVEL.append(_NamedInt('silent', 0, doc='Comedilib prints nothing.'))
 LOGLEVEL.append(_NamedInt('bug', 1, doc=(
             'Comedilib prints error messages when there is a self-consistency '
@@ -24,6 +24,7 @@ from pycomedi cimport instruction as _instruction
 cdef class Device (_DeviceHolder):
     cdef public object file
     cdef public object filename
+    cdef dict _calibrations
 
     cpdef do_insnlist(self, insnlist)
     cpdef do_insn(self, _instruction.Insn insn)
@@ -34,6 +34,15 @@ from . import instruction as _instruction
 from . import subdevice as _subdevice
 
 
+def _file_stamp(path):
+    "`(mtime, size)` for `path`, or `None` if it cannot be stat-ed"
+    try:
+        st = _os.stat(path)
+    except (OSError, TypeError):
+        return None
+    return (st.st_mtime, st.st_size)
+
+
 cdef class Device (_DeviceHolder):
     """A Comedi device
 
@@ -95,18 +104,42 @@ cdef class Device (_DeviceHolder):
     >>> d.get_default_calibration_path()
     '/var/lib/comedi/calibrations/ni_pcimio_pci-6052e_comedi0'
 
+    Parsed calibrations are cached until the file changes.
+
+    >>> d.parse_calibration() is d.parse_calibration()
+    True
+
     >>> list(d.subdevices())  # doctest: +ELLIPSIS
     [<pycomedi.subdevice.Subdevice object at 0x...>,...]
 
     >>> d.close()
+
+    Set `cache` to memoize metadata that does not change while the
+    device is open (channel counts, maxdata, ranges, default
+    calibration converters, ...).  The cache is cleared when the
+    device is closed.
+
+    >>> d = Device('/dev/comedi0', cache=True)
+    >>> d.open()
+    >>> s = d.get_read_subdevice()
+    >>> s.get_n_channels()
+    16
+    >>> sorted(d.cache.keys())
+    [('n_channels', 0)]
+    >>> d.close()
+    >>> d.cache
+    {}
     """
     def __cinit__(self):
         self.file = None
         self.filename = None
+        self._calibrations = {}
 
-    def __init__(self, filename):
+    def __init__(self, filename, cache=False):
         super(Device, self).__init__()
         self.filename = filename
+        if cache:
+            self.cache = {}
 
     def open(self):
         "Open device"
@@ -125,6 +158,8 @@ cdef class Device (_DeviceHolder):
             _error.raise_error(function_name='comedi_close', ret=ret)
         self.device = NULL
         self.file = None
+        self.clear_cache()
+        self._calibrations.clear()
 
     def fileno(self):
         "File descriptor for this device"
@@ -230,6 +265,7 @@ cdef class Device (_DeviceHolder):
         """
         cdef _comedi_h.comedi_insnlist il
         cdef _instruction.Insn i
+        cdef int ret, errno = 0
         il.n_insns = len(insnlist)
         if il.n_insns == 0:
             return
@@ -244,11 +280,15 @@ cdef class Device (_DeviceHolder):
                 # copied instruction will also affect the original
                 # instruction's data.
                 il.insns[j] = i.get_comedi_insn()
-            ret = _comedilib_h.comedi_do_insnlist(self.device, &il)
+            with nogil:
+                ret = _comedilib_h.comedi_do_insnlist(self.device, &il)
+                if ret < <int>il.n_insns:
+                    errno = _comedilib_h.comedi_errno()
         finally:
             _stdlib.free(il.insns)
         if ret < len(insnlist):
-            _error.raise_error(function_name='comedi_do_insnlist', ret=ret)
+            _error.raise_error(
+                function_name='comedi_do_insnlist', ret=ret, errno=errno)
         return ret
 
     cpdef do_insn(self, _instruction.Insn insn):
@@ -257,14 +297,18 @@ cdef class Device (_DeviceHolder):
         Returns an instruction-specific integer.
         """
         cdef _comedi_h.comedi_insn i
+        cdef int ret, errno = 0
         # By copying the pointer to data, changes to this
         # copied instruction will also affect the original
         # instruction's data.
         i = insn.get_comedi_insn()
-        ret = _comedilib_h.comedi_do_insn(
-            self.device, &i)
+        with nogil:
+            ret = _comedilib_h.comedi_do_insn(self.device, &i)
+            if ret < 0:
+                errno = _comedilib_h.comedi_errno()
         if ret < 0:
-            _error.raise_error(function_name='comedi_do_insn', ret=ret)
+            _error.raise_error(
+                function_name='comedi_do_insn', ret=ret, errno=errno)
         return ret
 
     def get_default_calibration_path(self):
@@ -281,11 +325,47 @@ cdef class Device (_DeviceHolder):
         """The soft calibration from a file for this device.
 
         If path is None, the default calibration file is used.
+
+        Parsed calibrations are cached by path.  While the file's
+        modification time and size are unchanged, later calls return
+        the same `Calibration` instance, so channels sharing a
+        calibration file only parse it once.  Changes to the returned
+        calibration are seen by every caller; use
+        `Calibration.from_file()` if you need a private copy.
         """
         if path is None:
             path = self.get_default_calibration_path()
+        stamp = _file_stamp(path)
+        if stamp is not None:
+            try:
+                cached_stamp,c = self._calibrations[path]
+            except KeyError:
+                pass
+            else:
+                if cached_stamp == stamp:
+                    return c
         c = _calibration.Calibration(device=self)
         c.from_file(path)
+        if stamp is not None:
+            self._calibrations[path] = (stamp, c)
+        return c
+
+    def load_calibration(self, data, path=None):
+        """Load a calibration serialized with `Calibration.dumps()`
+
+        This skips parsing the calibration file, so worker processes
+        can share a calibration parsed once by their parent.  If
+        `path` is given, the loaded calibration is cached as if it had
+        been parsed from `path`, so later `parse_calibration(path)`
+        calls (e.g. from `AnalogChannel.get_converter()` with the
+        default calibration path) reuse it until the file changes.
+        """
+        c = _calibration.Calibration(device=self)
+        c.loads(data)
+        if path is not None:
+            stamp = _file_stamp(path)
+            if stamp is not None:
+                self._calibrations[path] = (stamp, c)
         return c
 
     # extensions to make a more idomatic Python interface
@@ -5,3 +5,4 @@ from pycomedi cimport _comedilib_h
 
 cdef class DeviceHolder (object):
     cdef _comedilib_h.comedi_t * device
+    cdef public dict cache
@@ -2,6 +2,57 @@
 
 
 cdef class DeviceHolder (object):
-    "Minimal comedi_t * wrapper to avoid circular imports"
+    """Minimal comedi_t * wrapper to avoid circular imports
+
+    Also holds the optional metadata `cache`, so subdevices and
+    channels can reach it without importing `Device`.  The cache is
+    disabled while `cache` is `None`.
+
+    >>> d = DeviceHolder()
+    >>> calls = []
+    >>> def f(x):
+    ...     calls.append(x)
+    ...     return 2*x
+    >>> d._cached(('double', 3), f, 3)
+    6
+    >>> d.cache = {}
+    >>> d._cached(('double', 3), f, 3)
+    6
+    >>> d._cached(('double', 3), f, 3)
+    6
+    >>> calls
+    [3, 3]
+    >>> d.clear_cache(kind='triple')
+    >>> d.cache
+    {('double', 3): 6}
+    >>> d.clear_cache()
+    >>> d.cache
+    {}
+    """
     def __cinit__(self):
         self.device = NULL
+        self.cache = None
+
+    def _cached(self, key, function, *args):
+        "Return `function(*args)`, memoized under `key` if caching"
+        if self.cache is None:
+            return function(*args)
+        try:
+            return self.cache[key]
+        except KeyError:
+            ret = self.cache[key] = function(*args)
+            return ret
+
+    def clear_cache(self, kind=None):
+        """Drop cached values
+
+        If `kind` is given, only drop entries whose key starts with
+        `kind` (e.g. `'converter'`).
+        """
+        if self.cache is None:
+            return
+        if kind is None:
+            self.cache.clear()
+        else:
+            for key in [k for k in self.cache if k[0] == kind]:
+                del self.cache[key]
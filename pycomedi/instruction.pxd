@@ -17,10 +17,21 @@
 "Expose `Insn` internals at the C level for other Cython modules"
 
 from pycomedi cimport _comedi_h
+from pycomedi cimport subdevice_holder as _subdevice_holder
 
 
 cdef class Insn (object):
     cdef _comedi_h.comedi_insn _insn
+    cdef object _buffer
     cdef public list _fields
 
+    cdef _allocate(self, capacity)
     cdef _comedi_h.comedi_insn get_comedi_insn(self)
+
+
+cdef class InsnScan (object):
+    cdef _comedi_h.comedi_insnlist _insnlist
+    cdef _comedi_h.lsampl_t _nano_sec
+    cdef _subdevice_holder.SubdeviceHolder _subdevice
+    cdef public list channels
+    cdef readonly object data
@@ -17,11 +17,14 @@
 "Wrap Comedi's `comedi_insn` struct in the `Insn` class"
 
 cimport libc.stdlib as _stdlib
+cimport numpy as _numpy
 import numpy as _numpy
 
 from pycomedi cimport _comedi_h
 from pycomedi cimport _comedilib_h
+from pycomedi cimport subdevice_holder as _subdevice_holder
 from . import PyComediError as _PyComediError
+from . import _error
 from . import chanspec as _chanspec
 from . import constant as _constant
 
@@ -73,15 +76,48 @@ cdef class Insn (object):
         data: [1 2 3]
       subdev: 3
     chanspec: <ChanSpec chan:0 range:0 aref:diff flags:->
+
+    The instruction's data lives in a buffer owned by the `Insn`, and
+    `data` is a writable view into that buffer, so you can change the
+    data in place, and see the results of a read without any copying.
+
+    >>> d = i.data
+    >>> d[0] = 10
+    >>> i.data
+    array([10,  2,  3], dtype=uint32)
+
+    Setting `data` reuses the existing buffer as long as the new data
+    fits within its `capacity`.  Preallocate a larger buffer by passing
+    `capacity` when you create the instruction.  If the buffer has to
+    grow, previously returned views no longer track the instruction.
+
+    >>> i.capacity
+    3
+    >>> i.data = [4, 5]
+    >>> d
+    array([4, 5, 3], dtype=uint32)
+    >>> i = Insn(capacity=1000)
+    >>> i.data = _numpy.zeros(500)
+    >>> (len(i.data), i.capacity)
+    (500, 1000)
     """
     def __cinit__(self):
         self._insn.insn = _constant.INSN.read.value
         self._insn.data = NULL
+        self._insn.n = 0
+        self._buffer = None
         self._fields = ['insn', 'data', 'subdev', 'chanspec']
 
-    def __dealloc__(self):
-        if self._insn.data is not NULL:
-            _stdlib.free(self._insn.data)
+    def __init__(self, capacity=0):
+        super(Insn, self).__init__()
+        self._allocate(capacity)
+
+    cdef _allocate(self, capacity):
+        "Replace the data buffer with a new one holding `capacity` samples"
+        self._buffer = _numpy.zeros((capacity,), dtype=_numpy.uint32)
+        self._insn.data = <_comedi_h.lsampl_t *>_numpy.PyArray_DATA(
+            self._buffer)
+        self._insn.n = 0
 
     cdef _comedi_h.comedi_insn get_comedi_insn(self):
         return self._insn
@@ -100,24 +136,19 @@ cdef class Insn (object):
     insn = property(fget=_insn_get, fset=_insn_set)
 
     def _data_get(self):
-        data = _numpy.ndarray(shape=(self._insn.n,), dtype=_numpy.uint)
-        # TODO: point into existing data array?
-        for i in range(self._insn.n):
-            data[i] = self._insn.data[i]
-        return data
+        return self._buffer[:self._insn.n]
     def _data_set(self, value):
-        if self._insn.data is not NULL:
-            _stdlib.free(self._insn.data)
-        self._insn.n = len(value)
-        self._insn.data = <_comedi_h.lsampl_t *>_stdlib.malloc(
-            self._insn.n*sizeof(_comedi_h.lsampl_t))
-        if self._insn.data is NULL:
-            self._insn.n = 0
-            raise _PyComediError('out of memory?')
-        for i,x in enumerate(value):
-            self._insn.data[i] = x
+        n = len(value)
+        if n > len(self._buffer):
+            self._allocate(n)
+        self._buffer[:n] = value
+        self._insn.n = n
     data = property(fget=_data_get, fset=_data_set)
 
+    def _capacity_get(self):
+        return len(self._buffer)
+    capacity = property(fget=_capacity_get)
+
     def _subdev_get(self):
         return int(self._insn.subdev)
     def _subdev_set(self, value):
@@ -131,3 +162,129 @@ cdef class Insn (object):
     def _chanspec_set(self, value):
         self._insn.chanspec = _constant.bitwise_value(value)
     chanspec = property(fget=_chanspec_get, fset=_chanspec_set)
+
+
+cdef class InsnScan (object):
+    """Precompiled software-timed read of several channels
+
+    Reading channels one at a time with `AnalogChannel.data_read()` or
+    `.data_read_delayed()` costs a system call (and a Python round
+    trip) per channel.  `InsnScan` builds a `comedi_insnlist` for
+    `channels` once, and each `.read()` runs the whole list with a
+    single `comedi_do_insnlist()` call, storing one sample per channel
+    in the preallocated `data` array.
+
+    `channels` may mix `AnalogChannel` and `DigitalChannel` instances,
+    but they must all belong to the same device.  If `nano_sec` is
+    nonzero, each analog read waits for the input to settle, as in
+    `AnalogChannel.data_read_delayed()`.
+
+    >>> from .device import Device
+    >>> from .channel import AnalogChannel
+    >>> from . import constant
+
+    >>> d = Device('/dev/comedi0')
+    >>> d.open()
+    >>> s = d.find_subdevice_by_type(constant.SUBDEVICE_TYPE.ai)
+    >>> channels = [s.channel(i, factory=AnalogChannel) for i in (0, 1, 2)]
+    >>> scan = InsnScan(channels, nano_sec=1e3)
+    >>> len(scan)
+    3
+    >>> scan.read()  # doctest: +SKIP
+    array([32670, 32674, 32672], dtype=uint32)
+
+    The returned array is `scan.data`, which is overwritten by the
+    next read.  Pass `out` to copy the samples into a row of your own
+    array instead.
+
+    >>> data = _numpy.zeros((10, len(scan)), dtype=_numpy.uint32)
+    >>> for row in data:
+    ...     r = scan.read(out=row)
+    >>> data[-1]  # doctest: +SKIP
+    array([32671, 32673, 32672], dtype=uint32)
+
+    >>> d.close()
+    """
+    def __cinit__(self):
+        self._insnlist.n_insns = 0
+        self._insnlist.insns = NULL
+        self._subdevice = None
+        self.channels = None
+        self.data = None
+
+    def __dealloc__(self):
+        if self._insnlist.insns is not NULL:
+            _stdlib.free(self._insnlist.insns)
+
+    def __init__(self, channels, nano_sec=0):
+        cdef _comedi_h.comedi_insn *insn
+        cdef _comedi_h.lsampl_t *data
+        self.channels = list(channels)
+        if len(self.channels) == 0:
+            raise ValueError('no channels to scan')
+        self._subdevice = self.channels[0].subdevice
+        self._nano_sec = int(nano_sec)
+        analog = [hasattr(c, 'range') for c in self.channels]
+        n_insns = 0
+        for c,a in zip(self.channels, analog):
+            if c.subdevice.device is not self._subdevice.device:
+                raise ValueError(
+                    '{} is not on {}'.format(c, self._subdevice.device))
+            if a and self._nano_sec:
+                n_insns += 3  # hint, wait, and read
+            else:
+                n_insns += 1
+        self.data = _numpy.zeros((len(self.channels),), dtype=_numpy.uint32)
+        data = <_comedi_h.lsampl_t *>_numpy.PyArray_DATA(self.data)
+        self._insnlist.insns = <_comedi_h.comedi_insn *>_stdlib.calloc(
+            n_insns, sizeof(_comedi_h.comedi_insn))
+        if self._insnlist.insns is NULL:
+            raise _PyComediError('out of memory?')
+        self._insnlist.n_insns = n_insns
+        insn = self._insnlist.insns
+        for i,(c,a) in enumerate(zip(self.channels, analog)):
+            if a:
+                chanspec = c.chanspec()
+            else:
+                chanspec = _chanspec.ChanSpec(chan=c.index)
+            if a and self._nano_sec:
+                # same sequence as comedi_data_read_delayed()
+                insn.insn = _constant.INSN.read.value
+                insn.n = 0
+                insn.data = &data[i]
+                insn.subdev = c.subdevice.index
+                insn.chanspec = chanspec.value
+                insn += 1
+                insn.insn = _constant.INSN.wait.value
+                insn.n = 1
+                insn.data = &self._nano_sec
+                insn.subdev = c.subdevice.index
+                insn += 1
+            insn.insn = _constant.INSN.read.value
+            insn.n = 1
+            insn.data = &data[i]
+            insn.subdev = c.subdevice.index
+            insn.chanspec = chanspec.value
+            insn += 1
+
+    def __len__(self):
+        return len(self.channels)
+
+    def read(self, out=None):
+        """Read one sample from each channel
+
+        Returns `.data`, or `out` if it is given.
+        """
+        cdef _comedilib_h.comedi_t *device = self._subdevice._device()
+        cdef int ret, errno = 0
+        with nogil:
+            ret = _comedilib_h.comedi_do_insnlist(device, &self._insnlist)
+            if ret < <int>self._insnlist.n_insns:
+                errno = _comedilib_h.comedi_errno()
+        if ret < <int>self._insnlist.n_insns:
+            _error.raise_error(
+                function_name='comedi_do_insnlist', ret=ret, errno=errno)
+        if out is None:
+            return self.data
+        out[:] = self.data
+        return out
@@ -0,0 +1,412 @@
+# Copyright (C) 2012 W. Trevor King <wking@tremily.us>
+#
+# This file is part of pycomedi.
+#
+# pycomedi is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 2 of the License, or (at your option) any later
+# version.
+#
+# pycomedi is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# pycomedi.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Record streaming acquisitions to disk
+
+Raw `sampl`/`lsampl` scans are copied straight from the device file
+into a memory-mapped recording file, without any text formatting or
+unit conversion.  Recordings are read back lazily as NumPy views.
+
+The file layout is:
+
+* a fixed 24-byte prefix: the `MAGIC` string, the format version and
+  the JSON header length (little-endian `uint32`\s), and the number
+  of recorded scans (a little-endian `uint64`),
+* a UTF-8 JSON header with the dtype, chanlist, ranges, conversion
+  polynomials, and timing of the recorded command,
+* padding up to the next multiple of 4096 bytes, and
+* the raw scans, `n_channels` samples each.
+
+The scan count is updated after each block is written, so a
+`Recording` opened during an acquisition sees the scans recorded so
+far.
+"""
+
+import json as _json
+import mmap as _mmap
+import os as _os
+import struct as _struct
+import time as _time
+
+import numpy as _numpy
+
+from . import LOG as _LOG
+from . import PyComediError as _PyComediError
+from . import calibration as _calibration
+from . import channel as _channel
+from . import constant as _constant
+from . import utility as _utility
+
+
+MAGIC = b'PYCOMEDI'
+VERSION = 1
+_PREFIX = _struct.Struct('<8sIIQ')
+_COUNT_OFFSET = 16  # offset of the scan count in `_PREFIX`
+_ALIGN = 4096
+
+
+def _polynomials(converter):
+    "`to_physical` and `from_physical` polynomials stored by `converter`"
+    ret = {
+        'to_physical': {
+            'coefficients': list(converter.get_to_physical_coefficients()),
+            'expansion_origin': converter.get_to_physical_expansion_origin(),
+            },
+        'from_physical': None,
+        }
+    error = converter.get_from_physical_error()
+    if error is not None:
+        _LOG.debug('no from_physical polynomial: {0}'.format(error))
+    else:
+        ret['from_physical'] = {
+            'coefficients': list(converter.get_from_physical_coefficients()),
+            'expansion_origin':
+                converter.get_from_physical_expansion_origin(),
+            }
+    return ret
+
+
+def metadata(subdevice, channels=None):
+    """Recording header for the current `subdevice.cmd`
+
+    `channels` is an optional list of `AnalogChannel` instances
+    (matching the chanlist) used to look up the conversion
+    polynomials.  If you leave it out, channels are created from the
+    chanlist entries.
+    """
+    cmd = subdevice.cmd
+    chanlist = cmd.packed_chanlist
+    if channels is None:
+        channels = [
+            subdevice.channel(
+                int(chan), factory=_channel.AnalogChannel, range=int(rng),
+                aref=_constant.AREF.index_by_value(int(aref)))
+            for chan,rng,aref in zip(
+                chanlist.chan, chanlist.range, chanlist.aref)]
+    channel_info = []
+    for chanspec,channel in zip(chanlist, channels):
+        try:
+            converter = channel.get_converter()
+        except _PyComediError as e:
+            _LOG.debug('no converter for {0}: {1}'.format(chanspec, e))
+            converter = None
+        info = {
+            'chan': chanspec.chan,
+            'range': chanspec.range,
+            'aref': _constant.bitwise_value(chanspec.aref),
+            'unit': channel.range.unit.name,
+            'min': channel.range.min,
+            'max': channel.range.max,
+            'to_physical': None,
+            'from_physical': None,
+            }
+        if converter is not None:
+            info.update(_polynomials(converter))
+        channel_info.append(info)
+    scan_period = subdevice._fill_time(subdevice._scan_bytes())
+    return {
+        'dtype': _numpy.dtype(subdevice.get_dtype()).str,
+        'n_channels': len(chanlist),
+        'subdevice': subdevice.index,
+        'chanlist': [int(x) for x in chanlist.value],
+        'channels': channel_info,
+        'scan_period_ns': (
+            None if scan_period is None else int(round(scan_period * 1e9))),
+        'start_time': _time.time(),
+        }
+
+
+class RecordingWriter (object):
+    """Append raw scans to a memory-mapped recording file
+
+    `header` must contain at least `dtype` and `n_channels`.  Any
+    other JSON-serializable entries are stored too (see `metadata()`).
+    Space for `capacity` scans is preallocated.  When the file fills
+    up, its capacity is doubled.
+
+    Write scans directly into the file with `.reserve()` and
+    `.commit()`, or copy them in with `.append()`.  Views from
+    `.reserve()` are only valid until the next `.reserve()` call.
+    `.close()` trims the file to the end of the furthest reservation
+    rather than the last committed scan, so views that are still
+    alive never point past the end of the file.  Scans after `n_scans`
+    are not part of the recording.
+
+    Examples
+    --------
+
+    >>> from os import close, remove
+    >>> from tempfile import mkstemp
+    >>> fd,t = mkstemp(suffix='.dat', prefix='pycomedi-')
+    >>> close(fd)
+
+    >>> w = RecordingWriter(t, header={'dtype': '<u2', 'n_channels': 2},
+    ...     capacity=2)
+    >>> w.append(_numpy.array([[0, 10], [1, 11]], dtype=_numpy.uint16))
+    >>> view = w.reserve(2)
+    >>> view.shape
+    (2, 2)
+    >>> view[0,:] = [2, 12]
+    >>> w.commit(1)
+    >>> w.n_scans
+    3
+
+    Recordings can be read while the writer is still appending.
+
+    >>> r = Recording(t)
+    >>> r.data
+    memmap([[ 0, 10],
+           [ 1, 11],
+           [ 2, 12]], dtype=uint16)
+    >>> w.close()
+
+    Touching a leftover view after closing is harmless; it just
+    writes to the unrecorded tail of the file.
+
+    >>> view[1,:] = [3, 13]
+    >>> Recording(t).n_scans
+    3
+    >>> del r, view
+    >>> remove(t)
+    """
+    def __init__(self, path, header, capacity=1024):
+        self.path = path
+        self.header = dict(header)
+        self.dtype = _numpy.dtype(self.header['dtype'])
+        self.n_channels = int(self.header['n_channels'])
+        self.scan_bytes = self.dtype.itemsize * self.n_channels
+        self.n_scans = 0
+        self._reserved = 0  # high-water mark of `.reserve()`d scans
+        encoded = _json.dumps(self.header, sort_keys=True).encode('utf-8')
+        self.data_offset = -(-(_PREFIX.size + len(encoded)) // _ALIGN) * _ALIGN
+        self.file = open(path, 'w+b')
+        self.file.write(_PREFIX.pack(MAGIC, VERSION, len(encoded), 0))
+        self.file.write(encoded)
+        self.capacity = 0
+        self._mmap = None
+        self._resize(max(1, capacity))
+
+    def _resize(self, capacity):
+        "Grow the file to hold `capacity` scans and remap it"
+        self.file.truncate(self.data_offset + capacity * self.scan_bytes)
+        self.file.flush()
+        # Don't close the old map, earlier views may still point into it.
+        self._mmap = _mmap.mmap(self.file.fileno(), 0)
+        self.capacity = capacity
+
+    def reserve(self, n_scans):
+        "Return a writable `(n_scans, n_channels)` view after the last scan"
+        if self.n_scans + n_scans > self.capacity:
+            self._resize(max(2 * self.capacity, self.n_scans + n_scans))
+        self._reserved = max(self._reserved, self.n_scans + n_scans)
+        view = _numpy.frombuffer(
+            self._mmap, dtype=self.dtype, count=n_scans * self.n_channels,
+            offset=self.data_offset + self.n_scans * self.scan_bytes)
+        view.shape = (n_scans, self.n_channels)
+        return view
+
+    def commit(self, n_scans):
+        "Mark the first `n_scans` of the last reserved view as recorded"
+        self.n_scans += n_scans
+        _struct.pack_into('<Q', self._mmap, _COUNT_OFFSET, self.n_scans)
+
+    def append(self, data):
+        "Copy `data` (whole scans) to the end of the recording"
+        data = _numpy.asarray(data, dtype=self.dtype).reshape(
+            (-1, self.n_channels))
+        self.reserve(data.shape[0])[...] = data
+        self.commit(data.shape[0])
+
+    def flush(self):
+        "Flush recorded scans to disk"
+        self._mmap.flush()
+
+    def close(self):
+        "Flush and trim unreserved preallocated space from the file"
+        self.flush()
+        self._mmap = None
+        # Views from `.reserve()` may outlive the writer, so don't cut
+        # the file back past them (touching them would raise SIGBUS).
+        self.file.truncate(self.data_offset + self._reserved * self.scan_bytes)
+        self.file.close()
+
+
+class Recording (object):
+    """Lazy, read-only view of a recording file
+
+    `data` is a `(n_scans, n_channels)` `numpy.memmap`, so scans are
+    only read from disk when you touch them.  Reopen `data` to pick up
+    scans appended since the last access.  `converters` rebuilds the
+    `CalibratedConverter`\s stored in the header (`None` for channels
+    without a conversion polynomial), and `.physical()` wraps `data`
+    in a lazy physical-unit view.
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            magic,version,header_length,n_scans = _PREFIX.unpack(
+                f.read(_PREFIX.size))
+            if magic != MAGIC:
+                raise ValueError('{0} is not a pycomedi recording'.format(path))
+            if version != VERSION:
+                raise ValueError(
+                    'unsupported recording version {0}'.format(version))
+            self.header = _json.loads(f.read(header_length).decode('utf-8'))
+        self.dtype = _numpy.dtype(self.header['dtype'])
+        self.n_channels = int(self.header['n_channels'])
+        self.data_offset = -(-(_PREFIX.size + header_length) // _ALIGN) * _ALIGN
+
+    def _n_scans_get(self):
+        with open(self.path, 'rb') as f:
+            f.seek(_COUNT_OFFSET)
+            return _struct.unpack('<Q', f.read(8))[0]
+    n_scans = property(
+        fget=_n_scans_get, doc='Number of scans recorded so far')
+
+    def _data_get(self):
+        n_scans = self.n_scans
+        if n_scans == 0:
+            return _numpy.zeros((0, self.n_channels), dtype=self.dtype)
+        return _numpy.memmap(
+            self.path, dtype=self.dtype, mode='r', offset=self.data_offset,
+            shape=(n_scans, self.n_channels))
+    data = property(fget=_data_get, doc='Raw scans')
+
+    def _converters_get(self):
+        converters = []
+        for info in self.header.get('channels', []):
+            to_physical = info.get('to_physical')
+            if to_physical is None:
+                converters.append(None)
+                continue
+            from_physical = info.get('from_physical')
+            if from_physical is None:
+                from_physical = {}
+                error = ValueError('no from_physical polynomial')
+            else:
+                error = None
+            converters.append(_calibration.CalibratedConverter(
+                to_physical_coefficients=to_physical['coefficients'],
+                to_physical_expansion_origin=to_physical['expansion_origin'],
+                from_physical_coefficients=from_physical.get('coefficients'),
+                from_physical_expansion_origin=from_physical.get(
+                    'expansion_origin', 0),
+                from_physical_error=error))
+        return converters
+    converters = property(fget=_converters_get)
+
+    def physical(self, **kwargs):
+        """Lazy `calibration.PhysicalView` of the recorded scans
+
+        `kwargs` are passed through to `PhysicalView` (e.g.
+        `chunk_scans` or `max_bytes`).
+        """
+        converters = self.converters
+        if None in converters:
+            raise ValueError('no conversion polynomial for channel {0}'.format(
+                    converters.index(None)))
+        return _calibration.PhysicalView(
+            data=self.data, converters=converters, **kwargs)
+
+    def to_physical(self, channel, start=0, stop=None):
+        "Convert scans `start:stop` of chanlist entry `channel`"
+        converter = self.converters[channel]
+        if converter is None:
+            raise ValueError(
+                'no conversion polynomial for channel {0}'.format(channel))
+        return converter.to_physical(
+            _numpy.ascontiguousarray(self.data[start:stop,channel]))
+
+
+class Recorder (_utility.Reader):
+    """`read()`-based reader that streams scans into a recording file
+
+    Each `read()` fills a block of `block_scans` scans directly in the
+    memory-mapped file, so data is never formatted or converted in
+    Python.  `count` limits the total number of scans, otherwise the
+    recorder runs until the command finishes.  The header is built
+    with `metadata()` unless you pass your own `header`.  The writer
+    is closed when the recorder finishes.
+
+    Examples
+    --------
+
+    Setup a temporary data file for testing.
+
+    >>> from os import close, remove
+    >>> from tempfile import mkstemp
+    >>> fd,t = mkstemp(suffix='.dat', prefix='pycomedi-')
+    >>> f = _os.fdopen(fd, 'rb+')
+    >>> buf = _numpy.array([[0,10],[1,11],[2,12]], dtype=_numpy.uint16)
+    >>> buf.tofile(t)
+    >>> fd,output = mkstemp(suffix='.rec', prefix='pycomedi-')
+    >>> close(fd)
+
+    Override the default `Recorder` methods for our dummy subdevice.
+
+    >>> class TestRecorder (Recorder):
+    ...     def _file(self):
+    ...         return f
+
+    Record the data in two-scan blocks.
+
+    >>> r = TestRecorder(subdevice=None, path=output, block_scans=2,
+    ...     header={'dtype': '<u2', 'n_channels': 2}, name='Recorder-doctest')
+    >>> r.start()
+    >>> r.join()
+    >>> Recording(output).data
+    memmap([[ 0, 10],
+           [ 1, 11],
+           [ 2, 12]], dtype=uint16)
+
+    Cleanup the temporary files.
+
+    >>> f.close()  # no need for `close(fd)`
+    >>> remove(t)
+    >>> remove(output)
+    """
+    def __init__(self, subdevice, path, block_scans=1024, count=None,
+                 channels=None, header=None, capacity=None, **kwargs):
+        if header is None:
+            header = metadata(subdevice=subdevice, channels=channels)
+        if capacity is None:
+            capacity = count or 16 * block_scans
+        self.block_scans = block_scans
+        self.count = count
+        self.writer = RecordingWriter(
+            path=path, header=header, capacity=capacity)
+        super(Recorder, self).__init__(
+            subdevice=subdevice, buffer=None, **kwargs)
+
+    def run(self):
+        remaining = self.count
+        try:
+            while remaining is None or remaining > 0:
+                block_scans = self.block_scans
+                if remaining is not None:
+                    block_scans = min(block_scans, remaining)
+                view = self.writer.reserve(block_scans)
+                scans = self._read(view) // self.writer.n_channels
+                del view
+                self.writer.commit(scans)
+                if remaining is not None:
+                    remaining -= scans
+                if scans < block_scans:
+                    break  # command finished
+        finally:
+            self.writer.close()
+        if self.block_while_running:
+            self.block()
@@ -22,6 +22,9 @@ from pycomedi.subdevice_holder cimport SubdeviceHolder as _SubdeviceHolder
 
 
 cdef class Subdevice (_SubdeviceHolder):
+    cdef int _flags(self) except -1
+    cpdef bint is_running(self) except -1
+    cpdef bint is_busy(self) except -1
     cpdef dio_bitfield(self, unsigned int bits=*, write_mask=*, base_channel=*)
 
 
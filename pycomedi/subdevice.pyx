@@ -16,17 +16,29 @@
 
 "Wrap subdevice-wide Comedi functions in `Subdevice` and related classes"
 
+import select as _select
+import time as _time
+
 from pycomedi cimport _comedi_h
 from pycomedi cimport _comedilib_h
 from pycomedi cimport command as _command
 from . import LOG as _LOG
+from . import PyComediError as _PyComediError
 from . import _error as _error
+from . import calibration as _calibration
 from . import channel as _channel
 from . import constant as _constant
 from . import command as _command
 from pycomedi.subdevice_holder cimport SubdeviceHolder as _SubdeviceHolder
 from .subdevice_holder import SubdeviceHolder as _SubdeviceHolder
 from .utility import _subdevice_dtype, _subdevice_typecode
+from .utility import choose_buffer_size as _choose_buffer_size
+
+
+# Sleep used by `StreamingSubdevice.wait()` when some bytes are
+# already available (so `poll()` would return immediately) but the
+# command's pacing is unknown (e.g. TRIG_EXT or TRIG_FOLLOW).
+WAIT_POLL_INTERVAL = 1e-3  # seconds
 
 
 cdef class Subdevice (_SubdeviceHolder):
@@ -46,6 +58,10 @@ cdef class Subdevice (_SubdeviceHolder):
     <pycomedi.constant.FlagValue object at 0x...>
     >>> print str(f)
     cmd_read|readable|ground|common|diff|other|dither
+    >>> s.is_running()
+    False
+    >>> s.is_busy()
+    False
     >>> s.get_n_channels()
     16
     >>> s.range_is_chan_specific()
@@ -68,6 +84,9 @@ cdef class Subdevice (_SubdeviceHolder):
     """
     def get_type(self):
         "Type of subdevice (from `SUBDEVICE_TYPE`)"
+        return self.device._cached(('type', self.index), self._get_type)
+
+    def _get_type(self):
         ret = _comedilib_h.comedi_get_subdevice_type(
             self._device(), self.index)
         if ret < 0:
@@ -75,15 +94,26 @@ cdef class Subdevice (_SubdeviceHolder):
                                ret=ret)
         return _constant.SUBDEVICE_TYPE.index_by_value(ret)
 
-    def _get_flags(self):
-        "Subdevice flags"
-        ret = _comedilib_h.comedi_get_subdevice_flags(
+    cdef int _flags(self) except -1:
+        cdef int ret = _comedilib_h.comedi_get_subdevice_flags(
             self._device(), self.index)
         if ret < 0:
             _error.raise_error(function_name='comedi_get_subdevice_flags',
                                ret=ret)
         return ret
 
+    def _get_flags(self):
+        "Subdevice flags"
+        return self._flags()
+
+    cpdef bint is_running(self) except -1:
+        "True if the subdevice is acquiring data (`SDF.running`)"
+        return self._flags() & _comedi_h.SDF_RUNNING != 0
+
+    cpdef bint is_busy(self) except -1:
+        "True if the subdevice is busy (`SDF.busy`)"
+        return self._flags() & _comedi_h.SDF_BUSY != 0
+
     def get_flags(self):
         "Subdevice flags (an `SDF` `FlagValue`)"
         return _constant.FlagValue(
@@ -91,6 +121,10 @@ cdef class Subdevice (_SubdeviceHolder):
 
     def get_n_channels(self):
         "Number of subdevice channels"
+        return self.device._cached(
+            ('n_channels', self.index), self._get_n_channels)
+
+    def _get_n_channels(self):
         ret = _comedilib_h.comedi_get_n_channels(
             self._device(), self.index)
         if ret < 0:
@@ -99,6 +133,11 @@ cdef class Subdevice (_SubdeviceHolder):
         return ret
 
     def range_is_chan_specific(self):
+        return self.device._cached(
+            ('range_is_chan_specific', self.index),
+            self._range_is_chan_specific)
+
+    def _range_is_chan_specific(self):
         ret = _comedilib_h.comedi_range_is_chan_specific(
             self._device(), self.index)
         if ret < 0:
@@ -107,6 +146,11 @@ cdef class Subdevice (_SubdeviceHolder):
         return ret == 1
 
     def maxdata_is_chan_specific(self):
+        return self.device._cached(
+            ('maxdata_is_chan_specific', self.index),
+            self._maxdata_is_chan_specific)
+
+    def _maxdata_is_chan_specific(self):
         ret = _comedilib_h.comedi_maxdata_is_chan_specific(
             self._device(), self.index)
         if ret < 0:
@@ -135,10 +179,19 @@ cdef class Subdevice (_SubdeviceHolder):
         Returns a bit field containing the read value of all input
         channels and the last written value of all output channels.
         """
-        ret = _comedilib_h.comedi_dio_bitfield2(
-            self._device(), self.index, write_mask, &bits, base_channel)
+        cdef _comedilib_h.comedi_t *device = self._device()
+        cdef unsigned int index = self.index
+        cdef unsigned int mask = write_mask
+        cdef unsigned int base = base_channel
+        cdef int ret, errno = 0
+        with nogil:
+            ret = _comedilib_h.comedi_dio_bitfield2(
+                device, index, mask, &bits, base)
+            if ret < 0:
+                errno = _comedilib_h.comedi_errno()
         if ret < 0:
-            _error.raise_error(function_name='comedi_dio_bitfield2', ret=ret)
+            _error.raise_error(
+                function_name='comedi_dio_bitfield2', ret=ret, errno=errno)
         return bits
 
     # extensions to make a more idomatic Python interface
@@ -157,6 +210,45 @@ cdef class Subdevice (_SubdeviceHolder):
         "`Channel` instance for the `index`\ed channel."
         return factory(subdevice=self, index=index, **kwargs)
 
+    def get_converter_bank(self, chanlist, calibration=None):
+        """`ConverterBank` for the channels in `chanlist`
+
+        `chanlist` may be a `Command`, a `ChanList`, or a sequence of
+        `ChanSpec`s or `AnalogChannel`s.  Converters come from
+        `AnalogChannel.get_converter(calibration)`, and entries that
+        share a channel and range share a converter.
+
+        >>> from .device import Device
+        >>> from .chanspec import ChanList
+        >>> d = Device('/dev/comedi0')
+        >>> d.open()
+        >>> s = d.get_read_subdevice()
+        >>> bank = s.get_converter_bank(ChanList(chan=range(4), range=0))
+        >>> len(bank)
+        4
+        >>> bank.converters[0]  # doctest: +NORMALIZE_WHITESPACE
+        <CalibratedConverter
+         to_physical:{coefficients:[-10.0, 0.00030518043793392844] origin:0.0}
+         from_physical:{coefficients:[0.0, 3276.75] origin:-10.0}>
+        >>> d.close()
+        """
+        if hasattr(chanlist, 'packed_chanlist'):  # a Command
+            chanlist = chanlist.packed_chanlist
+        cache = {}
+        converters = []
+        for chanspec in chanlist:
+            if hasattr(chanspec, 'get_converter'):
+                converters.append(
+                    chanspec.get_converter(calibration=calibration))
+                continue
+            key = (int(chanspec.chan), int(chanspec.range))
+            if key not in cache:
+                channel = self.channel(
+                    key[0], factory=_channel.AnalogChannel, range=key[1])
+                cache[key] = channel.get_converter(calibration=calibration)
+            converters.append(cache[key])
+        return _calibration.ConverterBank(converters)
+
     def get_dtype(self):
         "Return the appropriate `numpy.dtype` based on subdevice flags"
         return _subdevice_dtype(self)
@@ -220,6 +312,11 @@ cdef class StreamingSubdevice (Subdevice):
     >>> s.cmd = cmd
     >>> s.command_test()
     >>> s.command()
+
+    Block (without spinning) until both scans have been acquired.
+
+    >>> s.wait(scans=2, timeout=1)
+    12
     >>> s.cancel()
 
 
@@ -283,23 +380,113 @@ cdef class StreamingSubdevice (Subdevice):
                                ret=ret)
         return cmd
 
+    def get_cmd_tested(self, chanlist, scan_period_ns=0, tests=2,
+                       **kwargs):
+        """Return a validated command for a timed acquisition
+
+        Starts from `.get_cmd_generic_timed()`, sets `chanlist` (any
+        value you could assign to `Command.chanlist`) and any command
+        fields given in `kwargs` (e.g. `stop_src`, `stop_arg`), and
+        runs `.command_test()` up to `tests` times until the command
+        converges.  Raises `PyComediError` if it never does.  Because
+        the chanlist is in place, drivers check the scan order,
+        ranges, and arefs along with the timing.
+
+        If the device is caching, the validated command is stored
+        under the subdevice, the packed chanlist, `scan_period_ns`,
+        and `kwargs`.  Later calls with the same arguments return a
+        copy of the stored command without any `comedi_command_test`
+        round trips.  The cache is cleared when the device is closed
+        or a channel calibration is applied.
+
+        >>> from .device import Device
+        >>> from .chanspec import ChanList
+        >>> from . import constant
+
+        >>> d = Device('/dev/comedi0', cache=True)
+        >>> d.open()
+        >>> s = d.get_read_subdevice(factory=StreamingSubdevice)
+        >>> chanlist = ChanList(chan=range(3), aref=constant.AREF.diff)
+        >>> cmd = s.get_cmd_tested(chanlist, scan_period_ns=1e3,
+        ...     stop_src=constant.TRIG_SRC.count, stop_arg=2)
+        >>> cmd.scan_begin_arg
+        9000L
+        >>> cmd.chanlist[2]
+        <ChanSpec chan:2 range:0 aref:diff flags:->
+        >>> [k[0] for k in d.cache]
+        ['command']
+        >>> s.get_cmd_tested(chanlist, scan_period_ns=1e3,
+        ...     stop_src=constant.TRIG_SRC.count, stop_arg=2) is cmd
+        False
+        >>> d.close()
+        """
+        if tests < 1:
+            raise ValueError('tests must be at least 1, not {}'.format(tests))
+        c = _command.Command()
+        c.chanlist = chanlist
+        packed = c.packed_chanlist
+        key = ('command', self.index, packed.value.tobytes(),
+               int(scan_period_ns),
+               tuple(sorted((name, _constant.bitwise_value(value))
+                            for name,value in kwargs.items())))
+        cmd = self.device._cached(
+            key, self._get_cmd_tested, packed, scan_period_ns, tests, kwargs)
+        return cmd.copy()
+
+    def _get_cmd_tested(self, chanlist, scan_period_ns, tests, kwargs):
+        cmd = self.get_cmd_generic_timed(
+            chanlist_len=len(chanlist), scan_period_ns=scan_period_ns)
+        cmd.chanlist = chanlist
+        for name,value in kwargs.items():
+            setattr(cmd, name, value)
+        rc = None
+        for i in range(tests):
+            rc = self.command_test(cmd)
+            if rc is None:
+                return cmd
+        raise _PyComediError(
+            function_name='comedi_command_test', comedi_msg=rc)
+
     def cancel(self):
         "Stop streaming input/output in progress."
-        ret = _comedilib_h.comedi_cancel(self._device(), self.index)
+        cdef _comedilib_h.comedi_t *device = self._device()
+        cdef unsigned int index = self.index
+        cdef int ret, errno = 0
+        with nogil:
+            ret = _comedilib_h.comedi_cancel(device, index)
+            if ret < 0:
+                errno = _comedilib_h.comedi_errno()
         if ret < 0:
-            _error.raise_error(function_name='comedi_cancel', ret=ret)
+            _error.raise_error(
+                function_name='comedi_cancel', ret=ret, errno=errno)
 
     def command(self):
         "Start streaming input/output"
-        ret = _comedilib_h.comedi_command(
-            self._device(), self.cmd.get_comedi_cmd_pointer())
+        cdef _comedilib_h.comedi_t *device = self._device()
+        cdef _comedi_h.comedi_cmd *cmd = self.cmd.get_comedi_cmd_pointer()
+        cdef int ret, errno = 0
+        with nogil:
+            ret = _comedilib_h.comedi_command(device, cmd)
+            if ret < 0:
+                errno = _comedilib_h.comedi_errno()
         if ret < 0:
-            _error.raise_error(function_name='comedi_command', ret=ret)
+            _error.raise_error(
+                function_name='comedi_command', ret=ret, errno=errno)
 
-    def command_test(self):
-        "Test streaming input/output configuration"
-        ret = _comedilib_h.comedi_command_test(
-            self._device(), self.cmd.get_comedi_cmd_pointer())
+    def command_test(self, _command.Command command=None):
+        """Test streaming input/output configuration
+
+        Tests `.cmd` unless you pass another `command`.  Comedi may
+        adjust the tested command to make it valid.
+        """
+        cdef _comedilib_h.comedi_t *device = self._device()
+        cdef _comedi_h.comedi_cmd *cmd
+        if command is None:
+            command = self.cmd
+        cmd = command.get_comedi_cmd_pointer()
+        cdef int ret
+        with nogil:
+            ret = _comedilib_h.comedi_command_test(device, cmd)
         return self._command_test_errors[ret]
 
     def poll(self):
@@ -310,9 +497,16 @@ cdef class StreamingSubdevice (Subdevice):
         buffers or device FIFOs. If successful, the number of
         additional bytes available is returned.
         """
-        ret = _comedilib_h.comedi_poll(self._device(), self.index)
+        cdef _comedilib_h.comedi_t *device = self._device()
+        cdef unsigned int index = self.index
+        cdef int ret, errno = 0
+        with nogil:
+            ret = _comedilib_h.comedi_poll(device, index)
+            if ret < 0:
+                errno = _comedilib_h.comedi_errno()
         if ret < 0:
-            _error.raise_error(function_name='comedi_poll', ret=ret)
+            _error.raise_error(
+                function_name='comedi_poll', ret=ret, errno=errno)
         return ret
 
     def get_buffer_size(self):
@@ -344,6 +538,27 @@ cdef class StreamingSubdevice (Subdevice):
             _error.raise_error(function_name='comedi_set_buffer_size', ret=ret)
         return ret
 
+    def size_buffer(self, latency=1.0, stats=None, **kwargs):
+        """Size the streaming buffer for the current `.cmd`
+
+        Sets the buffer to hold `latency` seconds of data for `.cmd`,
+        rounded up to the page size and capped at
+        `.get_max_buffer_size()`.  Pass the `stats` from a previous
+        run to grow the buffer if it came close to filling up.  Other
+        `kwargs` are passed through to `utility.choose_buffer_size()`.
+
+        Returns the new buffer size in bytes.
+        """
+        scan_bytes = self._scan_bytes()
+        scan_time = self._fill_time(scan_bytes)
+        if not scan_time:
+            raise ValueError(
+                'cannot size buffers for commands without a timer')
+        size = _choose_buffer_size(
+            bytes_per_second=scan_bytes / scan_time, latency=latency,
+            max_size=self.get_max_buffer_size(), stats=stats, **kwargs)
+        return self.set_buffer_size(size)
+
     def get_max_buffer_size(self):
         "Maximum streaming buffer size of subdevice"
         ret = _comedilib_h.comedi_get_max_buffer_size(
@@ -410,6 +625,94 @@ cdef class StreamingSubdevice (Subdevice):
                                ret=ret)
         return ret
 
+    def _is_write(self):
+        "Guess the streaming direction from the subdevice flags"
+        flags = self._get_flags()
+        return bool(flags & _constant.SDF.cmd_write.value and
+                    not flags & _constant.SDF.cmd_read.value)
+
+    def _scan_bytes(self):
+        "Bytes per scan for the current `.cmd`"
+        if self._get_flags() & _constant.SDF.lsampl.value:
+            itemsize = sizeof(_comedi_h.lsampl_t)
+        else:
+            itemsize = sizeof(_comedi_h.sampl_t)
+        return max(1, self.cmd._cmd.chanlist_len) * itemsize
+
+    def _fill_time(self, num_bytes):
+        """Expected seconds for the current `.cmd` to stream `num_bytes`
+
+        Returns `None` if the command is not timed by an on-board timer.
+        """
+        cdef _comedi_h.comedi_cmd *cmd = self.cmd.get_comedi_cmd_pointer()
+        timer = _constant.TRIG_SRC.timer.value
+        if cmd.scan_begin_src == timer:
+            scan_period_ns = cmd.scan_begin_arg
+        elif cmd.convert_src == timer:
+            scan_period_ns = cmd.convert_arg * max(1, cmd.chanlist_len)
+        else:
+            return None
+        scans = -(-num_bytes // self._scan_bytes())  # round up
+        return scans * scan_period_ns * 1e-9
+
+    def wait(self, num_bytes=1, scans=None, timeout=None, write=None):
+        """Block until at least `num_bytes` bytes are available
+
+        For input commands, available bytes are unread data in the
+        streaming buffer.  For output commands, they are free space in
+        the streaming buffer.  The direction is guessed from the
+        subdevice flags unless you set `write` explicitly.  If `scans`
+        is given, the threshold is that many scans of `.cmd` instead
+        of `num_bytes`.
+
+        The calling thread sleeps on the device file descriptor until
+        Comedi wakes it.  Comedi wakes pollers as soon as *any* data
+        (or space) is available, so for larger thresholds we sleep for
+        the time `.cmd` should take to stream the remainder before
+        checking again.  If `.cmd` is not timer-paced, we sleep for
+        `WAIT_POLL_INTERVAL` instead.
+
+        Returns the number of available bytes.  This may be less than
+        the threshold if `timeout` (in seconds) expires or if the
+        command stops running.
+        """
+        if write is None:
+            write = self._is_write()
+        if scans is not None:
+            num_bytes = scans * self._scan_bytes()
+        if timeout is not None:
+            deadline = _time.time() + timeout
+        poller = _select.poll()
+        if write:
+            poller.register(self.device.fileno(), _select.POLLOUT)
+        else:
+            poller.register(self.device.fileno(), _select.POLLIN)
+        while True:
+            available = self.get_buffer_contents()
+            if write:
+                available = self.get_buffer_size() - available
+            if available >= num_bytes or not self.is_running():
+                return available
+            remaining = None
+            if timeout is not None:
+                remaining = deadline - _time.time()
+                if remaining <= 0:
+                    return available
+            delay = None
+            if available > 0:  # poll() would return immediately
+                delay = self._fill_time(num_bytes - available)
+                if delay is None:
+                    delay = WAIT_POLL_INTERVAL
+            if delay is None:
+                if remaining is None:
+                    poller.poll()
+                else:
+                    poller.poll(remaining * 1e3)  # poll() takes milliseconds
+            else:
+                if remaining is not None:
+                    delay = min(delay, remaining)
+                _time.sleep(delay)
+
     def get_buffer_offset(self):
         """Offset in bytes of the read(/write?) pointer in the streaming buffer
 
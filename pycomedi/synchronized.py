@@ -0,0 +1,397 @@
+# Copyright (C) 2012 W. Trevor King <wking@tremily.us>
+#
+# This file is part of pycomedi.
+#
+# pycomedi is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 2 of the License, or (at your option) any later
+# version.
+#
+# pycomedi is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# pycomedi.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Synchronized streaming over several devices
+
+`doc/synchronized_analog_IO.txt` synchronizes input and output on a
+single board with one `Reader` and one `Writer` thread.  With many
+streams, a thread per stream adds scheduler jitter.  A `Synchronizer`
+instead arms all of the streams, preloads the outputs, fires the
+internal triggers, and then services every stream from a single
+thread that polls all of the device files at once.
+
+Comedi reads from (and writes to) a device's current read (or write)
+subdevice through the device file.  So you can have at most one
+`InputStream` and one `OutputStream` per `Device`.
+"""
+
+import os as _os
+import select as _select
+import threading as _threading
+
+import numpy as _numpy
+
+from . import LOG as _LOG
+from . import utility as _utility
+
+
+class _Stream (object):
+    """Base class for synchronized input and output streams
+
+    `trigger` selects whether the stream needs an internal trigger
+    (`utility.inttrig_insn()`).  If it is `None`, streams whose
+    command starts on `TRIG_SRC.int` are triggered.
+    """
+    def __init__(self, subdevice, trigger=None):
+        self.subdevice = subdevice
+        self.trigger = trigger
+        self.done = False
+
+    def arm(self):
+        "Start the subdevice's command"
+        self.subdevice.command()
+
+    def trigger_insn(self):
+        "Internal trigger instruction for this stream (or `None`)"
+        trigger = self.trigger
+        if trigger is None:
+            trigger = self.subdevice.cmd.start_src.int
+        if trigger:
+            return _utility.inttrig_insn(self.subdevice)
+        return None
+
+    def finish(self):
+        "Called once the stream is done"
+        self.subdevice.cancel()  # become unbusy
+
+    def _events(self):
+        "`poll()` events to wait for (0 for none)"
+        return 0
+
+    # pull out subdevice calls for easier testing
+
+    def _device(self):
+        return self.subdevice.device
+
+    def _fileno(self):
+        return self.subdevice.device.fileno()
+
+    def _running(self):
+        return self.subdevice.is_running()
+
+    def _buffer_contents(self):
+        return self.subdevice.get_buffer_contents()
+
+
+class InputStream (_Stream):
+    """Input side of a `Synchronizer`
+
+    Scans are read into `buffer`, a `(block_scans, n_channels)` array.
+    """
+    def __init__(self, subdevice, block_scans=1024, n_channels=None,
+                 dtype=None, **kwargs):
+        super(InputStream, self).__init__(subdevice=subdevice, **kwargs)
+        if n_channels is None:
+            n_channels = len(subdevice.cmd.chanlist)
+        if dtype is None:
+            dtype = subdevice.get_dtype()
+        self.buffer = _numpy.zeros((block_scans, n_channels), dtype=dtype)
+        self._bytes = self.buffer.reshape(-1).view(_numpy.uint8)
+        self.filled = 0  # bytes
+
+    def _scans(self):
+        "Number of complete scans in `buffer`"
+        return self.filled // (self.buffer.itemsize * self.buffer.shape[1])
+
+    def _full(self):
+        return self.filled == len(self._bytes)
+
+    def _events(self):
+        if self._full():
+            return 0  # wait for the other inputs
+        return _select.POLLIN
+
+    def service(self):
+        "Read available data into `buffer`"
+        if self._full():
+            return
+        running = self._running()
+        available = min(
+            self._buffer_contents(), len(self._bytes) - self.filled)
+        if available > 0:
+            data = _os.read(self._fileno(), available)
+            self._bytes[self.filled:self.filled+len(data)] = (
+                _numpy.frombuffer(data, dtype=_numpy.uint8))
+            self.filled += len(data)
+        elif not running:
+            self.done = True
+
+
+class OutputStream (_Stream):
+    """Output side of a `Synchronizer`
+
+    Streams the `(n_scans, n_channels)` array `data`.  As much of
+    `data` as fits in Comedi's streaming buffer is written before
+    the triggers fire.
+    """
+    def __init__(self, subdevice, data, **kwargs):
+        super(OutputStream, self).__init__(subdevice=subdevice, **kwargs)
+        self.data = _numpy.ascontiguousarray(data)
+        self._bytes = self.data.reshape(-1).view(_numpy.uint8)
+        self.written = 0  # bytes
+
+    def service(self):
+        "Write as much of the remaining `data` as there is room for"
+        if self.written < len(self._bytes):
+            available = min(
+                self._writable_bytes(), len(self._bytes) - self.written)
+            if available > 0:
+                self.written += _os.write(
+                    self._fileno(),
+                    self._bytes[self.written:self.written+available].tobytes())
+        elif not self._running():
+            self.done = True  # the device has drained its buffer
+
+    def _events(self):
+        if self.written < len(self._bytes):
+            return _select.POLLOUT
+        return 0  # draining, check `_running()` after each timeout
+
+    def _writable_bytes(self):
+        return (self.subdevice.get_buffer_size()
+                - self.subdevice.get_buffer_contents())
+
+
+class Synchronizer (_threading.Thread):
+    """Drive several input and output streams from a single thread
+
+    `.start()` arms all the streams (outputs first), preloads the
+    outputs, and fires the internal triggers (outputs first, with one
+    `do_insnlist()` call per device).  Then the I/O thread polls all
+    of the device files, reading and writing as data (or buffer space)
+    becomes available.
+
+    Input blocks are aligned: once every input stream has filled its
+    `block_scans` buffer, `callback` is called with the list of
+    buffers (in the order of `inputs`).  Streams that are ahead wait
+    for the others, and Comedi's streaming buffers take up the slack.
+    The final blocks may be shorter, if the commands finish in the
+    middle of a block.  The buffers are reused, so copy any block you
+    want to keep.  If the callback raises an exception, the I/O
+    thread stops and the exception is stored in `error`.  Once an
+    input is done and its buffer is drained, it contributes empty
+    blocks while the other inputs keep delivering their data.
+
+    Examples
+    --------
+
+    Setup pipes to stand in for two device files.
+
+    >>> input_fd,device_fd = _os.pipe()
+    >>> device_fd_2,output_fd = _os.pipe()
+    >>> data = _numpy.arange(10, dtype=_numpy.uint16)
+    >>> _os.write(device_fd, data.tobytes())
+    20
+    >>> _os.close(device_fd)
+
+    Override the default stream methods for our dummy subdevices.
+
+    >>> class TestInput (InputStream):
+    ...     contents = data.nbytes
+    ...     def arm(self):
+    ...         pass
+    ...     def trigger_insn(self):
+    ...         return None
+    ...     def finish(self):
+    ...         _os.close(input_fd)
+    ...     def _fileno(self):
+    ...         return input_fd
+    ...     def _running(self):
+    ...         return False
+    ...     def _buffer_contents(self):
+    ...         return self.contents
+    ...     def service(self):
+    ...         filled = self.filled
+    ...         super(TestInput, self).service()
+    ...         self.contents -= self.filled - filled
+    >>> class TestOutput (OutputStream):
+    ...     def arm(self):
+    ...         pass
+    ...     def trigger_insn(self):
+    ...         return None
+    ...     def finish(self):
+    ...         _os.close(output_fd)
+    ...     def _fileno(self):
+    ...         return output_fd
+    ...     def _running(self):
+    ...         return False
+    ...     def _writable_bytes(self):
+    ...         return 4
+
+    Collect two-scan blocks while writing the output data.
+
+    >>> def callback(blocks):
+    ...     print(repr(blocks[0]))
+    >>> inputs = [TestInput(subdevice=None, block_scans=2, n_channels=2,
+    ...     dtype=_numpy.uint16)]
+    >>> outputs = [TestOutput(subdevice=None,
+    ...     data=_numpy.array([[0, 10], [1, 11], [2, 12]],
+    ...                       dtype=_numpy.uint16))]
+    >>> s = Synchronizer(inputs=inputs, outputs=outputs, callback=callback,
+    ...     name='Synchronizer-doctest')
+    >>> s.start()
+    >>> s.join()
+    array([[0, 1],
+           [2, 3]], dtype=uint16)
+    array([[4, 5],
+           [6, 7]], dtype=uint16)
+    array([[8, 9]], dtype=uint16)
+    >>> _numpy.frombuffer(_os.read(device_fd_2, 12), dtype=_numpy.uint16)
+    array([ 0, 10,  1, 11,  2, 12], dtype=uint16)
+    >>> _os.close(device_fd_2)
+
+    Inputs do not have to end together.  Here the first input stops
+    after a single scan, while the second one holds four.
+
+    >>> class PipeInput (InputStream):
+    ...     def __init__(self, data, **kwargs):
+    ...         super(PipeInput, self).__init__(
+    ...             subdevice=None, n_channels=1, dtype=data.dtype, **kwargs)
+    ...         self.fd,write_fd = _os.pipe()
+    ...         _os.write(write_fd, data.tobytes())
+    ...         _os.close(write_fd)
+    ...         self.contents = data.nbytes
+    ...     def arm(self):
+    ...         pass
+    ...     def trigger_insn(self):
+    ...         return None
+    ...     def finish(self):
+    ...         _os.close(self.fd)
+    ...     def _fileno(self):
+    ...         return self.fd
+    ...     def _running(self):
+    ...         return False
+    ...     def _buffer_contents(self):
+    ...         return self.contents
+    ...     def service(self):
+    ...         filled = self.filled
+    ...         super(PipeInput, self).service()
+    ...         self.contents -= self.filled - filled
+    >>> def callback(blocks):
+    ...     print([block.ravel().tolist() for block in blocks])
+    >>> inputs = [
+    ...     PipeInput(_numpy.arange(1, dtype=_numpy.uint16), block_scans=2),
+    ...     PipeInput(_numpy.arange(10, 14, dtype=_numpy.uint16),
+    ...               block_scans=2)]
+    >>> s = Synchronizer(inputs=inputs, callback=callback,
+    ...     name='Synchronizer-doctest')
+    >>> s.start()
+    >>> s.join()
+    [[0], [10]]
+    [[], [11, 12]]
+    [[], [13]]
+    >>> [stream.done for stream in inputs]
+    [True, True]
+    """
+    def __init__(self, inputs=(), outputs=(), callback=None,
+                 poll_timeout=0.1, name=None):
+        if name is None:
+            name = '<{0}>'.format(self.__class__.__name__)
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.callback = callback
+        self.poll_timeout = poll_timeout
+        self.error = None
+        super(Synchronizer, self).__init__(name=name)
+
+    def start(self):
+        "Arm, preload, and trigger the streams, then start the I/O thread"
+        streams = self.outputs + self.inputs
+        for stream in streams:
+            stream.arm()
+        for stream in self.outputs:
+            stream.service()  # preload
+        self.trigger()
+        super(Synchronizer, self).start()
+
+    def trigger(self):
+        "Fire the internal triggers, with one instruction list per device"
+        devices = []
+        insns = {}
+        for stream in self.outputs + self.inputs:
+            insn = stream.trigger_insn()
+            if insn is None:
+                continue
+            device = stream._device()
+            if device not in insns:
+                devices.append(device)
+                insns[device] = []
+            insns[device].append(insn)
+        for device in devices:
+            device.do_insnlist(insns[device])
+
+    def run(self):
+        streams = self.outputs + self.inputs
+        poller = _select.poll()
+        registered = {}  # fileno -> event mask
+        try:
+            while self.error is None:
+                active = [s for s in streams if not s.done]
+                if not active:
+                    break
+                events = {}
+                for stream in active:
+                    mask = stream._events()
+                    if mask:
+                        fileno = stream._fileno()
+                        events[fileno] = events.get(fileno, 0) | mask
+                for fileno in set(registered) - set(events):
+                    poller.unregister(fileno)
+                    del registered[fileno]
+                for fileno,mask in events.items():
+                    if registered.get(fileno) != mask:
+                        poller.register(fileno, mask)
+                        registered[fileno] = mask
+                poller.poll(self.poll_timeout * 1e3)  # in milliseconds
+                for stream in active:
+                    stream.service()
+                if self.inputs and all(
+                        s._full() or s.done for s in self.inputs):
+                    self._deliver()
+        finally:
+            for stream in streams:
+                stream.finish()
+
+    def _deliver(self):
+        """Pass aligned blocks from the input streams to `.callback`
+
+        Streams that are done and drained are left out of the
+        alignment and contribute empty blocks.
+        """
+        live = [s for s in self.inputs if not (s.done and s._scans() == 0)]
+        if not live:
+            return
+        scans = min(s._scans() for s in live)
+        if scans == 0:
+            return
+        blocks = []
+        for stream in self.inputs:
+            if stream in live:
+                blocks.append(stream.buffer[:scans])
+            else:
+                blocks.append(stream.buffer[:0])
+        try:
+            if self.callback:
+                self.callback(blocks)
+        except Exception as e:
+            _LOG.error('{0} callback failed: {1}'.format(self.name, e))
+            self.error = e
+        for stream in live:
+            leftover = stream.filled - scans * stream.buffer.shape[1] * (
+                stream.buffer.itemsize)
+            stream._bytes[:leftover] = stream._bytes[
+                stream.filled-leftover:stream.filled]
+            stream.filled = leftover
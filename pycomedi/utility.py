@@ -17,10 +17,16 @@
 "Useful utility functions and classes"
 
 import array as _array
+import errno as _errno
+import math as _math
 import mmap as _mmap
 import os as _os
 import threading as _threading
 import time as _time
+try:
+    import queue as _queue
+except ImportError:  # Python 2
+    import Queue as _queue
 
 import numpy as _numpy
 
@@ -46,6 +52,43 @@ def _subdevice_typecode(subdevice):
         return lsampl_typecode
     return sampl_typecode
 
+def choose_buffer_size(bytes_per_second, latency=1.0, page_size=None,
+                       max_size=None, stats=None, grow=2.0, high_water=0.75):
+    """Pick a streaming buffer size (in bytes)
+
+    The buffer holds `latency` seconds of data at `bytes_per_second`,
+    rounded up to a whole number of pages and capped at `max_size`.
+
+    If you pass the `StreamStats` from a previous run, the buffer is
+    grown by a factor of `grow` over that run's buffer when the fill
+    level reached `high_water` (a fraction of the buffer size) or
+    data was lost.
+
+    >>> choose_buffer_size(1e5, latency=0.5, page_size=4096)
+    53248
+    >>> choose_buffer_size(1e5, latency=0.5, page_size=4096, max_size=32768)
+    32768
+    >>> stats = StreamStats()
+    >>> stats.fill(contents=60000, size=65536)
+    >>> choose_buffer_size(1e5, latency=0.5, page_size=4096, stats=stats)
+    131072
+    """
+    if page_size is None:
+        page_size = _mmap.PAGESIZE
+    size = bytes_per_second * latency
+    if stats is not None and stats.buffer_size:
+        if (stats.high_water >= high_water * stats.buffer_size or
+                stats.overruns or stats.underruns):
+            size = max(size, grow * stats.buffer_size)
+    size = max(page_size, int(_math.ceil(size / page_size)) * page_size)
+    if max_size is not None and size > max_size:
+        _LOG.warning(
+            'capping streaming buffer at {0} bytes ({1} requested)'.format(
+                max_size, size))
+        size = max_size
+    return size
+
+
 def inttrig_insn(subdevice):
     """Setup an internal trigger for a given `subdevice`
 
@@ -79,19 +122,190 @@ def _builtin_array(array):
     return isinstance(array, _array.array)
 
 
+def _byte_view(buffer):
+    """Writable flat byte view of `buffer`'s memory
+
+    Returns `None` if `buffer` cannot be viewed in place (e.g. a
+    non-contiguous `numpy` array, or a builtin array on Python 2).
+    """
+    if _builtin_array(buffer):
+        view = memoryview(buffer)
+        if not hasattr(view, 'cast'):  # Python 2
+            return None
+        return view.cast('B')
+    if not (buffer.flags.c_contiguous and buffer.flags.writeable):
+        return None
+    return memoryview(buffer.reshape(-1).view(_numpy.uint8))
+
+
+def _queue_items(queue):
+    "Iterate over items from `queue` until it returns `None`"
+    while True:
+        item = queue.get()
+        if item is None:
+            return
+        yield item
+
+
+class StreamStats (object):
+    """Counters for a streaming reader or writer
+
+    Every reader and writer keeps its counters in a `stats`
+    attribute:
+
+    * `bytes` and `chunks`: data moved, and the number of copies it
+      took.
+    * `copy_time` and `wait_time`: seconds spent moving data and
+      waiting for Comedi.
+    * `buffer_size` and `high_water`: size of Comedi's streaming
+      buffer and the most bytes seen in it.  `read()`- and
+      `write()`-based threads only sample the buffer if you pass
+      `sample_fill=True`, because it costs two extra ioctls per
+      chunk.
+    * `overruns`: times an input buffer was found full, or input
+      blocks were dropped.
+    * `underruns`: times an output buffer ran dry.
+    * `callback_histogram`: number of callbacks that took less than
+      each of the `CALLBACK_BIN_EDGES` (in seconds).  The last bin
+      counts the slower callbacks.
+
+    Updates are plain attribute increments, so they are cheap.  Read
+    the counters from another thread with `.snapshot()`, which may be
+    a chunk out of date, but never blocks the streaming thread.
+
+    >>> s = StreamStats()
+    >>> s.copy(size=4096, seconds=0.001)
+    >>> s.fill(contents=3000, size=4096)
+    >>> s.fill(contents=4096, size=4096)
+    >>> s.callback(seconds=3e-5)
+    >>> snapshot = s.snapshot()
+    >>> (snapshot['bytes'], snapshot['high_water'], snapshot['overruns'])
+    (4096, 4096, 1)
+    >>> snapshot['callback_histogram'][:4]
+    [0, 0, 1, 0]
+    """
+    CALLBACK_BIN_EDGES = [1e-5 * 2**i for i in range(18)]  # 10 us to 1.3 s
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        "Zero all counters"
+        self.bytes = 0
+        self.chunks = 0
+        self.copy_time = 0.0
+        self.wait_time = 0.0
+        self.buffer_size = None
+        self.high_water = 0
+        self.overruns = 0
+        self.underruns = 0
+        self.callbacks = 0
+        self.callback_time = 0.0
+        self.callback_histogram = [0] * (len(self.CALLBACK_BIN_EDGES) + 1)
+
+    def copy(self, size, seconds):
+        "Record `size` bytes moved in `seconds`"
+        self.bytes += size
+        self.chunks += 1
+        self.copy_time += seconds
+
+    def wait(self, seconds):
+        "Record `seconds` spent waiting for Comedi"
+        self.wait_time += seconds
+
+    def fill(self, contents, size, write=False):
+        "Record a `contents` / `size` sample of Comedi's streaming buffer"
+        self.buffer_size = size
+        if contents > self.high_water:
+            self.high_water = contents
+        if contents >= size and not write:
+            self.overruns += 1
+
+    def overrun(self):
+        "Record lost input data"
+        self.overruns += 1
+
+    def underrun(self):
+        "Record an output buffer that ran dry"
+        self.underruns += 1
+
+    def callback(self, seconds):
+        "Record a callback that took `seconds`"
+        self.callbacks += 1
+        self.callback_time += seconds
+        if seconds < self.CALLBACK_BIN_EDGES[0]:
+            i = 0
+        else:
+            i = min(int(_math.log(seconds / self.CALLBACK_BIN_EDGES[0], 2)) + 1,
+                    len(self.CALLBACK_BIN_EDGES))
+        self.callback_histogram[i] += 1
+
+    def snapshot(self):
+        "Return a `dict` copy of the counters"
+        ret = dict(self.__dict__)
+        ret['callback_histogram'] = list(self.callback_histogram)
+        return ret
+
+
+class StatsReporter (_threading.Thread):
+    """Periodically export a reader's or writer's `stats`
+
+    Calls `callback(stats.snapshot())` every `interval` seconds until
+    you call `.stop()`.
+
+    >>> from time import sleep
+    >>> stats = StreamStats()
+    >>> snapshots = []
+    >>> r = StatsReporter(stats, snapshots.append, interval=0.01)
+    >>> r.start()
+    >>> sleep(0.05)
+    >>> r.stop()
+    >>> len(snapshots) > 0
+    True
+    """
+    def __init__(self, stats, callback, interval=1.0, name=None):
+        super(StatsReporter, self).__init__(name=name)
+        self.daemon = True
+        self.stats = stats
+        self.callback = callback
+        self.interval = interval
+        self._stop_event = _threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.callback(self.stats.snapshot())
+
+    def stop(self):
+        "Stop reporting (after one final report)"
+        self._stop_event.set()
+        self.join()
+        self.callback(self.stats.snapshot())
+
+
 class _ReadWriteThread (_threading.Thread):
     "Base class for all reader/writer threads"
+    _write = False  # streaming direction, for `StreamingSubdevice.wait()`
+
     def __init__(self, subdevice, buffer, name=None,
-                 block_while_running=False):
+                 block_while_running=False, sample_fill=False):
         if name == None:
             name = '<%s subdevice %d>' % (
                 self.__class__.__name__, subdevice.index)
         self.subdevice = subdevice
         self.buffer = buffer
         self.block_while_running = block_while_running
+        self.sample_fill = sample_fill
+        self.stats = StreamStats()
         self._setup_buffer()
         super(_ReadWriteThread, self).__init__(name=name)
 
+    def _sample_fill(self):
+        "Record the streaming buffer fill in `.stats` (if `.sample_fill`)"
+        if self.sample_fill:
+            self.stats.fill(
+                self.subdevice.get_buffer_contents(),
+                self.subdevice.get_buffer_size(), write=self._write)
+
     def _setup_buffer(self):
         "Currently just a hook for an MMapWriter hack."
         pass
@@ -106,8 +320,12 @@ class _ReadWriteThread (_threading.Thread):
         return self.subdevice.device.file
 
     def block(self):
-        while self.subdevice.get_flags().running:
-            _time.sleep(0)
+        start = _time.time()
+        while self.subdevice.is_running():
+            self.subdevice.wait(
+                num_bytes=self.subdevice.get_buffer_size(), write=self._write,
+                timeout=1)
+        self.stats.wait(_time.time() - start)
         self.subdevice.cancel()  # become unbusy
 
 
@@ -165,31 +383,91 @@ class Reader (_ReadWriteThread):
     >>> r.buffer
     array('H', [0, 10, 1, 11, 2, 12])
 
+    If the command finishes before the buffer is full, the reader
+    stops with a partially filled buffer.  `filled` counts the scans
+    read into the buffer so far, and is updated as the data arrives.
+
+    >>> f.seek(0)
+    >>> rbuf = _numpy.zeros((5, 2), dtype=_numpy.uint16)
+    >>> r = TestReader(subdevice=None, buffer=rbuf, name='Reader-doctest')
+    >>> r.start()
+    >>> r.join()
+    >>> r.filled
+    3
+    >>> rbuf[:r.filled]
+    array([[ 0, 10],
+           [ 1, 11],
+           [ 2, 12]], dtype=uint16)
+
     Cleanup the temporary data file.
 
     >>> f.close()  # no need for `close(fd)`
     >>> remove(t)
     """
+    filled = 0  # scans read into the current buffer
+
     def run(self):
-        builtin_array = _builtin_array(self.buffer)
-        f = self._file()
-        if builtin_array:
-            # TODO: read into already allocated memory (somehow)
-            size = len(self.buffer)
-            a = _array.array(self.buffer.typecode)
-            a.fromfile(f, size)
-            self.buffer[:] = a
-        else:  # numpy.ndarray
-            # TODO: read into already allocated memory (somehow)
-            buf = _numpy.fromfile(
-                f, dtype=self.buffer.dtype, count=self.buffer.size)
-            a = _numpy.ndarray(
-                shape=self.buffer.shape, dtype=self.buffer.dtype,
-                buffer=buf)
-            self.buffer[:] = a
+        self._read(self.buffer)
         if self.block_while_running:
             self.block()
 
+    def _read(self, buffer):
+        """Fill `buffer` from `._file()`
+
+        Returns the number of samples read, which may be less than the
+        size of `buffer` if the command finishes first.  The data is
+        read straight into `buffer`'s memory when possible, without
+        temporary arrays.
+        """
+        f = self._file()
+        self._sample_fill()
+        start = _time.time()
+        self.filled = 0
+        view = _byte_view(buffer)
+        if view is None:  # read into a contiguous copy
+            if _builtin_array(buffer):
+                target = _numpy.zeros(
+                    (len(buffer),), dtype=_numpy.dtype(buffer.typecode))
+            else:
+                target = _numpy.zeros(buffer.shape, dtype=buffer.dtype)
+            view = _byte_view(target)
+        else:
+            target = buffer
+        if _builtin_array(buffer) or len(target.shape) < 2:
+            scan_bytes = target.itemsize
+        else:
+            scan_bytes = target.itemsize * target.shape[-1]
+        size = 0
+        while size < len(view):
+            read = self._readinto(f, view[size:])
+            if not read:
+                break  # end of file: the command finished
+            size += read
+            self.filled = size // scan_bytes
+        count = size // target.itemsize
+        if target is not buffer:
+            if _builtin_array(buffer):
+                buffer[:count] = _array.array(
+                    buffer.typecode, target[:count].tolist())
+            else:
+                buffer.flat[:count] = target.flat[:count]
+        self.stats.copy(count * target.itemsize, _time.time() - start)
+        return count
+
+    def _readinto(self, f, view):
+        """Read from `f` into the byte view `view`
+
+        Returns the number of bytes read (0 at the end of the file),
+        retrying reads interrupted by signals.
+        """
+        f = getattr(f, 'buffer', f)  # binary layer under text files
+        while True:
+            try:
+                return f.readinto(view) or 0
+            except (IOError, OSError) as e:
+                if e.errno != _errno.EINTR:
+                    raise
+
 
 class CallbackReader (Reader):
     """`read()`-based reader with callbacks
@@ -273,11 +551,189 @@ class CallbackReader (Reader):
             finally:
                 self.block_while_running = block_while_running
             if self.callback:
+                start = _time.time()
                 self.callback(self.buffer)
+                self.stats.callback(_time.time() - start)
         if self.block_while_running:
             self.block()
 
 
+class BlockCallbackReader (Reader):
+    """`read()`-based reader with block callbacks
+
+    `CallbackReader` calls back once per buffer fill, which caps the
+    useful scan rate when the buffer only holds a single scan.  This
+    reader reads `(block_scans, n_channels)` blocks into a small pool
+    of preallocated buffers, and hands each block to `callback` from a
+    separate dispatcher thread, so slow callbacks do not stall the
+    reads.  The final block may be shorter if the command finishes in
+    the middle of a block.
+
+    The block size is set by the shape of `buffer`.  If you pass
+    `block_time` (in seconds) instead of `buffer`, the buffer is
+    sized to hold that much data for the subdevice's current command.
+    `count` limits the total number of scans read.
+
+    When the callback falls behind and all `n_buffers` buffers are in
+    use, `backpressure` decides what happens:
+
+    * `'block'` waits for the callback to release a buffer.  Comedi's
+      streaming buffer takes up the slack until it overflows.
+    * `'drop'` discards the oldest undelivered block.  Dropped scans
+      are counted in `dropped`.
+    * `'grow'` adds another buffer to the pool.
+
+    Buffers are returned to the pool once the callback returns, so
+    copy any block you want to keep.  If the callback raises an
+    exception, reading stops and the exception is stored in `error`.
+
+    Examples
+    --------
+
+    Setup a temporary data file for testing.
+
+    >>> from os import close, remove
+    >>> from sys import stdout
+    >>> from tempfile import mkstemp
+    >>> fd,t = mkstemp(suffix='.dat', prefix='pycomedi-')
+    >>> f = _os.fdopen(fd, 'rb+')
+    >>> buf = _numpy.array([[0,10],[1,11],[2,12],[3,13],[4,14]],
+    ...     dtype=_numpy.uint16)
+    >>> buf.tofile(t)
+
+    Override the default `Reader` methods for our dummy subdevice.
+
+    >>> class TestReader (BlockCallbackReader):
+    ...     def _file(self):
+    ...         return f
+
+    Define a callback function.
+
+    >>> def callback(data):
+    ...     print('got: {0}'.format(repr(data)))
+    ...     stdout.flush()
+
+    Run the test reader with two-scan blocks.
+
+    >>> rbuf = _numpy.zeros((2, buf.shape[1]), dtype=_numpy.uint16)
+    >>> r = TestReader(subdevice=None, buffer=rbuf, name='Reader-doctest',
+    ...     callback=callback)
+    >>> r.start()
+    >>> r.join()
+    got: array([[ 0, 10],
+           [ 1, 11]], dtype=uint16)
+    got: array([[ 2, 12],
+           [ 3, 13]], dtype=uint16)
+    got: array([[ 4, 14]], dtype=uint16)
+    >>> r.dropped
+    0
+
+    Cleanup the temporary data file.
+
+    >>> f.close()  # no need for `close(fd)`
+    >>> remove(t)
+    """
+    def __init__(self, subdevice, callback=None, count=None, block_time=None,
+                 n_buffers=2, backpressure='block', buffer=None, **kwargs):
+        if backpressure not in ['block', 'drop', 'grow']:
+            raise ValueError(
+                'unrecognized backpressure policy {0!r}'.format(backpressure))
+        if buffer is None:
+            buffer = self._block_buffer(
+                subdevice=subdevice, block_time=block_time)
+        self.callback = callback
+        self.count = count
+        self.backpressure = backpressure
+        self.dropped = 0
+        self.error = None
+        super(BlockCallbackReader, self).__init__(
+            subdevice=subdevice, buffer=buffer, **kwargs)
+        self.buffers = [self.buffer] + [
+            _numpy.empty_like(self.buffer) for i in range(n_buffers - 1)]
+        self._free = _queue.Queue()
+        for buffer in self.buffers:
+            self._free.put(buffer)
+        self._full = _queue.Queue()
+
+    def _block_buffer(self, subdevice, block_time):
+        "Allocate a buffer holding `block_time` seconds of scans"
+        if block_time is None:
+            raise ValueError('either buffer or block_time must be set')
+        n_channels = len(subdevice.cmd.chanlist)
+        scan_time = subdevice._fill_time(subdevice._scan_bytes())
+        if scan_time is None:
+            raise ValueError(
+                'cannot size blocks in time for commands without a timer')
+        block_scans = max(1, int(round(block_time / scan_time)))
+        return _numpy.zeros(
+            (block_scans, n_channels), dtype=subdevice.get_dtype())
+
+    def run(self):
+        dispatcher = _threading.Thread(
+            target=self._dispatch, name='{0} dispatcher'.format(self.name))
+        dispatcher.start()
+        block_scans,n_channels = self.buffer.shape
+        remaining = self.count
+        try:
+            while self.error is None and (remaining is None or remaining > 0):
+                buffer = self._get_buffer()
+                if remaining is not None:
+                    block_scans = min(block_scans, remaining)
+                scans = self._read(buffer[:block_scans]) // n_channels
+                if scans:
+                    self._full.put((buffer, scans))
+                else:
+                    self._free.put(buffer)
+                if remaining is not None:
+                    remaining -= scans
+                if scans < block_scans:
+                    break  # command finished
+        finally:
+            self._full.put(None)
+            dispatcher.join()
+        if self.block_while_running:
+            self.block()
+
+    def _get_buffer(self):
+        "Get a free buffer from the pool, applying `.backpressure`"
+        try:
+            return self._free.get_nowait()
+        except _queue.Empty:
+            pass
+        if self.backpressure == 'grow':
+            buffer = _numpy.empty_like(self.buffer)
+            self.buffers.append(buffer)
+            return buffer
+        if self.backpressure == 'drop':
+            try:
+                buffer,scans = self._full.get_nowait()
+            except _queue.Empty:
+                pass  # all buffers are in the callback
+            else:
+                self.dropped += scans
+                self.stats.overrun()
+                _LOG.debug('{0} dropped {1} scans'.format(self.name, scans))
+                return buffer
+        return self._free.get()
+
+    def _dispatch(self):
+        "Hand full blocks to `.callback` until the reader finishes"
+        while True:
+            block = self._full.get()
+            if block is None:
+                break
+            buffer,scans = block
+            try:
+                if self.callback and self.error is None:
+                    start = _time.time()
+                    self.callback(buffer[:scans])
+                    self.stats.callback(_time.time() - start)
+            except Exception as e:
+                self.error = e
+            finally:
+                self._free.put(buffer)
+
+
 class Writer (_ReadWriteThread):
     """`write()`-based writer
 
@@ -338,6 +794,8 @@ class Writer (_ReadWriteThread):
     >>> f.close()  # no need for `close(fd)`
     >>> remove(t)
     """
+    _write = True
+
     def __init__(self, *args, **kwargs):
         preload = kwargs.pop('preload', 0)
         super(Writer, self).__init__(*args, **kwargs)
@@ -354,8 +812,13 @@ class Writer (_ReadWriteThread):
         del(self._preload_setup)
 
         f = self._file()
+        self._sample_fill()
+        start = _time.time()
         remaining_buffer.tofile(f)
         f.flush()
+        self.stats.copy(
+            len(remaining_buffer) * remaining_buffer.itemsize,
+            _time.time() - start)
         if self.block_while_running:
             self.block()
 
@@ -387,10 +850,6 @@ class _MMapReadWriteThread (_ReadWriteThread):
             'remaining': remaining,
             }
 
-    def _sleep_time(self, mmap_size):
-        "Expected seconds needed to write a tenth of the mmap buffer"
-        return 0
-
     def run(self):
         builtin_array = self._preload_setup['builtin_array']
         mmap_size = self._preload_setup['mmap_size']
@@ -400,17 +859,24 @@ class _MMapReadWriteThread (_ReadWriteThread):
         remaining = self._preload_setup['remaining']
         del(self._preload_setup)
 
-        sleep_time = self._sleep_time(mmap_size)
+        stats = self.stats
         while remaining > 0:
             action_bytes = self._action_bytes()
-            if action_bytes > 0:
+            stats.fill(action_bytes, mmap_size, write=self._write)
+            threshold = max(1, min(mmap_size // 10, remaining))
+            if action_bytes < threshold and (
+                    action_bytes == 0 or self._running()):
+                start = _time.time()
+                self._wait(mmap_size, remaining)
+                stats.wait(_time.time() - start)
+            else:  # enough to act on, or the command is finishing
+                start = _time.time()
                 action,mmap_offset = self._act(
                     mmap, mmap_offset, buffer_offset, remaining, mmap_size,
                     action_bytes=action_bytes, builtin_array=builtin_array)
+                stats.copy(action, _time.time() - start)
                 buffer_offset += action
                 remaining -= action
-            else:
-                _time.sleep(sleep_time)
         if self.block_while_running:
             self.block()
 
@@ -443,6 +909,15 @@ class _MMapReadWriteThread (_ReadWriteThread):
     def _action_bytes(self):
         return self.subdevice.get_buffer_contents()
 
+    def _running(self):
+        return self.subdevice.is_running()
+
+    def _wait(self, mmap_size, remaining):
+        "Block until a tenth of the mmap buffer (or `remaining`) is ready"
+        self.subdevice.wait(
+            num_bytes=max(1, min(mmap_size // 10, remaining)),
+            write=self._write, timeout=1)
+
     # hooks for subclasses
 
     def _buffer_bytes(self, builtin_array):
@@ -485,6 +960,9 @@ class MMapReader (_MMapReadWriteThread):
         ('Reader', 'MMapReader'),
         ('def _file', _mmap_docstring_overrides)]:
         __doc__ = __doc__.replace(_from, _to)
+    # drop the `Reader.filled` example
+    __doc__ = (__doc__[:__doc__.index('    If the command finishes')] +
+               __doc__[__doc__.index('    Cleanup the temporary'):])
 
     def __init__(self, *args, **kwargs):
         assert 'access' not in kwargs
@@ -524,6 +1002,81 @@ class MMapWriter (_MMapReadWriteThread):
         ("array('H', [0, 20, 2, 22, 4, 24])", "array('H', [22, 4, 24])")]:
 
         __doc__ = __doc__.replace(_from, _to)
+    __doc__ += """
+    When Comedi's buffer is full, the writer sleeps in
+    `subdevice.wait()` until the device frees some space.  This dummy
+    subdevice has a four-byte buffer that drains whenever the writer
+    waits.
+
+    >>> fd,t = mkstemp(suffix='.dat', prefix='pycomedi-')
+    >>> f = _os.fdopen(fd, 'r+'); f.write(4*'\\x00'); f.flush()
+    >>> class TestDevice (object):
+    ...     def fileno(self):
+    ...         return fd
+    >>> class TestSubdevice (object):
+    ...     index = 0
+    ...     device = TestDevice()
+    ...     contents = 4  # the preloaded data fills the buffer
+    ...     waits = 0
+    ...     def get_buffer_size(self):
+    ...         return 4
+    ...     def get_buffer_contents(self):
+    ...         return self.contents
+    ...     def mark_buffer_written(self, size):
+    ...         self.contents += size
+    ...     def wait(self, num_bytes, write, timeout):
+    ...         self.waits += 1
+    ...         self.contents = 0
+    ...         return 4
+    >>> s = TestSubdevice()
+    >>> buf = _numpy.arange(6, dtype=_numpy.uint16)
+    >>> w = MMapWriter(subdevice=s, buffer=buf, name='MMapWriter-doctest')
+    >>> w.start()
+    >>> w.join()
+    >>> s.waits
+    2
+    >>> a = _array.array('H')
+    >>> a.fromfile(open(t, 'rb'), 2)
+    >>> a
+    array('H', [4, 5])
+    >>> f.close()  # no need for `close(fd)`
+    >>> remove(t)
+
+    While the command is running, the writer waits until a tenth of
+    the buffer is free instead of topping it up a few bytes at a time.
+    This dummy subdevice has a 20-byte buffer that drains one byte
+    each time the writer checks it.
+
+    >>> fd,t = mkstemp(suffix='.dat', prefix='pycomedi-')
+    >>> f = _os.fdopen(fd, 'r+'); f.write(20*'\\x00'); f.flush()
+    >>> class SlowSubdevice (TestSubdevice):
+    ...     contents = 20
+    ...     marked = []
+    ...     def get_buffer_size(self):
+    ...         return 20
+    ...     def get_buffer_contents(self):
+    ...         self.contents -= 1
+    ...         return self.contents
+    ...     def mark_buffer_written(self, size):
+    ...         self.marked.append(size)
+    ...         self.contents += size
+    ...     def is_running(self):
+    ...         return True
+    ...     def wait(self, num_bytes, write, timeout):
+    ...         self.waits += 1
+    ...         return num_bytes
+    >>> s = SlowSubdevice()
+    >>> buf = _numpy.arange(12, dtype=_numpy.uint16)
+    >>> w = MMapWriter(subdevice=s, buffer=buf, name='MMapWriter-doctest')
+    >>> w.start()
+    >>> w.join()
+    >>> (s.waits, s.marked)
+    (2, [2, 2])
+    >>> f.close()  # no need for `close(fd)`
+    >>> remove(t)
+    """
+
+    _write = True
 
     def __init__(self, *args, **kwargs):
         assert 'access' not in kwargs
@@ -551,8 +1104,439 @@ class MMapWriter (_MMapReadWriteThread):
         mmap.write(self.buffer[offset:offset+size])
         mmap.flush()
 
+    def _action_bytes(self):
+        "Free space in the streaming buffer"
+        return (self.subdevice.get_buffer_size()
+                - self.subdevice.get_buffer_contents())
+
     def _mark_action(self, size):
         self.subdevice.mark_buffer_written(size)
 
 
+class MMapStreamWriter (_ReadWriteThread):
+    """Continuous `mmap()`-based writer
+
+    `Writer` and `MMapWriter` stream a single, preallocated buffer.
+    This writer instead pulls blocks from `source` as space frees up
+    in Comedi's output buffer, so it can stream unbounded or generated
+    waveforms.  `source` may be any iterable of arrays (e.g. a
+    generator) or a `queue.Queue`, in which case a `None` item marks
+    the end of the stream.
+
+    Unless `preload` is false, the output buffer is filled when the
+    writer is created, so create it after `command()` and before
+    triggering the command.  If the output buffer runs dry while there
+    is still data to write, the writer logs a warning and increments
+    `stats.underruns`.  The writer stops when `source` is exhausted or the
+    command stops running.
+
+    Examples
+    --------
+
+    Setup a temporary file to stand in for an 8-byte ring buffer.
+
+    >>> from os import remove
+    >>> from tempfile import mkstemp
+    >>> fd,t = mkstemp(suffix='.dat', prefix='pycomedi-')
+    >>> f = _os.fdopen(fd, 'rb+')
+    >>> _numpy.zeros(4, dtype=_numpy.uint16).tofile(f)
+    >>> f.flush()
+
+    Override the default `MMapStreamWriter` methods for our dummy
+    subdevice, recording each scan as our stand-in for the hardware
+    consumes it.
+
+    >>> class TestWriter (MMapStreamWriter):
+    ...     contents = 0
+    ...     read_offset = 0
+    ...     consumed = []
+    ...     def _mmap_size(self):
+    ...         return 8
+    ...     def _fileno(self):
+    ...         return fd
+    ...     def _buffer_contents(self):
+    ...         return self.contents
+    ...     def _mark_written(self, size):
+    ...         self.contents += size
+    ...     def _running(self):
+    ...         return True
+    ...     def _wait(self):
+    ...         i = self.read_offset // 2
+    ...         scan = self._ring.view(_numpy.uint16)[i:i+2]
+    ...         self.consumed.append(scan.tolist())
+    ...         self.contents -= 4
+    ...         self.read_offset = (self.read_offset + 4) % 8
+
+    Stream a generated waveform.  The first two scans are preloaded.
+
+    >>> def waveform():
+    ...     yield _numpy.array([[0, 10], [1, 11]], dtype=_numpy.uint16)
+    ...     yield _numpy.array([[2, 12]], dtype=_numpy.uint16)
+    ...     yield _numpy.array([[3, 13], [4, 14]], dtype=_numpy.uint16)
+    >>> w = TestWriter(subdevice=None, source=waveform(),
+    ...     name='Writer-doctest')
+    >>> (w.written, w.contents)
+    (8, 8)
+    >>> w.start()
+    >>> w.join()
+    >>> w.consumed
+    [[0, 10], [1, 11], [2, 12]]
+    >>> (w.written, w.contents, w.stats.underruns)
+    (20, 8, 0)
+
+    If the stand-in hardware drains the whole buffer before the
+    writer gets to it, the writer counts an underrun.
+
+    >>> def _wait(self):
+    ...     self.contents = 0
+    >>> TestWriter._wait = _wait
+    >>> w = TestWriter(subdevice=None, source=waveform(),
+    ...     name='Writer-doctest')
+    >>> w.start()
+    >>> w.join()
+    >>> w.stats.underruns
+    2
+
+    While the command is running, the writer waits until a tenth of
+    the ring is free instead of topping it up a few bytes at a time.
+    This stand-in hardware consumes one byte of a 20-byte ring each
+    time the writer checks it.
+
+    >>> _numpy.zeros(10, dtype=_numpy.uint16).tofile(t)
+    >>> class SlowWriter (TestWriter):
+    ...     contents = 20
+    ...     marked = []
+    ...     waits = 0
+    ...     def _mmap_size(self):
+    ...         return 20
+    ...     def _buffer_contents(self):
+    ...         self.contents -= 1
+    ...         return self.contents
+    ...     def _mark_written(self, size):
+    ...         self.marked.append(size)
+    ...         self.contents += size
+    ...     def _wait(self):
+    ...         self.waits += 1
+    >>> w = SlowWriter(subdevice=None, preload=False,
+    ...     source=[_numpy.arange(4, dtype=_numpy.uint16)],
+    ...     name='Writer-doctest')
+    >>> w.start()
+    >>> w.join()
+    >>> (w.waits, w.marked)
+    (4, [2, 2, 2, 2])
+
+    Cleanup the temporary data file.
+
+    >>> f.close()  # no need for `close(fd)`
+    >>> remove(t)
+    """
+    _write = True
+
+    def __init__(self, subdevice, source, preload=True, **kwargs):
+        super(MMapStreamWriter, self).__init__(
+            subdevice=subdevice, buffer=None, **kwargs)
+        if hasattr(source, 'get'):  # queue.Queue
+            source = _queue_items(source)
+        self._blocks = iter(source)
+        self.mmap_size = int(self._mmap_size())
+        self.mmap = _mmap.mmap(
+            self._fileno(), self.mmap_size, access=_mmap.ACCESS_WRITE)
+        self._ring = _numpy.frombuffer(self.mmap, dtype=_numpy.uint8)
+        self.offset = 0  # write offset into the ring buffer (in bytes)
+        self.written = 0  # total bytes written
+        self._pending = self._next_block()
+        if preload:
+            self._fill(self.mmap_size - self._buffer_contents())
+
+    def run(self):
+        try:
+            while self._pending is not None:
+                running = self._running()
+                contents = self._buffer_contents()
+                self.stats.fill(contents, self.mmap_size, write=True)
+                if contents == 0 and self.written > 0:
+                    self.stats.underrun()
+                    _LOG.warning('{0} underrun after {1} bytes'.format(
+                            self.name, self.written))
+                if not running:
+                    break
+                free = self.mmap_size - contents
+                if free >= max(1, self.mmap_size // 10):
+                    start = _time.time()
+                    size = self._fill(free)
+                    self.stats.copy(size, _time.time() - start)
+                else:
+                    start = _time.time()
+                    self._wait()
+                    self.stats.wait(_time.time() - start)
+        finally:
+            del self._ring
+            self.mmap.close()
+        if self.block_while_running:
+            self.block()
+
+    def _next_block(self):
+        "Bytes of the next non-empty block from the source, or `None`"
+        for block in self._blocks:
+            data = _numpy.ascontiguousarray(block).reshape(-1)
+            if data.size:
+                return data.view(_numpy.uint8)
+        return None
+
+    def _fill(self, free):
+        "Copy up to `free` bytes from the source into the ring buffer"
+        total = 0
+        while free > 0 and self._pending is not None:
+            size = min(free, self._pending.size, self.mmap_size - self.offset)
+            self._ring[self.offset:self.offset+size] = self._pending[:size]
+            self.offset = (self.offset + size) % self.mmap_size
+            self._pending = self._pending[size:]
+            if not self._pending.size:
+                self._pending = self._next_block()
+            free -= size
+            total += size
+        if total:
+            self._mark_written(total)
+            self.written += total
+        return total
+
+    def _wait(self):
+        "Block until a tenth of the output buffer is free"
+        self.subdevice.wait(
+            num_bytes=max(1, self.mmap_size // 10), write=True, timeout=1)
+
+    # pull out subdevice calls for easier testing
+
+    def _mmap_size(self):
+        return self.subdevice.get_buffer_size()
+
+    def _fileno(self):
+        return self.subdevice.device.fileno()
+
+    def _buffer_contents(self):
+        return self.subdevice.get_buffer_contents()
+
+    def _mark_written(self, size):
+        self.subdevice.mark_buffer_written(size)
+
+    def _running(self):
+        return self.subdevice.is_running()
+
+
+class MMapRingReader (object):
+    """Zero-copy `mmap()`-based reader
+
+    Rather than copying data out of Comedi's streaming buffer, this
+    reader hands out NumPy views (with shape `(n_scans, n_channels)`)
+    that point straight into the memory-mapped kernel buffer.  The
+    read pointer is only advanced (with `mark_buffer_read()`) after
+    the consumer calls `.release()` on a view, so the kernel will not
+    overwrite data that is still in use.  Views must be released in
+    the order they were acquired, and they should not be used after
+    they have been released.
+
+    Scans that straddle the end of the ring buffer are copied into a
+    small, preallocated bounce buffer, so every view covers whole
+    scans.
+
+    Unlike the other readers, this is not a thread.  Either call
+    `.acquire()` and `.release()` yourself, or iterate over the
+    reader, which releases each view when you ask for the next one.
+
+    Examples
+    --------
+
+    Setup a temporary file to stand in for a 20-byte ring buffer.
+
+    >>> from os import remove
+    >>> from tempfile import mkstemp
+    >>> fd,t = mkstemp(suffix='.dat', prefix='pycomedi-')
+    >>> f = _os.fdopen(fd, 'rb+')
+    >>> ring = _numpy.arange(10, dtype=_numpy.uint16)
+    >>> ring.tofile(f)
+    >>> f.flush()
+
+    Override the default `MMapRingReader` methods for our dummy
+    subdevice, keeping track of the kernel's buffer state by hand.
+
+    >>> class TestReader (MMapRingReader):
+    ...     contents = 0
+    ...     offset = 0
+    ...     def _mmap_size(self):
+    ...         return ring.nbytes
+    ...     def _fileno(self):
+    ...         return fd
+    ...     def _buffer_contents(self):
+    ...         return self.contents
+    ...     def _buffer_offset(self):
+    ...         return self.offset
+    ...     def _mark_read(self, size):
+    ...         self.contents -= size
+    ...         self.offset = (self.offset + size) % ring.nbytes
+
+    Acquire views of the available scans.  Partial scans are left in
+    the buffer until they are complete.
+
+    >>> r = TestReader(subdevice=None, n_channels=3, dtype=_numpy.uint16)
+    >>> r.contents = 14
+    >>> view = r.acquire()
+    >>> view
+    array([[0, 1, 2],
+           [3, 4, 5]], dtype=uint16)
+    >>> r.acquire() is None
+    True
+    >>> r.release(view)
+    >>> (r.offset, r.contents)
+    (12, 2)
+
+    Scans that wrap around the end of the buffer are still returned
+    whole.
+
+    >>> r.contents += 10
+    >>> view = r.acquire()
+    >>> view
+    array([[6, 7, 8]], dtype=uint16)
+    >>> wrapped = r.acquire()
+    >>> wrapped
+    array([[9, 0, 1]], dtype=uint16)
+    >>> r.offset
+    12
+    >>> r.release(view)
+    >>> r.release(wrapped)
+    >>> (r.offset, r.contents)
+    (4, 0)
+
+    Iterating over the reader releases each view when you ask for the
+    next one, and stops once the command is no longer running and all
+    of the complete scans have been read.
+
+    >>> TestReader._running = lambda self: False
+    >>> r.contents = 12
+    >>> for view in r:
+    ...     print(view)
+    [[2 3 4]
+     [5 6 7]]
+    >>> (r.offset, r.contents)
+    (16, 0)
+
+    Cleanup the reader and the temporary data file.  Drop any
+    references to views before closing the reader, because the
+    buffer cannot be unmapped while NumPy arrays still point into it.
+
+    >>> del view, wrapped
+    >>> r.close()
+    >>> f.close()  # no need for `close(fd)`
+    >>> remove(t)
+    """
+    def __init__(self, subdevice, n_channels, dtype=None, max_scans=None):
+        self.subdevice = subdevice
+        self.n_channels = n_channels
+        if dtype is None:
+            dtype = subdevice.get_dtype()
+        self.dtype = _numpy.dtype(dtype)
+        self.max_scans = max_scans
+        self.scan_bytes = n_channels * self.dtype.itemsize
+        self.stats = StreamStats()
+        self.mmap_size = int(self._mmap_size())
+        self.mmap = _mmap.mmap(
+            self._fileno(), self.mmap_size, access=_mmap.ACCESS_READ)
+        self._bounce = _numpy.zeros((1, n_channels), dtype=self.dtype)
+        self._pending = []  # (view, bytes) for each unreleased view
+        self._pending_bytes = 0
+
+    def acquire(self, max_scans=None):
+        """Return a view of the next unread scans
+
+        Returns `None` if there is no complete scan available.
+        """
+        if max_scans is None:
+            max_scans = self.max_scans
+        contents = self._buffer_contents()
+        self.stats.fill(contents, self.mmap_size)
+        available = contents - self._pending_bytes
+        if available < self.scan_bytes:
+            return None
+        offset = (self._buffer_offset() + self._pending_bytes) % self.mmap_size
+        contiguous = min(available, self.mmap_size - offset)
+        n_scans = contiguous // self.scan_bytes
+        if max_scans is not None:
+            n_scans = min(n_scans, max_scans)
+        if n_scans > 0:
+            view = _numpy.frombuffer(
+                self.mmap, dtype=self.dtype, count=n_scans*self.n_channels,
+                offset=offset)
+            view.shape = (n_scans, self.n_channels)
+        else:  # the next scan wraps around the end of the buffer
+            n_scans = 1
+            head = self.mmap_size - offset
+            bounce = self._bounce.view(_numpy.uint8).reshape(-1)
+            bounce[:head] = _numpy.frombuffer(
+                self.mmap, dtype=_numpy.uint8, count=head, offset=offset)
+            bounce[head:] = _numpy.frombuffer(
+                self.mmap, dtype=_numpy.uint8, count=self.scan_bytes - head)
+            view = self._bounce
+        size = n_scans * self.scan_bytes
+        self._pending.append((view, size))
+        self._pending_bytes += size
+        return view
+
+    def release(self, view=None):
+        "Release the oldest unreleased view, marking its scans as read"
+        if not self._pending:
+            raise ValueError('no views to release')
+        pending_view,size = self._pending[0]
+        if view is not None and view is not pending_view:
+            raise ValueError('views must be released in acquisition order')
+        self._pending.pop(0)
+        self._pending_bytes -= size
+        self._mark_read(size)
+        self.stats.copy(size, 0.0)  # zero-copy views
+
+    def close(self):
+        "Release any outstanding views and unmap the buffer"
+        while self._pending:
+            self.release()
+        self.mmap.close()
+
+    def __iter__(self):
+        while True:
+            running = self._running()
+            view = self.acquire()
+            if view is None:
+                if not running:
+                    return
+                start = _time.time()
+                self._wait()
+                self.stats.wait(_time.time() - start)
+                continue
+            try:
+                yield view
+            finally:
+                self.release(view)
+
+    def _wait(self):
+        "Block until the device has a new scan (or stops running)"
+        self.subdevice.wait(num_bytes=self.scan_bytes, write=False, timeout=1)
+
+    # pull out subdevice calls for easier testing
+
+    def _mmap_size(self):
+        return self.subdevice.get_buffer_size()
+
+    def _fileno(self):
+        return self.subdevice.device.fileno()
+
+    def _buffer_contents(self):
+        return self.subdevice.get_buffer_contents()
+
+    def _buffer_offset(self):
+        return self.subdevice.get_buffer_offset()
+
+    def _mark_read(self, size):
+        self.subdevice.mark_buffer_read(size)
+
+    def _running(self):
+        return self.subdevice.is_running()
+
+
 del _mmap_docstring_overrides
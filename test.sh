@@ -2,7 +2,12 @@
 # -e to abort script at first error
 
 python setup.py build_ext --inplace
-nosetests --with-doctest pycomedi
+NOSE_ARGS=""
+if ! python -c 'import sys; sys.exit(sys.version_info < (3, 7))'; then
+  # pycomedi.asynchronous uses syntax from newer Pythons
+  NOSE_ARGS="--ignore-files=asynchronous\.py"
+fi
+nosetests --with-doctest $NOSE_ARGS pycomedi
 ls pycomedi | grep '.pyx$'| while read file; do
   mod="${file/.pyx/}"
   echo "$mod"